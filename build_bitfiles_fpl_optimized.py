@@ -33,6 +33,8 @@ run('memsec',['info', 'vivado_package', 'distclean'])
 # PCW_FPGA0_PERIPHERAL_FREQMHZ, PCW_FCLK0_PERIPHERAL_CLKSRC, ...
 globalBdGenerics = {'PCW_FPGA0_PERIPHERAL_FREQMHZ': 100}
 
+# the strategies only affect the implementation, i.e., each configuration is
+# synthesized once and the strategies are implemented in parallel from there
 globalOptionDictList = [ {},
                          {'FLOW_VIVADO_IMPL_STRATEGY': 'Performance_NetDelay_high'},
                          {'FLOW_VIVADO_IMPL_STRATEGY': 'Performance_NetDelay_low'},
@@ -40,47 +42,39 @@ globalOptionDictList = [ {},
 
 # PLAIN
 localBdGenerics = merge_dicts(globalBdGenerics, {'CRYPTO_CONFIG': 0,'BLOCKS_PER_SECTOR': 4})
-for optionsDict in globalOptionDictList:
-  res += buildBitStream(module,localBdGenerics,optionsDict)
+res += buildBitStreams(module,localBdGenerics,globalOptionDictList)
 
 # ASCON
 localBdGenerics = merge_dicts(globalBdGenerics, {'CRYPTO_CONFIG': 1, 'DATA_BLOCK_SIZE': 32})
-for optionsDict in globalOptionDictList:
-  res += buildBitStream(module,localBdGenerics,optionsDict)
+res += buildBitStreams(module,localBdGenerics,globalOptionDictList)
 
 # ASCON TREE
 localBdGenerics = merge_dicts(globalBdGenerics, {'CRYPTO_CONFIG': 2,'TREE_ROOTS': 1024, 'TREE_ARITY': 8,'DATA_BLOCK_SIZE': 64})
-for optionsDict in globalOptionDictList:
-  res += buildBitStream(module,localBdGenerics,optionsDict)
+res += buildBitStreams(module,localBdGenerics,globalOptionDictList)
 
 # Prince ECB
 localBdGenerics = merge_dicts(globalBdGenerics, {'CRYPTO_CONFIG': 3,'BLOCKS_PER_SECTOR': 4})
-for optionsDict in globalOptionDictList:
-  res += buildBitStream(module,localBdGenerics,optionsDict)
+res += buildBitStreams(module,localBdGenerics,globalOptionDictList)
 
 # AES ECB
 localBdGenerics = merge_dicts(globalBdGenerics, {'CRYPTO_CONFIG': 4,'BLOCKS_PER_SECTOR': 2})
-for optionsDict in globalOptionDictList:
-  res += buildBitStream(module,localBdGenerics,optionsDict)
+res += buildBitStreams(module,localBdGenerics,globalOptionDictList)
 
 # Prince CBC
 localBdGenerics = merge_dicts(globalBdGenerics, {'CRYPTO_CONFIG': 5,'BLOCKS_PER_SECTOR': 4})
-for optionsDict in globalOptionDictList:
-  res += buildBitStream(module,localBdGenerics,optionsDict)
+res += buildBitStreams(module,localBdGenerics,globalOptionDictList)
 
 # AES CBC
 localBdGenerics = merge_dicts(globalBdGenerics, {'CRYPTO_CONFIG': 6,'BLOCKS_PER_SECTOR': 2})
-for optionsDict in globalOptionDictList:
-  res += buildBitStream(module,localBdGenerics,optionsDict)
+res += buildBitStreams(module,localBdGenerics,globalOptionDictList)
 
 # Prince XTS
 localBdGenerics = merge_dicts(globalBdGenerics, {'CRYPTO_CONFIG': 7,'BLOCKS_PER_SECTOR': 4})
-for optionsDict in globalOptionDictList:
-  res += buildBitStream(module,localBdGenerics,optionsDict)
+res += buildBitStreams(module,localBdGenerics,globalOptionDictList)
 
 # AES XTS
 localBdGenerics = merge_dicts(globalBdGenerics, {'CRYPTO_CONFIG': 8,'BLOCKS_PER_SECTOR': 2})
-for optionsDict in globalOptionDictList:
-  res += buildBitStream(module,localBdGenerics,optionsDict)
+res += buildBitStreams(module,localBdGenerics,globalOptionDictList)
 
+storeResults(res)
 sys.exit(printSummary(res))
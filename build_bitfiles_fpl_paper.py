@@ -74,4 +74,5 @@ res += buildBitStream(module,merge_dicts(localBdGenerics, {'BLOCKS_PER_SECTOR':
 localBdGenerics = merge_dicts(globalBdGenerics, {'CRYPTO_CONFIG': 8})
 res += buildBitStream(module,merge_dicts(localBdGenerics, {'BLOCKS_PER_SECTOR': 2}))
 
+storeResults(res)
 sys.exit(printSummary(res))
@@ -34,36 +34,21 @@ globalBdGenerics = {'PCW_FPGA0_PERIPHERAL_FREQMHZ': 50}
 
 globalOptionDict = {'FLOW_VIVADO_IMPL_STRATEGY': 'Flow_RunPostRoutePhysOpt'}
 
-## MEAS
-localBdGenerics = merge_dicts(globalBdGenerics, {'CRYPTO_CONFIG': 9,'TREE_ROOTS': 1024,'DATA_BLOCK_SIZE': 64})
-#res += buildBitStream(module,merge_dicts(localBdGenerics, {'TREE_ARITY': 2}),merge_dicts(globalOptionDict,{'DATASTREAM_DATA_WIDTH': 64}))
-#res += buildBitStream(module,merge_dicts(localBdGenerics, {'TREE_ARITY': 4}),merge_dicts(globalOptionDict,{'DATASTREAM_DATA_WIDTH': 64}))
-#res += buildBitStream(module,merge_dicts(localBdGenerics, {'TREE_ARITY': 8}),merge_dicts(globalOptionDict,{'DATASTREAM_DATA_WIDTH': 64}))
-#res += buildBitStream(module,merge_dicts(localBdGenerics, {'TREE_ARITY': 2}),merge_dicts(globalOptionDict,{'DATASTREAM_DATA_WIDTH': 128}))
-#res += buildBitStream(module,merge_dicts(localBdGenerics, {'TREE_ARITY': 4}),merge_dicts(globalOptionDict,{'DATASTREAM_DATA_WIDTH': 128}))
-#res += buildBitStream(module,merge_dicts(localBdGenerics, {'TREE_ARITY': 8}),merge_dicts(globalOptionDict,{'DATASTREAM_DATA_WIDTH': 128}))
-
-## MEAS ECB
-localBdGenerics = merge_dicts(globalBdGenerics, {'CRYPTO_CONFIG': 10,'TREE_ROOTS': 1024,'DATA_BLOCK_SIZE': 64})
-#res += buildBitStream(module,merge_dicts(localBdGenerics, {'TREE_ARITY': 2}),merge_dicts(globalOptionDict,{'DATASTREAM_DATA_WIDTH': 64}))
-#res += buildBitStream(module,merge_dicts(localBdGenerics, {'TREE_ARITY': 4}),merge_dicts(globalOptionDict,{'DATASTREAM_DATA_WIDTH': 64}))
-#res += buildBitStream(module,merge_dicts(localBdGenerics, {'TREE_ARITY': 8}),merge_dicts(globalOptionDict,{'DATASTREAM_DATA_WIDTH': 64}))
-#res += buildBitStream(module,merge_dicts(localBdGenerics, {'TREE_ARITY': 2}),merge_dicts(globalOptionDict,{'DATASTREAM_DATA_WIDTH': 128}))
-#res += buildBitStream(module,merge_dicts(localBdGenerics, {'TREE_ARITY': 4}),merge_dicts(globalOptionDict,{'DATASTREAM_DATA_WIDTH': 128}))
-#res += buildBitStream(module,merge_dicts(localBdGenerics, {'TREE_ARITY': 8}),merge_dicts(globalOptionDict,{'DATASTREAM_DATA_WIDTH': 128}))
+## MEAS and MEAS ECB with different tree arities and datastream widths
+# only the configurations which are Pareto optimal according to the performance
+# model (latency, metadata overhead, on-chip memory) are built
+measSweep = {'MODULE': module, 'JOB': bitStreamJob,
+             'FIXED': merge_dicts(globalBdGenerics, globalOptionDict, {'TREE_ROOTS': 1024,'DATA_BLOCK_SIZE': 64}),
+             'AXES': [{'CRYPTO_CONFIG': [9,10]}, {'TREE_ARITY': [2,4,8]}, {'DATASTREAM_DATA_WIDTH': [64,128]}]}
+res += runBitStreamJobs(paretoJobs(sweepJobs(measSweep)))
 
 # build MEAS (ECB) with different optimizer settings
-synthOptionDictList = [{'FLOW_VIVADO_SYNTH_STRATEGY': 'Flow_AlternateRoutability'},
-                       {'FLOW_VIVADO_SYNTH_STRATEGY': 'Flow_PerfOptimized_high'},
-                       {'FLOW_VIVADO_SYNTH_STRATEGY': 'Flow_PerfThresholdCarry'}]
-
-implOptionDictList = [{'FLOW_VIVADO_IMPL_STRATEGY': 'Flow_RunPostRoutePhysOpt'}]
-
-localBdGenerics = merge_dicts(globalBdGenerics, {'TREE_ARITY': 4,'TREE_ROOTS': 1024,'DATA_BLOCK_SIZE': 64})
-for synthOptionsDict in synthOptionDictList:
-  for implOptionsDict in implOptionDictList:
-    optionsDict = merge_dicts(implOptionsDict,synthOptionsDict,{'DATASTREAM_DATA_WIDTH': 128})
-    res += buildBitStream(module,merge_dicts(localBdGenerics, {'CRYPTO_CONFIG': 9}),optionsDict)
-    res += buildBitStream(module,merge_dicts(localBdGenerics, {'CRYPTO_CONFIG': 10}),optionsDict)
-
+optimizerSweep = {'MODULE': module, 'JOB': bitStreamJob,
+                  'FIXED': merge_dicts(globalBdGenerics, {'TREE_ARITY': 4,'TREE_ROOTS': 1024,'DATA_BLOCK_SIZE': 64,'DATASTREAM_DATA_WIDTH': 128}),
+                  'AXES': [{'FLOW_VIVADO_SYNTH_STRATEGY': ['Flow_AlternateRoutability', 'Flow_PerfOptimized_high', 'Flow_PerfThresholdCarry']},
+                           {'FLOW_VIVADO_IMPL_STRATEGY': ['Flow_RunPostRoutePhysOpt']},
+                           {'CRYPTO_CONFIG': [9,10]}]}
+res += [runJob(job) for job in sweepJobs(optimizerSweep)]
+
+storeResults(res)
 sys.exit(printSummary(res))
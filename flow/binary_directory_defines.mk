@@ -54,8 +54,17 @@ HIDDEN_INFO_VARS :=  FLOW_FULL_DEPENDENCY_DIRS \
 #                       However, when needed the destination can be overwritten
 #                       using a <srcfile>:<destfile> syntax. If <destfile> ends
 #                       with / then it is considered as directory.
+# FLOW_SIM_GENERIC_SETS List of generic sets (separated by ";") which are
+#                       simulated by the hdlsbb target. Every set consists of
+#                       space separated <generic>=<value> pairs which override
+#                       the GENERIC_* variables for one variant.
 # FLOW_SIM_HDL_FILES    List of absolute paths to the HDL files needed for
 #                       simulating the module.
+# FLOW_SIM_OUTPUT_FILES List of files which are written by the simulation and
+#                       should be kept. After the simulation, every existing
+#                       file is copied as <module>_<file> into the
+#                       FLOW_BINARY_ROOT_DIR. Relative paths are interpreted
+#                       relative to the simulation directory.
 # FLOW_SIM_RESULT_FILE  Absolute path to the file which contains the test
 #                       result. For determining the result FLOW_SIM_RESULT_REGEX
 #                       is matched against the content. If the file does not
@@ -82,7 +91,9 @@ STANDARD_MODULE_PROPERTIES := FLOW_BINARY_DIR \
                               FLOW_LIBRARY_NAME \
                               FLOW_SIM_DEPENDENCIES \
                               FLOW_SIM_FILES \
+                              FLOW_SIM_GENERIC_SETS \
                               FLOW_SIM_HDL_FILES \
+                              FLOW_SIM_OUTPUT_FILES \
                               FLOW_SIM_RESULT_FILE \
                               FLOW_SIM_RESULT_REGEX \
                               FLOW_SIM_RESULT_RULE \
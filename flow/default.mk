@@ -32,12 +32,14 @@ $(error No FLOW_BACKEND backend has been found! Make sure that the necessary EDA
 endif
 
 # aliases for the backend specific targets
-.PHONY: project hdlsb hdlsg synthcb implcb
+.PHONY: project hdlsb hdlsbb hdlsg synthcb implcb implscb
 project: ${FLOW_BACKEND}_project
 hdlsb: ${FLOW_BACKEND}_hdlsb
+hdlsbb: ${FLOW_BACKEND}_hdlsbb
 hdlsg: ${FLOW_BACKEND}_hdlsg
 synthcb: ${FLOW_BACKEND}_synthcb
 implcb: ${FLOW_BACKEND}_implcb
+implscb: ${FLOW_BACKEND}_implscb
 
 .PHONY: info
 info:
@@ -77,6 +79,9 @@ endif # FLOW_SIM_DEPENDENCIES
 ifdef FLOW_FULL_DEPENDENCIES
 	@echo "FLOW_FULL_DEPENDENCIES: ${FLOW_FULL_DEPENDENCIES}"
 endif # FLOW_FULL_DEPENDENCIES
+ifdef FLOW_SIM_OUTPUT_FILES
+	@echo "FLOW_SIM_OUTPUT_FILES:  ${FLOW_SIM_OUTPUT_FILES}"
+endif # FLOW_SIM_OUTPUT_FILES
 ifdef FLOW_SIM_RESULT_FILE
 	@echo "FLOW_SIM_RESULT_FILE:   ${FLOW_SIM_RESULT_FILE}"
 endif # FLOW_SIM_RESULT_FILE
@@ -89,6 +94,9 @@ endif # FLOW_SIM_RESULT_RULE
 ifdef FLOW_SIM_TIME
 	@echo "FLOW_SIM_TIME:          ${FLOW_SIM_TIME}"
 endif # FLOW_SIM_TIME
+ifdef FLOW_SIM_GENERIC_SETS
+	@echo "FLOW_SIM_GENERIC_SETS:  ${FLOW_SIM_GENERIC_SETS}"
+endif # FLOW_SIM_GENERIC_SETS
 ifdef VERBOSE
 	@echo ""
 ifdef FLOW_FULL_DEPENDENCY_DIRS
@@ -149,11 +157,13 @@ help:
 	@echo "    project...........Generate a project for the module into the binary directory."
 	@echo ""
 	@echo "    hdlsb.............Simulate the module (batch mode)."
+	@echo "    hdlsbb............Simulate all FLOW_SIM_GENERIC_SETS of the module (batch mode)."
 	@echo "    hdlsg.............Simulate the module (GUI)."
 	@echo ""
 	@echo "    synthcb...........Synthesize the module (batch mode)."
 	@echo ""
 	@echo "    implcb............Implement the module (batch mode)."
+	@echo "    implscb...........Implement multiple strategies from one synthesis (batch mode)."
 ifdef BACKEND_HELP_TEXT
 	@echo ""
 	@echo "Backend specific targets:"
@@ -44,6 +44,22 @@ endif
 # (i.e., in the run phase).
 # FLOW_GHDL_RFLAGS ?=
 
+# All configurations of a module which are simulated with the same ghdl
+# version, flags, and HDL files share one analyzed work library. ghdl only
+# reanalyzes the units whose files or dependencies have changed, while every
+# test bench is elaborated in the binary directory of its configuration.
+# Setting FLOW_GHDL_WORK_DIR to ${FLOW_BINARY_DIR} restores a private library.
+FLOW_GHDL_WORK_ROOT ?= ${FLOW_SOURCE_DIR}/_ghdl_work
+FLOW_GHDL_VERSION   ?= $(shell ${FLOW_GHDL_BINARY} --version | head -n 1)
+GHDL_WORK_KEY       := $(shell echo "${FLOW_GHDL_VERSION} ${FLOW_GHDL_CFLAGS} $(sort ${FLOW_HDL_FILES} ${FLOW_SIM_HDL_FILES})" | cksum | cut -d ' ' -f 1)
+FLOW_GHDL_WORK_DIR  ?= ${FLOW_GHDL_WORK_ROOT}/${FLOW_MODULE}-${GHDL_WORK_KEY}
+
+# Sub projects are analyzed into their binary directory, which is referenced
+# via -P by the depending modules.
+ifeq (${GHDL_SUBPROJECT},1)
+override FLOW_GHDL_WORK_DIR := ${FLOW_BINARY_DIR}
+endif
+
 # define which variables should be shown on the info screen
 BACKEND_INFO_VARS += $(filter FLOW_GHDL_%,$(.VARIABLES)) FLOW_GTKWAVE_BINARY FLOW_LCOV_BINARY FLOW_GENHTML_BINARY
 
@@ -52,17 +68,18 @@ BACKEND_INFO_VARS += $(filter FLOW_GHDL_%,$(.VARIABLES)) FLOW_GTKWAVE_BINARY FLO
 ###############################################################################
 
 .PHONY: ghdl_project ghdl_subproject
-GHDL_PROJECT := ${FLOW_BINARY_DIR}/${FLOW_MODULE}-${FLOW_SIM_TOP}.stamp
+GHDL_PROJECT := ${FLOW_GHDL_WORK_DIR}/${FLOW_MODULE}.stamp
 ${GHDL_PROJECT}: ${FLOW_HDL_FILES} ${FLOW_SIM_HDL_FILES}
-	@mkdir -p ${FLOW_BINARY_DIR}
+	@mkdir -p ${FLOW_BINARY_DIR} ${FLOW_GHDL_WORK_DIR}
 	@cd ${FLOW_BINARY_DIR}; FLOW_LOG_FILE="${FLOW_BINARY_ROOT_DIR}/${FLOW_MODULE}_${FLOW_SIM_TOP}_project.log" bash ${FLOW_DIR}/ghdl/project.sh
 	@touch $@
 
 ghdl_project:
 	@$(call printStep,"### ${FLOW_MODULE}: processing dependencies")
 	@$(foreach entry,$(FLOW_SIM_FILES),mkdir -p $(dir $(lastword $(subst :, ,$(entry)))) && cp $(firstword $(subst :, ,$(entry))) $(lastword $(subst :, ,$(entry)));)
-	@$(foreach module,$(FLOW_FULL_DEPENDENCIES),$(call makeTarget,FLOW_MODULE=$(module) ghdl_subproject);)
+	@$(foreach module,$(FLOW_FULL_DEPENDENCIES),$(call makeTarget,FLOW_MODULE=$(module) GHDL_SUBPROJECT=1 ghdl_subproject);)
 	@$(call printStep,"### ${FLOW_MODULE}: configuring as top-level project")
+	@mkdir -p ${FLOW_BINARY_DIR}
 	@$(call makeTarget,$(GHDL_PROJECT))
 	@$(call printStep,"")
 
@@ -83,6 +100,12 @@ ghdl_hdlsg: ghdl_project
 	@cd ${FLOW_BINARY_DIR}; FLOW_LOG_FILE="${FLOW_BINARY_ROOT_DIR}/${FLOW_MODULE}_${FLOW_SIM_TOP}_simulation.log" FLOW_GTKWAVE_GUI=1 bash ${FLOW_DIR}/ghdl/run_simulation.sh
 	@$(call printStep,"")
 
+.PHONY: ghdl_hdlsbb
+ghdl_hdlsbb: ghdl_project
+	@$(call printStep,"### ${FLOW_MODULE}: simulating generic sets in batch mode")
+	@cd ${FLOW_BINARY_DIR}; FLOW_LOG_FILE="${FLOW_BINARY_ROOT_DIR}/${FLOW_MODULE}_${FLOW_SIM_TOP}_simulation.log" bash ${FLOW_DIR}/ghdl/run_simulation_batch.sh
+	@$(call printStep,"")
+
 .PHONY: ghdl_synthcb
 ghdl_synthcb:
 	@echo "Synthesis is not supported by GHDL!"
@@ -93,16 +116,21 @@ ghdl_implcb:
 	@echo "Implementation is not supported by GHDL!"
 	@exit 1
 
+.PHONY: ghdl_implscb
+ghdl_implscb:
+	@echo "Implementation is not supported by GHDL!"
+	@exit 1
+
 ifeq (${FLOW_GHDL_GCC},1)
 BACKEND_HELP_TEXT += $(subst ${space},+,"ghdl_covReset.....Reset the coverage counters.")
 BACKEND_HELP_TEXT += $(subst ${space},+,"ghdl_covGenerate..Generate coverage report.")
 .PHONY: ghdl_covReset ghdl_covGenerate
 ghdl_covReset:
-	@${FLOW_LCOV_BINARY} -z -d ${FLOW_BINARY_DIR}
+	@${FLOW_LCOV_BINARY} -z -d ${FLOW_GHDL_WORK_DIR}
 
 ghdl_covGenerate:
-	@${FLOW_LCOV_BINARY} -c -d ${FLOW_BINARY_DIR} -o ${FLOW_BINARY_DIR}/coverage.info
-	@${FLOW_LCOV_BINARY} --remove ${FLOW_BINARY_DIR}/coverage.info '${FLOW_BINARY_DIR}/e~*' -o ${FLOW_BINARY_DIR}/coverage.info
+	@${FLOW_LCOV_BINARY} -c -d ${FLOW_GHDL_WORK_DIR} -o ${FLOW_BINARY_DIR}/coverage.info
+	@${FLOW_LCOV_BINARY} --remove ${FLOW_BINARY_DIR}/coverage.info '${FLOW_BINARY_DIR}/e~*' '${FLOW_GHDL_WORK_DIR}/e~*' -o ${FLOW_BINARY_DIR}/coverage.info
 	@cd ${FLOW_BINARY_DIR}; ${FLOW_GENHTML_BINARY} coverage.info -o html
 endif
 
@@ -46,9 +46,16 @@ for I in ${FLOW_FULL_DEPENDENCY_DIRS}
 do
   GHDL_COMPILE_OPTIONS="${GHDL_COMPILE_OPTIONS} -P${I}"
 done
+GHDL_COMPILE_OPTIONS="${GHDL_COMPILE_OPTIONS} --workdir=${FLOW_GHDL_WORK_DIR}"
 
-echo "\$ ${FLOW_GHDL_BINARY} -i ${GHDL_COMPILE_OPTIONS} ${FLOW_HDL_FILES} ${FLOW_SIM_HDL_FILES}" 2>&1 | log
-${FLOW_GHDL_BINARY} -i ${GHDL_COMPILE_OPTIONS} ${FLOW_HDL_FILES} ${FLOW_SIM_HDL_FILES} 2>&1 | log
+# the work library may be shared with concurrently running configurations
+GHDL_LOCK=""
+if command -v flock > /dev/null; then
+  GHDL_LOCK="flock ${FLOW_GHDL_WORK_DIR}/.lock"
+fi
+
+echo "\$ ${GHDL_LOCK} ${FLOW_GHDL_BINARY} -i ${GHDL_COMPILE_OPTIONS} ${FLOW_HDL_FILES} ${FLOW_SIM_HDL_FILES}" 2>&1 | log
+${GHDL_LOCK} ${FLOW_GHDL_BINARY} -i ${GHDL_COMPILE_OPTIONS} ${FLOW_HDL_FILES} ${FLOW_SIM_HDL_FILES} 2>&1 | log
 RETURN_VALUE=${PIPESTATUS[0]}
 
 exit $RETURN_VALUE
@@ -46,10 +46,17 @@ for I in ${FLOW_FULL_DEPENDENCY_DIRS}
 do
   GHDL_COMPILE_OPTIONS="${GHDL_COMPILE_OPTIONS} -P${I}"
 done
+GHDL_COMPILE_OPTIONS="${GHDL_COMPILE_OPTIONS} --workdir=${FLOW_GHDL_WORK_DIR}"
 
-# Analyse and elaborate the design
-echo "\$ ${FLOW_GHDL_BINARY} -m ${GHDL_COMPILE_OPTIONS} ${FLOW_SIM_TOP}" 2>&1 | log
-${FLOW_GHDL_BINARY} -m ${GHDL_COMPILE_OPTIONS} ${FLOW_SIM_TOP} 2>&1 | log
+# the work library may be shared with concurrently running configurations
+GHDL_LOCK=""
+if command -v flock > /dev/null; then
+  GHDL_LOCK="flock ${FLOW_GHDL_WORK_DIR}/.lock"
+fi
+
+# Analyse the outdated units and elaborate the design
+echo "\$ ${GHDL_LOCK} ${FLOW_GHDL_BINARY} -m ${GHDL_COMPILE_OPTIONS} ${FLOW_SIM_TOP}" 2>&1 | log
+${GHDL_LOCK} ${FLOW_GHDL_BINARY} -m ${GHDL_COMPILE_OPTIONS} ${FLOW_SIM_TOP} 2>&1 | log
 RETURN_VALUE=${PIPESTATUS[0]}
 if [ $RETURN_VALUE -ne "0" ]; then
   exit $RETURN_VALUE
@@ -78,6 +85,15 @@ case ${FLOW_SIM_RESULT_RULE} in
   ;;
 esac
 
+# delete stale output files of previous simulations
+for F in ${FLOW_SIM_OUTPUT_FILES}
+do
+  if [ -f "${F}" ]; then
+    echo "\$ rm ${F}" 2>&1 | log
+    rm "${F}" 2>&1 | log
+  fi
+done
+
 # convert the generics into ghdl options
 GENERICS=$(env | grep -e "^GENERIC_" | xargs)
 for I in ${GENERICS}
@@ -94,6 +110,15 @@ if [ $RETURN_VALUE -ne "0" ] && [ "sim-return" = "${FLOW_SIM_RESULT_RULE}" ]; th
   exit $RETURN_VALUE
 fi
 
+# keep the output files of the simulation
+for F in ${FLOW_SIM_OUTPUT_FILES}
+do
+  if [ -f "${F}" ]; then
+    echo "\$ cp ${F} ${FLOW_BINARY_ROOT_DIR}/${FLOW_MODULE}_$(basename ${F})" 2>&1 | log
+    cp "${F}" "${FLOW_BINARY_ROOT_DIR}/${FLOW_MODULE}_$(basename ${F})" 2>&1 | log
+  fi
+done
+
 # determine the exit code of the simulation
 case ${FLOW_SIM_RESULT_RULE} in
   file-success)
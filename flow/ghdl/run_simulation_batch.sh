@@ -0,0 +1,60 @@
+#!/bin/bash
+#
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+#
+if [ -z "${FLOW_SIM_GENERIC_SETS}" ]; then
+  echo "No generic sets defined. Use the hdlsb target for a single simulation!"
+  exit 1
+fi
+
+# ghdl applies the generics when the simulation is run. Every generic set in
+# FLOW_SIM_GENERIC_SETS (separated by ";") is therefore simulated as variant
+# <n> of the same elaborated design. The result of the variant is written into
+# <module>-variant_<n>.status in the binary root directory.
+PREFIX="${FLOW_BINARY_ROOT_DIR}/${FLOW_MODULE}-variant"
+rm -f "${PREFIX}"_*
+
+IFS=';' read -ra GENERIC_SETS <<< "${FLOW_SIM_GENERIC_SETS}"
+EXIT_CODE=0
+for INDEX in "${!GENERIC_SETS[@]}"
+do
+  echo "Simulating variant ${INDEX}: ${GENERIC_SETS[${INDEX}]}"
+  (
+    for GENERIC in ${GENERIC_SETS[${INDEX}]}
+    do
+      export "GENERIC_${GENERIC}"
+    done
+    bash ${FLOW_DIR}/ghdl/run_simulation.sh
+  )
+  STATUS=$?
+  echo ${STATUS} > "${PREFIX}_${INDEX}.status"
+  if [ ${STATUS} -ne "0" ] && [ ${EXIT_CODE} -eq "0" ]; then
+    EXIT_CODE=${STATUS}
+  fi
+
+  # keep the output files of the variant
+  for F in ${FLOW_SIM_OUTPUT_FILES}
+  do
+    if [ -f "${FLOW_BINARY_ROOT_DIR}/${FLOW_MODULE}_$(basename ${F})" ]; then
+      mv "${FLOW_BINARY_ROOT_DIR}/${FLOW_MODULE}_$(basename ${F})" "${PREFIX}_${INDEX}_$(basename ${F})"
+    fi
+  done
+done
+
+exit ${EXIT_CODE}
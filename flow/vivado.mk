@@ -44,12 +44,25 @@ FLOW_VIVADO_SYNTH_STRATEGY ?= Vivado Synthesis Defaults
 FLOW_VIVADO_IMPL_FLOW      ?= Vivado Implementation 2016
 FLOW_VIVADO_IMPL_STRATEGY  ?= Vivado Implementation Defaults
 
+# Strategies (separated by ";") which are implemented by the implscb target
+# from a single synthesis run. At most FLOW_VIVADO_IMPL_JOBS implementation
+# runs are executed in parallel.
+FLOW_VIVADO_IMPL_STRATEGIES ?= ${FLOW_VIVADO_IMPL_STRATEGY}
+FLOW_VIVADO_IMPL_JOBS       ?= 4
+
 FLOW_VIVADO_PROJECT        ?= ${FLOW_BINARY_DIR}/${FLOW_MODULE}.xpr
 FLOW_VIVADO_PROJECT_RECIPE ?= ${FLOW_BINARY_DIR}/${FLOW_MODULE}_recipe.tcl
 FLOW_VIVADO_PROJECT_STAMP  ?= ${FLOW_BINARY_DIR}/${FLOW_MODULE}.tcl
 
 FLOW_VIVADO_PACKAGE_XML    ?= ${FLOW_SOURCE_DIR}/component.xml
 
+# The compiled simulation sources of hdlsbb are kept outside of the binary
+# directory, such that clean does not remove them. The directory is keyed by
+# the Vivado binary, the simulation top, and the sources (like _ghdl_work).
+FLOW_VIVADO_SIM_WORK_ROOT ?= ${FLOW_SOURCE_DIR}/_xsim_work
+VIVADO_SIM_WORK_KEY       := $(shell echo "${FLOW_VIVADO_BINARY} ${FLOW_SIM_TOP} $(sort ${FLOW_HDL_FILES} ${FLOW_SIM_HDL_FILES} ${FLOW_VIVADO_SIM_IP_FILES})" | cksum | cut -d ' ' -f 1)
+FLOW_VIVADO_SIM_WORK_DIR  ?= ${FLOW_VIVADO_SIM_WORK_ROOT}/${FLOW_MODULE}-${VIVADO_SIM_WORK_KEY}
+
 # The current project based flow can only copy simulation files into the
 # simulation directory itself and does not support paths relative to it or
 # renaming. The destination part is therefore removed from the FLOW_SIM_FILES
@@ -74,6 +87,9 @@ ifneq ($(ABS_FLOW_SIM_RESULT_FILE),$(FLOW_SIM_RESULT_FILE))
   override FLOW_SIM_RESULT_FILE := ${FLOW_BINARY_DIR}/memsec.sim/sim_1/behav/${FLOW_SIM_RESULT_FILE}
 endif
 
+# Same for the FLOW_SIM_OUTPUT_FILES.
+override FLOW_SIM_OUTPUT_FILES := $(foreach file,${FLOW_SIM_OUTPUT_FILES},$(if $(filter /%,${file}),${file},${FLOW_BINARY_DIR}/memsec.sim/sim_1/behav/${file}))
+
 # define which variables should be shown on the info screen
 BACKEND_INFO_VARS += $(filter FLOW_VIVADO_%,$(.VARIABLES))
 
@@ -122,6 +138,12 @@ vivado_hdlsb: vivado_project
 	@cd ${FLOW_BINARY_DIR}; FLOW_LOG_FILE="${FLOW_BINARY_ROOT_DIR}/${FLOW_MODULE}_${FLOW_SIM_TOP}_simulation.log" sh ${FLOW_DIR}/vivado/run_simulation.sh
 	@$(call printStep,"")
 
+.PHONY: vivado_hdlsbb
+vivado_hdlsbb: vivado_project
+	@$(call printStep,"### ${FLOW_MODULE}: simulating generic sets in batch mode")
+	@cd ${FLOW_BINARY_DIR}; FLOW_LOG_FILE="${FLOW_BINARY_ROOT_DIR}/${FLOW_MODULE}_${FLOW_SIM_TOP}_simulation.log" sh ${FLOW_DIR}/vivado/run_simulation_batch.sh
+	@$(call printStep,"")
+
 .PHONY: vivado_hdlsg
 vivado_hdlsg: vivado_project
 	@$(call printStep,"### ${FLOW_MODULE}: simulating in graphical mode")
@@ -150,6 +172,13 @@ ${BITSTREAM_FILE}: | ${SYNTH_DCP}
 BACKEND_HELP_TEXT += $(subst ${space},+,"vivado_implcb........Implement the design in batch mode.")
 vivado_implcb: | ${BITSTREAM_FILE}
 
+.PHONY: vivado_implscb
+BACKEND_HELP_TEXT += $(subst ${space},+,"vivado_implscb.......Implement all FLOW_VIVADO_IMPL_STRATEGIES in batch mode.")
+vivado_implscb: | ${SYNTH_DCP}
+	@$(call printStep,"### ${FLOW_MODULE}: implementing strategies in bash mode")
+	@cd ${FLOW_BINARY_DIR}; FLOW_LOG_FILE="${FLOW_BINARY_ROOT_DIR}/${FLOW_MODULE}_implementation.log" sh ${FLOW_DIR}/vivado/run_implementation_strategies.sh
+	@$(call printStep,"")
+
 ${FLOW_VIVADO_PACKAGE_XML}: ${FLOW_VIVADO_PROJECT_STAMP}
 	@$(call printStep,"### ${FLOW_MODULE}: packaging IP in bash mode")
 	@cd ${FLOW_BINARY_DIR}; FLOW_LOG_FILE="${FLOW_BINARY_ROOT_DIR}/${FLOW_MODULE}_package.log" sh ${FLOW_DIR}/vivado/package_ip.sh
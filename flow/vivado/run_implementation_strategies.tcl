@@ -0,0 +1,85 @@
+#
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+#
+open_project $env(FLOW_MODULE).xpr
+
+# Every strategy in FLOW_VIVADO_IMPL_STRATEGIES (separated by ";") is
+# implemented in its own run impl_strategy_<n>. All runs are children of
+# synth_1 and therefore start from the same synthesized netlist.
+set strategies [split $env(FLOW_VIVADO_IMPL_STRATEGIES) ";"]
+set runs [list]
+set pending_runs [list]
+for {set index 0} {$index < [llength $strategies]} {incr index} {
+  set strategy [string trim [lindex $strategies $index]]
+  set run "impl_strategy_$index"
+  if {[string equal [get_runs -quiet $run] ""]} {
+    create_run -name $run -part $env(FLOW_VIVADO_PARTNAME) -flow "$env(FLOW_VIVADO_IMPL_FLOW)" -strategy "$strategy" -constrset constrs_1 -parent_run synth_1
+  } elseif {[get_property strategy [get_runs $run]] != "$strategy" } {
+    puts "Switching strategy of $run to $strategy"
+    set_property strategy "$strategy" [get_runs $run]
+    reset_run $run
+  } elseif {[get_property PROGRESS [get_runs $run]] != "100%" || [get_property NEEDS_REFRESH [get_runs $run]] != 0 } {
+    reset_run $run
+  }
+  if {[get_property PROGRESS [get_runs $run]] != "100%" } {
+    lappend pending_runs $run
+  }
+  lappend runs $run
+}
+
+if {[llength $pending_runs] > 0} {
+  launch_runs $pending_runs -to_step write_bitstream -jobs $env(FLOW_VIVADO_IMPL_JOBS)
+  foreach run $pending_runs {
+    wait_on_run $run
+  }
+}
+
+# export the results of every run and record its outcome in a status file
+# (0 = success, 1 = implementation failed, 2 = timing constraints not met)
+set exit_code 0
+foreach run $runs {
+  set prefix "$env(FLOW_BINARY_ROOT_DIR)/$env(FLOW_MODULE)-$run"
+  if {[get_property PROGRESS [get_runs $run]] != "100%"} {
+    puts "ERROR: implementation $run failed"
+    set status 1
+    set exit_code -1
+  } else {
+    open_run $run
+    write_checkpoint -force "$prefix.dcp"
+    report_timing_summary -file "${prefix}_timing_summary.txt" -delay_type min_max -report_unconstrained -check_timing_verbose -max_paths 10 -input_pins
+    report_utilization -hierarchical -file "${prefix}_utilization.txt"
+    file copy -force "$env(FLOW_MODULE).runs/$run/$env(FLOW_MODULE).bit" "$prefix.bit"
+    close_design
+
+    set status 0
+    if {[get_property STATS.WNS [get_runs $run]] < 0 } {
+      puts "Timing constraints are not met by $run."
+      set status 2
+      if {$exit_code == 0} {
+        set exit_code -2
+      }
+    }
+  }
+  set status_file [open "$prefix.status" "w"]
+  puts $status_file $status
+  close $status_file
+}
+
+close_project
+exit $exit_code
@@ -55,6 +55,15 @@ case ${FLOW_SIM_RESULT_RULE} in
   ;;
 esac
 
+# delete stale output files of previous simulations
+for F in ${FLOW_SIM_OUTPUT_FILES}
+do
+  if [ -f "${F}" ]; then
+    echo "\$ rm ${F}" 2>&1 | log
+    rm "${F}" 2>&1 | log
+  fi
+done
+
 # run the simulation
 echo "\$ ${FLOW_VIVADO_BINARY} -nojournal -nolog -mode batch -source ${FLOW_DIR}/vivado/run_simulation.tcl" 2>&1 | log
 ${FLOW_VIVADO_BINARY} -nojournal -nolog -mode batch -source ${FLOW_DIR}/vivado/run_simulation.tcl 2>&1 | tee "${LATEST_SIM_LOG_FILE}" | log
@@ -66,6 +75,15 @@ if [ ${LAUNCH_FAIL} -eq "0" ] && [ "sim-return" = "${FLOW_SIM_RESULT_RULE}" ]; t
   exit 1
 fi
 
+# keep the output files of the simulation
+for F in ${FLOW_SIM_OUTPUT_FILES}
+do
+  if [ -f "${F}" ]; then
+    echo "\$ cp ${F} ${FLOW_BINARY_ROOT_DIR}/${FLOW_MODULE}_$(basename ${F})" 2>&1 | log
+    cp "${F}" "${FLOW_BINARY_ROOT_DIR}/${FLOW_MODULE}_$(basename ${F})" 2>&1 | log
+  fi
+done
+
 # determine the exit code of the simulation
 case ${FLOW_SIM_RESULT_RULE} in
   file-success)
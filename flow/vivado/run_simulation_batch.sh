@@ -0,0 +1,122 @@
+#!/bin/sh
+#
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+#
+PWD=$(pwd)
+DATE=$(date)
+LATEST_SIM_LOG_FILE=${FLOW_MODULE}_${FLOW_SIM_TOP}_latest_simulation.log
+
+# define the log command which writes to the logfile and possibly to stdout
+if [ ${FLOW_VERBOSITY} -ge 2 ]; then
+  alias log='tee -a "${FLOW_LOG_FILE}"'
+else
+  alias log='cat >> "${FLOW_LOG_FILE}"'
+fi
+
+echo "" >> "${FLOW_LOG_FILE}"
+echo "###############################################################################" >> "${FLOW_LOG_FILE}"
+echo "# ${DATE}" >> "${FLOW_LOG_FILE}"
+echo "###############################################################################" >> "${FLOW_LOG_FILE}"
+echo "\$ cd ${PWD}" 2>&1 | log
+
+if [ -z "${FLOW_SIM_TOP}" ]; then
+  echo "No top module defined. Simulation not possible!"
+  exit 1
+fi
+
+if [ -z "${FLOW_SIM_GENERIC_SETS}" ]; then
+  echo "No generic sets defined. Use the hdlsb target for a single simulation!"
+  exit 1
+fi
+
+# The result of variant <n> is written into <module>-variant_<n>.status in the
+# binary root directory. Stale files of previous batches are deleted first.
+VARIANTS=$(echo "${FLOW_SIM_GENERIC_SETS}" | awk -F ';' '{print NF}')
+PREFIX="${FLOW_BINARY_ROOT_DIR}/${FLOW_MODULE}-variant"
+rm -f "${PREFIX}"_*
+
+# run the simulations
+echo "\$ ${FLOW_VIVADO_BINARY} -nojournal -nolog -mode batch -source ${FLOW_DIR}/vivado/run_simulation_batch.tcl" 2>&1 | log
+${FLOW_VIVADO_BINARY} -nojournal -nolog -mode batch -source ${FLOW_DIR}/vivado/run_simulation_batch.tcl 2>&1 | tee "${LATEST_SIM_LOG_FILE}" | log
+
+# without a result file, the output of the whole batch is matched
+RESULT_FILE_SUFFIX=".result"
+if [ -z "${FLOW_SIM_RESULT_FILE}" ]; then
+  RESULT_FILE_SUFFIX=""
+fi
+
+# determine the result of every variant
+EXIT_CODE=0
+INDEX=0
+while [ ${INDEX} -lt ${VARIANTS} ]; do
+  RESULT_FILE="${PREFIX}_${INDEX}${RESULT_FILE_SUFFIX}"
+  if [ -z "${RESULT_FILE_SUFFIX}" ]; then
+    RESULT_FILE="${LATEST_SIM_LOG_FILE}"
+  fi
+  STATUS=2
+  if [ -f "${PREFIX}_${INDEX}.status" ]; then
+    STATUS=$(cat "${PREFIX}_${INDEX}.status")
+  fi
+
+  if [ ${STATUS} -eq "3" ]; then
+    echo "RESULT: Variant ${INDEX}: Launching the simulation failed." 2>&1 | log
+    STATUS=1
+  elif [ ! -f "${PREFIX}_${INDEX}.status" ]; then
+    echo "RESULT: Variant ${INDEX}: Not simulated." 2>&1 | log
+  else
+    case ${FLOW_SIM_RESULT_RULE} in
+      file-success|file-failure)
+      if [ -f "${RESULT_FILE}" ]; then
+        COMP=$(cat "${RESULT_FILE}" | grep -Eq "${FLOW_SIM_RESULT_REGEX}"; echo $?)
+        STATUS=1
+        if [ "file-success" = "${FLOW_SIM_RESULT_RULE}" ] && [ ${COMP} -eq "0" ]; then
+          STATUS=0
+        fi
+        if [ "file-failure" = "${FLOW_SIM_RESULT_RULE}" ] && [ ${COMP} -ne "0" ]; then
+          STATUS=0
+        fi
+        if [ ${STATUS} -eq "0" ]; then
+          echo "RESULT: Variant ${INDEX}: Simulation succeeded" 2>&1 | log
+        else
+          echo "RESULT: Variant ${INDEX}: Simulation failed." 2>&1 | log
+        fi
+      else
+        echo "RESULT: Variant ${INDEX}: Timeout. Result file \"${RESULT_FILE}\" not found." 2>&1 | log
+        STATUS=2
+      fi
+      ;;
+
+      sim-return)
+      ;;
+
+      *)
+      echo "ERROR: unsupported RESULT_RULE '${FLOW_SIM_RESULT_RULE}' used" 2>&1 | log
+      STATUS=1
+      ;;
+    esac
+  fi
+
+  echo ${STATUS} > "${PREFIX}_${INDEX}.status"
+  if [ ${STATUS} -ne "0" ] && [ ${EXIT_CODE} -eq "0" ]; then
+    EXIT_CODE=${STATUS}
+  fi
+  INDEX=$((INDEX+1))
+done
+
+exit ${EXIT_CODE}
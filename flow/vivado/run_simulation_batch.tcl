@@ -0,0 +1,154 @@
+#
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+#
+open_project $env(FLOW_MODULE).xpr
+
+source [file join [file dirname [info script]] "configure_simulation.frag"]
+
+# Every generic set in FLOW_SIM_GENERIC_SETS (separated by ";") is simulated as
+# variant <n> of the same compiled design. The sources are only compiled when
+# they have changed since the last batch. The generics of a variant are
+# applied when its snapshot is elaborated.
+set simulation_dir "$env(FLOW_MODULE).sim/sim_1/behav"
+set base_generics [get_property generic [get_filesets sim_1]]
+set generic_sets [split $env(FLOW_SIM_GENERIC_SETS) ";"]
+set sources [lsort [get_files -compile_order sources -used_in simulation -of_objects [get_filesets sim_1]]]
+
+# The compiled simulation directory is kept together with its stamp in
+# FLOW_VIVADO_SIM_WORK_DIR, outside of the binary directory which is removed
+# by clean. Files which are generated into the binary directory (e.g., IP
+# simulation sources) are recorded relative to it.
+set work_dir $env(FLOW_VIVADO_SIM_WORK_DIR)
+set compile_stamp "$work_dir/compile.stamp"
+set binary_dir [file normalize $env(FLOW_BINARY_DIR)]
+set stamp_sources [string map [list $binary_dir "\${FLOW_BINARY_DIR}"] $sources]
+
+set result_file ""
+if { [info exists env(FLOW_SIM_RESULT_FILE)] == 1 } {
+  set result_file $env(FLOW_SIM_RESULT_FILE)
+}
+set output_files ""
+if { [info exists env(FLOW_SIM_OUTPUT_FILES)] == 1 } {
+  set output_files $env(FLOW_SIM_OUTPUT_FILES)
+}
+
+set compile 1
+if { [file exists $compile_stamp] == 1 } {
+  set fd [open $compile_stamp "r"]
+  set compiled_sources [read $fd]
+  close $fd
+  set compile [expr {$compiled_sources ne $stamp_sources}]
+  foreach source $sources {
+    if { [string first $binary_dir $source] != 0 && [file mtime $source] > [file mtime $compile_stamp] } {
+      set compile 1
+    }
+  }
+}
+
+# Older Vivado versions cannot launch the simulation steps separately. Every
+# variant is then compiled, elaborated and simulated by launch_simulation.
+set separate_steps 1
+if { $compile == 0 } {
+  puts "Simulation sources are uptodate."
+  file mkdir $simulation_dir
+  foreach file [glob -nocomplain -directory $work_dir *] {
+    if { [file tail $file] ne "compile.stamp" } {
+      file delete -force [file join $simulation_dir [file tail $file]]
+      file copy -force $file $simulation_dir
+    }
+  }
+} elseif { [catch {launch_simulation -step compile -noclean_dir} error] == 0 } {
+  # the new directory is completed before it replaces the old one, such that
+  # concurrent batches never copy a partial directory
+  set new_work_dir "$work_dir.[pid]"
+  file delete -force $new_work_dir
+  file mkdir $new_work_dir
+  foreach file [glob -nocomplain -directory $simulation_dir *] {
+    file copy -force $file $new_work_dir
+  }
+  set fd [open "$new_work_dir/compile.stamp" "w"]
+  puts -nonewline $fd $stamp_sources
+  close $fd
+  file delete -force $work_dir
+  if { [catch {file rename $new_work_dir $work_dir} error] != 0 } {
+    file delete -force $new_work_dir
+  }
+} else {
+  puts "Compiling the simulation sources separately failed: $error"
+  file delete -force $compile_stamp
+  set separate_steps 0
+}
+
+for {set index 0} {$index < [llength $generic_sets]} {incr index} {
+  # the generics of the set replace the ones of the environment
+  set generics [dict create]
+  foreach generic [concat $base_generics [lindex $generic_sets $index]] {
+    set pair [split $generic "="]
+    dict set generics [lindex $pair 0] [join [lrange $pair 1 end] "="]
+  }
+  set value ""
+  dict for {name generic_value} $generics {
+    set value "$value $name=$generic_value"
+  }
+  set value [string trim $value]
+  set_property -name generic -value $value -objects [get_filesets sim_1]
+  puts "Simulating variant $index: $value"
+
+  set prefix "$env(FLOW_BINARY_ROOT_DIR)/$env(FLOW_MODULE)-variant_$index"
+  foreach file [concat $result_file $output_files "$prefix.result"] {
+    file delete -force $file
+  }
+
+  if { $separate_steps == 1 } {
+    launch_simulation -step elaborate -noclean_dir -quiet
+    launch_simulation -step simulate -noclean_dir -quiet
+  } else {
+    launch_simulation -quiet
+  }
+
+  # (0 = launched, 3 = launching the simulation failed)
+  set status 0
+  if { {} == [current_sim] } {
+    puts "Launching the simulation of variant $index failed!"
+    set elaborate_log_file_name "$simulation_dir/elaborate.log"
+    if { [file exists $elaborate_log_file_name] == 1 } {
+      set fd [open "$elaborate_log_file_name" "r"]
+      puts [read $fd [file size $elaborate_log_file_name]]
+      close $fd
+    }
+    set status 3
+  } else {
+    run $env(FLOW_SIM_TIME)
+    puts "Variant $index stopped after [current_time]"
+    close_sim -force
+    if { $result_file ne "" && [file exists $result_file] == 1 } {
+      file copy -force $result_file "$prefix.result"
+    }
+    foreach file $output_files {
+      if { [file exists $file] == 1 } {
+        file copy -force $file "${prefix}_[file tail $file]"
+      }
+    }
+  }
+  set status_file [open "$prefix.status" "w"]
+  puts $status_file $status
+  close $status_file
+}
+
+close_project
@@ -0,0 +1,130 @@
+#
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+# Persistent worker for the flow scripts (see python/memsec/vivadoserver.py).
+# The requests are read from stdin, one per line:
+#   run <id> <directory> <environment> <script>
+# The script is sourced in <directory> with <environment> added to env, i.e.,
+# exactly like "vivado -mode batch -source <script>". The end of a request is
+# marked by a "@@MEMSEC_DONE <id> <exit code>" line on stdout.
+fconfigure stdout -buffering line
+
+set memsec_base_env [array get env]
+
+# The project stays open between the requests and is reused when the next
+# script opens the same, unmodified project file.
+set memsec_project ""
+set memsec_project_stat ""
+
+proc memsec_file_stat {file} {
+  if {[catch {file stat $file stat}]} {
+    return ""
+  }
+  return [list $stat(ino) $stat(mtime) $stat(size)]
+}
+
+proc memsec_drop_project {} {
+  global memsec_project
+  if {$memsec_project != ""} {
+    catch {memsec_close_project}
+    set memsec_project ""
+  }
+}
+
+proc memsec_park_project {} {
+  global memsec_project memsec_project_stat
+  if {$memsec_project == ""} {
+    return
+  }
+  catch {close_sim -force -quiet}
+  foreach design [get_designs -quiet] {
+    current_design $design
+    close_design
+  }
+  set memsec_project_stat [memsec_file_stat $memsec_project]
+}
+
+rename open_project memsec_open_project
+proc open_project {args} {
+  global memsec_project memsec_project_stat
+  set file [file normalize [lindex $args end]]
+  if {$memsec_project == $file && $memsec_project_stat != "" && [memsec_file_stat $file] == $memsec_project_stat} {
+    puts "Reusing the open project $file"
+    return [current_project]
+  }
+  memsec_drop_project
+  set project [memsec_open_project {*}$args]
+  set memsec_project $file
+  return $project
+}
+
+rename close_project memsec_close_project
+proc close_project {args} {
+  global memsec_project
+  if {$memsec_project == "" || [llength $args] > 0} {
+    set memsec_project ""
+    return [memsec_close_project {*}$args]
+  }
+  memsec_park_project
+}
+
+rename create_project memsec_create_project
+proc create_project {args} {
+  global memsec_project
+  memsec_drop_project
+  set project [memsec_create_project {*}$args]
+  catch {set memsec_project [file normalize [get_property DIRECTORY $project]/[get_property NAME $project].xpr]}
+  return $project
+}
+
+# the flow scripts end with exit, which must only end the request
+rename exit memsec_exit
+proc exit {{code 0}} {
+  return -code error -errorcode [list MEMSEC_EXIT $code] "exit $code"
+}
+
+proc memsec_run {id directory environment script} {
+  global env errorCode memsec_base_env
+  array unset env
+  array set env $memsec_base_env
+  array set env $environment
+  set code 0
+  if {[catch {cd $directory; uplevel #0 [list source $script]} message]} {
+    if {[lindex $errorCode 0] == "MEMSEC_EXIT"} {
+      set code [expr {[lindex $errorCode 1] & 0xff}]
+    } else {
+      puts $::errorInfo
+      set code 1
+    }
+  }
+  # the state of a failed script is unknown
+  if {$code != 0 || [catch memsec_park_project]} {
+    memsec_drop_project
+  }
+  puts "@@MEMSEC_DONE $id $code"
+}
+
+puts "@@MEMSEC_READY"
+while {[gets stdin request] >= 0} {
+  if {[catch {lindex $request 0} command] == 0 && $command == "run"} {
+    memsec_run {*}[lrange $request 1 end]
+  }
+}
+memsec_exit 0
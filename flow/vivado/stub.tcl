@@ -0,0 +1,37 @@
+#
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+# Stub interpreter which runs the flow scripts with a plain tclsh (see
+# vivado_stub.sh). Every Vivado command only prints its arguments and returns
+# an empty result, which is enough to test the flow plumbing (e.g., the
+# persistent vivado server) without Vivado.
+proc unknown {args} {
+  puts "stub: $args"
+  return ""
+}
+
+# commands which are wrapped by server.tcl have to exist
+foreach command {open_project close_project create_project current_project} {
+  proc $command {args} "puts \"stub: $command \$args\"; return {}"
+}
+
+set script [lindex $argv 0]
+set argv [lrange $argv 1 end]
+source $script
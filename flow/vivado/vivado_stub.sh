@@ -0,0 +1,42 @@
+#!/bin/sh
+#
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+# Stand-in for the vivado binary which sources the -source script with tclsh
+# and stub.tcl, e.g., FLOW_VIVADO_BINARY="sh flow/vivado/vivado_stub.sh".
+SCRIPT=""
+while [ $# -gt 0 ]; do
+  case "$1" in
+    -version)
+      echo "Vivado v0000.0 (stub)"
+      exit 0
+      ;;
+    -source)
+      SCRIPT="$2"
+      shift
+      ;;
+  esac
+  shift
+done
+
+if [ -z "${SCRIPT}" ]; then
+  echo "The stub only supports -source <script>."
+  exit 1
+fi
+
+exec ${FLOW_TCLSH:-tclsh} "$(dirname "$0")/stub.tcl" "${SCRIPT}"
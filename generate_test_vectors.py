@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "python"))
+from memsec import *
+
+parser = argparse.ArgumentParser(description='Generate random test vectors for the cryptographic primitives with the golden models.')
+parser.add_argument('-n', '--count', type=int, default=10000, help='number of vectors per test bench')
+parser.add_argument('--seed', type=int, default=0, help='seed of the random number generator')
+parser.add_argument('--output-dir', default='_vectors', help='the vector files are written into <output-dir>/<count>_<seed>')
+parser.add_argument('--simulate', action='store_true', help='run the test benches with the generated vectors')
+parser.add_argument('-j', '--jobs', type=int, default=1, help='number of simulations which are run in parallel (0 = number of cores)')
+parser.add_argument('--cache-dir', default=defaultCacheDir, help='cache the results of successful simulations in this directory (default: $MEMSEC_CACHE_DIR)')
+args = parser.parse_args()
+
+module ='memsec'
+outputDir = os.path.join(args.output_dir, '{}_{}'.format(args.count, args.seed))
+jobs = []
+
+def generate(name,directory,simTop,function,genericsDict={}):
+  os.makedirs(directory, exist_ok=True)
+  fileName = vectorFileName(directory, simTop)
+  start    = timeit.default_timer()
+  columns  = function()
+  end      = timeit.default_timer()
+  writeVectors(fileName, columns)
+  print("{:10} {:8.0f} vectors/s ({:.3f}s, written in {:.3f}s) {}".format(name, args.count/(end-start), end-start, timeit.default_timer()-end, fileName), flush=True)
+  return vectorTestJob(module, simTop, fileName, args.count, genericsDict)
+
+for r in [5,6,7]:
+  jobs += [generate('QARMA-{}'.format(r), os.path.join(outputDir, 'R{}'.format(r)), 'tb_qarma', lambda: qarmaVectors(args.count, r, args.seed), {'ROUNDS': r})]
+jobs += [generate('PRINCE', outputDir, 'tb_prince', lambda: princeVectors(args.count, args.seed))]
+ascon = generate('Ascon-128', outputDir, 'tb_ascon', lambda: asconVectors(args.count, args.seed))
+# the number of unrolled rounds does not influence the result
+for r in [1,2,3,6]:
+  jobs += [merge_dicts(ascon, {'GENERICS': merge_dicts(ascon['GENERICS'], {'UNROLED_ROUNDS': r})})]
+
+if not args.simulate:
+  sys.exit(0)
+
+if args.jobs == 1:
+  res = [runJob(job, cacheDir=args.cache_dir) for job in jobs]
+else:
+  res = runJobs(jobs, args.jobs, cacheDir=args.cache_dir)
+sys.exit(printSummary(res))
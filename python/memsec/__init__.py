@@ -16,9 +16,21 @@
 # You should have received a copy of the GNU General Public License
 # along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
+import functools
+import hashlib
+import json
 import os
+import re
 import subprocess
-import timeit
+import tempfile
+import time
+
+# results of successful runs are cached in this directory when it is set
+defaultCacheDir = os.environ.get('MEMSEC_CACHE_DIR')
+
+# timing events of all runs are appended to this file when it is set
+defaultEventsFile = os.environ.get('MEMSEC_EVENTS_FILE')
 
 def merge_dicts(*dict_args):
     result = {}
@@ -52,8 +64,17 @@ def abbrevateImplStrategy(fullname):
         'Performance_NetDelay_low'       : 'PNDl'
     }.get(fullname, fullname)
 
+# parameters which are abbreviated in the binary directory name, all others
+# are represented by a hash
+BINARY_DIR_NAME_KEYS = ['FLOW_SIM_TOP', 'CRYPTO_CONFIG', 'PCW_FPGA0_PERIPHERAL_FREQMHZ', 'TREE_ROOTS', 'TREE_ARITY', 'BLOCKS_PER_SECTOR', 'DATA_BLOCK_SIZE',
+                        'ROUNDS', 'UNROLED_ROUNDS', 'SIMULATION_ITERATIONS', 'BENCHMARK', 'VECTORS', 'STIMULUS', 'MEMORY_IMAGE', 'FLOW_VIVADO_SYNTH_STRATEGY', 'FLOW_VIVADO_IMPL_STRATEGY', 'DATASTREAM_DATA_WIDTH']
+
 def binaryDirName(optionsDict):
+  # The name is unique for every parameter set, i.e., jobs with different
+  # parameters never share a binary directory.
   name = []
+  if 'FLOW_SIM_TOP' in optionsDict.keys():
+    name += [optionsDict['FLOW_SIM_TOP']]
   if 'CRYPTO_CONFIG' in optionsDict.keys():
     name += ['CONFIG{}'.format(optionsDict['CRYPTO_CONFIG'])]
   if 'PCW_FPGA0_PERIPHERAL_FREQMHZ' in optionsDict.keys():
@@ -66,58 +87,157 @@ def binaryDirName(optionsDict):
     name += ['BPS{}'.format(optionsDict['BLOCKS_PER_SECTOR'])]
   if 'DATA_BLOCK_SIZE' in optionsDict.keys():
     name += ['B{}'.format(optionsDict['DATA_BLOCK_SIZE'])]
+  if 'ROUNDS' in optionsDict.keys():
+    name += ['RND{}'.format(optionsDict['ROUNDS'])]
+  if 'UNROLED_ROUNDS' in optionsDict.keys():
+    name += ['UR{}'.format(optionsDict['UNROLED_ROUNDS'])]
+  if 'SIMULATION_ITERATIONS' in optionsDict.keys():
+    name += ['IT{}'.format(optionsDict['SIMULATION_ITERATIONS'])]
+  if 'BENCHMARK' in optionsDict.keys():
+    name += ['BENCH{}'.format(optionsDict['BENCHMARK'])]
+  if 'VECTORS' in optionsDict.keys():
+    name += ['V{}'.format(optionsDict['VECTORS'])]
+  if 'STIMULUS' in optionsDict.keys():
+    name += ['ST{}'.format(optionsDict['STIMULUS'])]
+  if 'MEMORY_IMAGE' in optionsDict.keys():
+    name += ['MI{}'.format(optionsDict['MEMORY_IMAGE'])]
   if 'FLOW_VIVADO_SYNTH_STRATEGY' in optionsDict.keys() and abbrevateSynthStrategy(optionsDict['FLOW_VIVADO_SYNTH_STRATEGY']):
     name += ['S{}'.format(abbrevateSynthStrategy(optionsDict['FLOW_VIVADO_SYNTH_STRATEGY']))]
   if 'FLOW_VIVADO_IMPL_STRATEGY' in optionsDict.keys() and abbrevateImplStrategy(optionsDict['FLOW_VIVADO_IMPL_STRATEGY']):
     name += ['I{}'.format(abbrevateImplStrategy(optionsDict['FLOW_VIVADO_IMPL_STRATEGY']))]
   if 'DATASTREAM_DATA_WIDTH' in optionsDict.keys():
     name += ['W{}'.format(optionsDict['DATASTREAM_DATA_WIDTH'])]
+  others = {k: str(v) for k,v in optionsDict.items() if k not in BINARY_DIR_NAME_KEYS}
+  if others:
+    name += [hashlib.sha256(json.dumps(others, sort_keys=True).encode()).hexdigest()[:8]]
   if len(name) == 0:
     return None
   return "_"+"_".join(name)
 
-def run(module,targets,binaryRootDir=None,envVars=[]):
-  envVars += [ "FLOW_MODULE=\"{}\"".format(module) ]
-  if binaryRootDir:
-    envVars += [ "FLOW_BINARY_ROOT_DIR=\"{}\"".format(binaryRootDir) ]
-  command = ' '.join(envVars) + ' ' + ' '.join(['make'] + targets)
-  print("Running \"" + command + "\"...", flush=True)
-  start = timeit.default_timer()
-  returncode = subprocess.call(command, shell=True)
-  end = timeit.default_timer()
-  if returncode != 0:
-    print("Running \"" + command + "\"... FAILED! (Return code = {}) {} s".format(returncode, end-start), flush=True)
+def run(module,targets,binaryRootDir=None,envVars=[],logFile=None,timeout=None):
+  return asyncio.run(runAsync(module, targets, binaryRootDir, envVars, logFile, timeout))
+
+def waitForCommand(process):
+  # Returns the return code and the peak resident set size (in bytes) of the
+  # largest process which has been started by the command (e.g., vivado).
+  pid, status, usage = os.wait4(process.pid, 0)
+  if os.WIFSIGNALED(status):
+    process.returncode = -os.WTERMSIG(status)
   else:
-    print("Running \"" + command + "\"... OK! {} s".format(end-start), flush=True)
-  return  {'COMMAND': command, 'RETURN_CODE': returncode, 'EXECUTION_TIME': end-start, 'ERROR': True if returncode != 0 else False }
+    process.returncode = os.WEXITSTATUS(status)
+  return process.returncode, usage.ru_maxrss * 1024
+
+@functools.lru_cache()
+def flowBackend():
+  # resolved like the make flow, make is only asked when no tool is found
+  backend = resolveBackend(os.environ)
+  if backend:
+    return backend
+  infoOutput = subprocess.check_output(["make", "info"]).decode()
+  return re.search('FLOW_BACKEND:\s+(\w+)', infoOutput).group(1)
 
-def configureDatastreamDataWidth(datastream_width):
+@functools.lru_cache()
+def toolVersion(backend):
+  binary  = os.environ.get('FLOW_{}_BINARY'.format(backend.upper()), backend)
+  version = subprocess.check_output([binary, '--version' if backend == 'ghdl' else '-version']).decode()
+  return version.strip().splitlines()[0]
+
+def hdlFiles():
+  # same file list as the default memsecFLOW_HDL_FILES in the Makefile
+  files = []
+  for root, dirs, names in os.walk('hdl'):
+    files += [os.path.abspath(os.path.join(root, name)) for name in names if name.lower().endswith(('.vhd', '.vhdl'))]
+  return sorted(files)
+
+def configureDatastreamDataWidth(datastream_width,outputDir=None):
+  # Without an output directory, the shared configuration package is modified
+  # in place. Otherwise, a copy is written to outputDir and returned. The file
+  # is only rewritten when its content changes, i.e., the simulators do not
+  # reanalyze the design needlessly.
   print("Configuring DATASTREAM_DATA_WIDTH={}.".format(datastream_width));
-  with open('hdl/memsec_config.vhd', 'r') as input_file, open('hdl/memsec_config.vhd.tmp', 'w') as output_file:
-    for line in input_file:
-      if 'DATASTREAM_DATA_WIDTH' in line:
-        output_file.write("  constant DATASTREAM_DATA_WIDTH : integer := {};\n".format(datastream_width));
-      else:
-        output_file.write(line);
-  os.remove('hdl/memsec_config.vhd');
-  os.rename('hdl/memsec_config.vhd.tmp', 'hdl/memsec_config.vhd');
-  return
-
-def buildBitStream(module,bdGenericsDict={},optionsDict={}):
-  sumDict     = merge_dicts(bdGenericsDict, optionsDict)
-  configureDatastreamDataWidth(optionsDict.pop('DATASTREAM_DATA_WIDTH',64))
-  varStrings  = ["{}={}".format(bdGenericName(module,k),v) for k,v in bdGenericsDict.items()]
-  varStrings += ["{}{}=\"{}\"".format(module,k,v) for k,v in optionsDict.items()]
-  res = run(module,['implcb', 'clean'], binaryDirName(sumDict),varStrings)
-  return [merge_dicts(res, { 'OPTIONS': sumDict })]
+  outputFileName = 'hdl/memsec_config.vhd'
+  if outputDir:
+    os.makedirs(outputDir, exist_ok=True)
+    outputFileName = os.path.abspath(os.path.join(outputDir, 'memsec_config.vhd'))
+  with open('hdl/memsec_config.vhd', 'r') as input_file:
+    lines = ["  constant DATASTREAM_DATA_WIDTH : integer := {};\n".format(datastream_width) if 'DATASTREAM_DATA_WIDTH' in line else line for line in input_file]
+  if os.path.isfile(outputFileName):
+    with open(outputFileName, 'r') as f:
+      if f.read() == ''.join(lines):
+        return outputFileName
+  # the copies are shared by concurrent jobs and are replaced atomically
+  fd, tmpFileName = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(outputFileName)))
+  with os.fdopen(fd, 'w') as output_file:
+    output_file.writelines(lines)
+  os.replace(tmpFileName, outputFileName)
+  return outputFileName
+
+def testJob(module,genericsDict={},optionsDict={}):
+  return {'MODULE': module, 'TARGETS': ['hdlsb', 'clean'], 'GENERICS': dict(genericsDict), 'OPTIONS': dict(optionsDict), 'BLOCK_DESIGN': False}
+
+def bitStreamJob(module,bdGenericsDict={},optionsDict={}):
+  return {'MODULE': module, 'TARGETS': ['implcb', 'clean'], 'GENERICS': dict(bdGenericsDict), 'OPTIONS': dict(optionsDict), 'BLOCK_DESIGN': True}
 
-def runTest(module,genericsDict={},optionsDict={}):
-  sumDict     = merge_dicts(genericsDict, optionsDict)
-  configureDatastreamDataWidth(optionsDict.pop('DATASTREAM_DATA_WIDTH',64))
-  varStrings  = ["{}GENERIC_{}=\"{}\"".format(module,k,v) for k,v in genericsDict.items()]
+def jobOptions(job):
+  return merge_dicts(job['GENERICS'], job['OPTIONS'])
+
+def jobVarStrings(job):
+  module      = job['MODULE']
+  optionsDict = {k: v for k,v in job['OPTIONS'].items() if k != 'DATASTREAM_DATA_WIDTH'}
+  if job['BLOCK_DESIGN']:
+    varStrings  = ["{}={}".format(bdGenericName(module,k),v) for k,v in job['GENERICS'].items()]
+  else:
+    varStrings  = ["{}GENERIC_{}=\"{}\"".format(module,k,v) for k,v in job['GENERICS'].items()]
   varStrings += ["{}{}=\"{}\"".format(module,k,v) for k,v in optionsDict.items()]
-  res = run(module,['hdlsb', 'clean'], binaryDirName(sumDict),varStrings)
-  return [merge_dicts(res, { 'OPTIONS': sumDict })]
+  return varStrings
+
+def workspaceHdlFiles(job,workspace):
+  # Workspaces with the same data width share the configuration package and
+  # therefore also the analyzed GHDL work library.
+  width      = job['OPTIONS'].get('DATASTREAM_DATA_WIDTH',64)
+  configDir  = os.path.join(os.path.dirname(os.path.abspath(workspace)), '_config_W{}'.format(width))
+  configFile = configureDatastreamDataWidth(width, configDir)
+  return [configFile if os.path.basename(f) == 'memsec_config.vhd' else f for f in hdlFiles()]
+
+def workspaceVarStrings(job,workspace,files):
+  # Redirect everything which is normally shared between jobs into the
+  # workspace: the configuration package and the packaged memsec IP core.
+  ipRepoDir  = os.path.abspath(os.path.join(workspace, 'ip_repo'))
+  varStrings = ["memsecFLOW_HDL_FILES=\"{}\"".format(' '.join(files))]
+  varStrings += ["memsecFLOW_VIVADO_PACKAGE_XML=\"{}\"".format(os.path.join(ipRepoDir, 'component.xml'))]
+  if job['MODULE'] != 'memsec':
+    varStrings += ["{}FLOW_VIVADO_IP_REPO_PATHS=\"{}\"".format(job['MODULE'], ipRepoDir)]
+  return varStrings
+
+def prepareJob(job,workspace=None):
+  # returns the binary root directory, the HDL files, and the flow variables
+  if workspace:
+    files = workspaceHdlFiles(job, workspace)
+    return workspace, files, jobVarStrings(job) + workspaceVarStrings(job, workspace, files)
+  configureDatastreamDataWidth(job['OPTIONS'].get('DATASTREAM_DATA_WIDTH',64))
+  return binaryDirName(jobOptions(job)), hdlFiles(), jobVarStrings(job)
+
+def runJob(job,workspace=None,logFile=None,cacheDir=defaultCacheDir):
+  sumDict = jobOptions(job)
+  binaryRootDir, files, varStrings = prepareJob(job, workspace)
+  res = None
+  if cacheDir:
+    key = cacheKey(job, files)
+    res = cacheLookup(cacheDir, key, binaryRootDir or '_build')
+  if not res:
+    start = time.time()
+    res = run(job['MODULE'], job['TARGETS'], binaryRootDir, varStrings, logFile, job.get('TIMEOUT'))
+    if cacheDir and res['RETURN_CODE'] == 0:
+      cacheStore(cacheDir, key, res, binaryRootDir or '_build', start)
+  if job.get('EXPECTED_ERROR'):
+    res['ERROR'] = not res['ERROR']
+  return merge_dicts(res, { 'OPTIONS': sumDict, 'MODULE': job['MODULE'], 'BINARY_ROOT_DIR': binaryRootDir or '_build' })
+
+def buildBitStream(module,bdGenericsDict={},optionsDict={},cacheDir=defaultCacheDir):
+  return [runJob(bitStreamJob(module,bdGenericsDict,optionsDict),cacheDir=cacheDir)]
+
+def runTest(module,genericsDict={},optionsDict={},cacheDir=defaultCacheDir):
+  return [runJob(testJob(module,genericsDict,optionsDict),cacheDir=cacheDir)]
 
 def printSummary(resList):
   print("")
@@ -126,13 +246,34 @@ def printSummary(resList):
   print("------------------------------------------------------------------------------")
   failed = 0
   for res in resList:
+    note = ' (cached)' if res.get('CACHED') else ''
+    note = ' (timeout)' if res.get('TIMED_OUT') else note
     if res['ERROR']:
       failed = failed + 1
-      print("ERROR! {:8.3f}s (Return code = {}) {} {}".format(res['EXECUTION_TIME'], res['RETURN_CODE'], binaryDirName(res['OPTIONS']), res['OPTIONS']))
+      print("ERROR! {:8.3f}s (Return code = {}) {} {}{}".format(res['EXECUTION_TIME'], res['RETURN_CODE'], binaryDirName(res['OPTIONS']), res['OPTIONS'], note))
     else:
-      print("OK!    {:8.3f}s (Return code = {}) {} {}".format(res['EXECUTION_TIME'], res['RETURN_CODE'], binaryDirName(res['OPTIONS']), res['OPTIONS']))
+      print("OK!    {:8.3f}s (Return code = {}) {} {}{}".format(res['EXECUTION_TIME'], res['RETURN_CODE'], binaryDirName(res['OPTIONS']), res['OPTIONS'], note))
   print("")
   if len(resList) > 0:
     print("{} out of {} failed. ({:.1f}%)".format(failed, len(resList), 100*failed/len(resList)))
   print("------------------------------------------------------------------------------")
   return failed
+
+from .flow import defaultFlowDriver, flowScript, resolveBackend, resolveVariables
+from .runner import phaseSummary, printPhaseSummary, runAsync
+from .vivadoclient import clientVarString
+from .vivadoserver import startVivadoServer, stopVivadoServer
+from .cache import cacheKey, cacheLookup, cacheStore
+from .executor import runJobs, streamJobs
+from .implementation import buildBitStreams, groupBitStreamJobs, runBitStreamGroup, runBitStreamJobs
+from .simulation import groupTestJobs, runTestGroup, runTestJobs, runTests
+from .history import DEFAULT_HISTORY_FILE, loadHistory, orderJobs, recordHistory, saveHistory, shardJobs, updateHistory
+from .scheduler import scheduleBitStreamJobs
+from .results import compareCommits, defaultResultsDb, openResultsDb, parseBuildReports, parseTimingSummary, parseUtilization, queryRuns, storeResults
+from .benchmark import BENCHMARK_PERCENTILES, analyzeBenchmarks, benchmarkJob, benchmarkStatistics, histogramString, printBenchmarkSummary, readBenchmark
+from .model import CRYPTO_CONFIG_NAMES, paretoFront, paretoJobs, predictPerformance
+from .nodecache import readTrace, simulateNodeCache, traceChunks
+from .sweep import expandSweep, jobKey, sweepJobs
+from .golden import asconDecrypt, asconEncrypt, asconVectors, princeDecrypt, princeEncrypt, princeVectors, qarmaDecrypt, qarmaEncrypt, qarmaVectors, vectorFileName, vectorTestJob, writeVectors
+from .stimulus import STIMULUS_RECORD_SIZE, stimulusFileName, stimulusJob, stimulusRecords, writeStimulus
+from .memoryimage import IMAGE_MODES, decryptImage, imageJob, printImageSummary, readImage, readPlaintextLog, verifyImage, verifyImages
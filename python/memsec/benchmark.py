@@ -0,0 +1,117 @@
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import csv
+import glob
+import os
+
+from . import binaryDirName, merge_dicts, testJob
+
+BENCHMARK_PERCENTILES = [50, 90, 99]
+
+def benchmarkJob(module,genericsDict={},optionsDict={}):
+  # the test bench logs the issue and completion cycle of every transaction
+  return testJob(module, merge_dicts(genericsDict, {'BENCHMARK': 1}), optionsDict)
+
+def benchmarkFile(res):
+  files = sorted(glob.glob(os.path.join(res['BINARY_ROOT_DIR'], '{}_*_benchmark.csv'.format(res['MODULE']))))
+  return files[0] if files else None
+
+def readBenchmark(fileName):
+  records = []
+  with open(fileName, 'r', newline='') as f:
+    for row in csv.DictReader(f):
+      issue    = int(row['issue'])
+      complete = int(row['complete'])
+      records += [{'TYPE': row['type'], 'ADDRESS': int(row['address'], 16), 'BEATS': int(row['beats']),
+                   'BYTES': int(row['bytes']), 'ISSUE': issue, 'COMPLETE': complete, 'LATENCY': complete - issue}]
+  return records
+
+def percentile(sortedValues,p):
+  # nearest-rank method
+  rank = max(1, -(-p * len(sortedValues) // 100))
+  return sortedValues[int(rank) - 1]
+
+def latencyHistogram(latencies,binWidth=4):
+  histogram = {}
+  for latency in latencies:
+    start = latency - latency % binWidth
+    histogram[start] = histogram.get(start, 0) + 1
+  return sorted(histogram.items())
+
+def transactionStatistics(records,binWidth=4):
+  latencies  = sorted(r['LATENCY'] for r in records)
+  totalBytes = sum(r['BYTES'] for r in records)
+  # sustained throughput over the whole run and throughput while busy
+  cycles     = max(r['COMPLETE'] for r in records) - min(r['ISSUE'] for r in records)
+  busyCycles = sum(latencies)
+  return {'COUNT':                len(records),
+          'BYTES':                totalBytes,
+          'CYCLES':               cycles,
+          'BYTES_PER_CYCLE':      totalBytes / cycles if cycles > 0 else None,
+          'BUSY_CYCLES':          busyCycles,
+          'BYTES_PER_BUSY_CYCLE': totalBytes / busyCycles if busyCycles > 0 else None,
+          'LATENCY_MIN':          latencies[0],
+          'LATENCY_MEAN':         busyCycles / len(latencies),
+          'LATENCY_MAX':          latencies[-1],
+          'PERCENTILES':          {p: percentile(latencies, p) for p in BENCHMARK_PERCENTILES},
+          'HISTOGRAM':            latencyHistogram(latencies, binWidth)}
+
+def benchmarkStatistics(records,binWidth=4):
+  # statistics for reads (R), writes (W), and all transactions together (ALL)
+  stats = {}
+  for kind in ['R', 'W']:
+    selected = [r for r in records if r['TYPE'] == kind]
+    if selected:
+      stats[kind] = transactionStatistics(selected, binWidth)
+  if records:
+    stats['ALL'] = transactionStatistics(records, binWidth)
+  return stats
+
+def analyzeBenchmarks(resList,binWidth=4):
+  for res in resList:
+    fileName = benchmarkFile(res) if not res['ERROR'] else None
+    res['BENCHMARK'] = benchmarkStatistics(readBenchmark(fileName), binWidth) if fileName else {}
+  return resList
+
+def printBenchmarkSummary(resList):
+  print("")
+  print("------------------------------------------------------------------------------")
+  print("Benchmark (latency in cycles):")
+  print("------------------------------------------------------------------------------")
+  print("{:30} {:>7} {:>7} {:>7} {:>7} {:>11}".format('Configuration', 'R p50', 'R p99', 'W p50', 'W p99', 'Bytes/Cycle'))
+  for res in resList:
+    stats = res.get('BENCHMARK')
+    name  = binaryDirName(res['OPTIONS']) or res['MODULE']
+    if not stats:
+      print("{:30} no benchmark data".format(name))
+      continue
+    columns = []
+    for kind in ['R', 'W']:
+      for p in [50, 99]:
+        columns += [str(stats[kind]['PERCENTILES'][p]) if kind in stats else '-']
+    print("{:30} {:>7} {:>7} {:>7} {:>7} {:>11.3f}".format(name, *columns, stats['ALL']['BYTES_PER_CYCLE'] or 0))
+  print("------------------------------------------------------------------------------")
+
+def histogramString(histogram,width=50):
+  peak  = max(count for start, count in histogram)
+  lines = []
+  for start, count in histogram:
+    lines += ["{:6} {:6} {}".format(start, count, '#' * max(1, count * width // peak))]
+  return '\n'.join(lines)
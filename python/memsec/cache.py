@@ -0,0 +1,112 @@
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+import glob
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import timeit
+
+from . import flowBackend, toolVersion
+
+# artifacts which are copied from the binary root directory into the cache
+CACHED_ARTIFACTS = ['*.bit', '*.txt', '*.log', '*.csv']
+
+fileDigests = {}
+
+def fileDigest(fileName):
+  # the digest is only recomputed when the file has been modified
+  stat = os.stat(fileName)
+  key  = (os.path.abspath(fileName), stat.st_mtime_ns, stat.st_size)
+  if key not in fileDigests:
+    with open(fileName, 'rb') as f:
+      fileDigests[key] = hashlib.sha256(f.read()).hexdigest()
+  return fileDigests[key]
+
+def flowFiles():
+  # everything besides the HDL sources which influences the result of a job
+  files  = sorted(glob.glob('tb/*.vhd'))
+  files += sorted(glob.glob('tb/**/*.xci', recursive=True))
+  files += sorted(glob.glob('examples/*'))
+  files += sorted(f for f in glob.glob('flow/**', recursive=True) if os.path.isfile(f))
+  return ['Makefile'] + files
+
+def simFiles(job):
+  # support files which are copied into the simulation directory (e.g., test
+  # vectors or stimuli) are part of the key even if their name stays the same
+  entries = str(job['OPTIONS'].get('FLOW_SIM_FILES', '')).split()
+  return [f for f in (entry.split(':')[0] for entry in entries) if os.path.isfile(f)]
+
+def sourceName(fileName):
+  # the workspace copy of memsec_config.vhd is hashed under its original name
+  if os.path.basename(fileName) == 'memsec_config.vhd':
+    return 'hdl/memsec_config.vhd'
+  return os.path.relpath(fileName)
+
+def cacheKey(job,files):
+  backend     = flowBackend()
+  description = {'MODULE':       job['MODULE'],
+                 'TARGETS':      job['TARGETS'],
+                 'GENERICS':     job['GENERICS'],
+                 'OPTIONS':      job['OPTIONS'],
+                 'BLOCK_DESIGN': job['BLOCK_DESIGN'],
+                 'BACKEND':      backend,
+                 'TOOL_VERSION': toolVersion(backend)}
+  hasher = hashlib.sha256(json.dumps(description, sort_keys=True, default=str).encode())
+  for fileName in files + flowFiles() + simFiles(job):
+    hasher.update('{} {}\n'.format(sourceName(fileName), fileDigest(fileName)).encode())
+  return hasher.hexdigest()
+
+def cacheEntryDir(cacheDir,key):
+  return os.path.join(cacheDir, key[:2], key)
+
+def cacheLookup(cacheDir,key,binaryRootDir):
+  start    = timeit.default_timer()
+  entryDir = cacheEntryDir(cacheDir, key)
+  if not os.path.isfile(os.path.join(entryDir, 'result.json')):
+    return None
+  with open(os.path.join(entryDir, 'result.json'), 'r') as f:
+    res = json.load(f)
+  os.makedirs(binaryRootDir, exist_ok=True)
+  for fileName in os.listdir(os.path.join(entryDir, 'artifacts')):
+    shutil.copy2(os.path.join(entryDir, 'artifacts', fileName), binaryRootDir)
+  end = timeit.default_timer()
+  print("Running \"" + res['COMMAND'] + "\"... CACHED! ({})".format(key), flush=True)
+  return dict(res, EXECUTION_TIME=end-start, CACHED=True, CACHED_EXECUTION_TIME=res['EXECUTION_TIME'])
+
+def cacheStore(cacheDir,key,res,binaryRootDir,since):
+  # Only artifacts which have been touched by the run are stored. The entry is
+  # assembled in a temporary directory and moved into place atomically.
+  os.makedirs(cacheDir, exist_ok=True)
+  tmpDir = tempfile.mkdtemp(dir=cacheDir)
+  os.mkdir(os.path.join(tmpDir, 'artifacts'))
+  for pattern in CACHED_ARTIFACTS:
+    for fileName in glob.glob(os.path.join(binaryRootDir, pattern)):
+      if os.path.getmtime(fileName) >= since - 1:
+        shutil.copy2(fileName, os.path.join(tmpDir, 'artifacts'))
+  with open(os.path.join(tmpDir, 'result.json'), 'w') as f:
+    json.dump(res, f, indent=2)
+  entryDir = cacheEntryDir(cacheDir, key)
+  os.makedirs(os.path.dirname(entryDir), exist_ok=True)
+  try:
+    os.rename(tmpDir, entryDir)
+  except OSError:
+    # another job stored the same entry in the meantime
+    shutil.rmtree(tmpDir)
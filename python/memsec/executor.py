@@ -0,0 +1,67 @@
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+import concurrent.futures
+import itertools
+import os
+
+from . import binaryDirName, defaultCacheDir, jobOptions, runJob
+from .history import recordHistory
+
+def jobWorkspace(workspaceRoot,index,job):
+  return os.path.join(workspaceRoot, '{:03d}{}'.format(index, binaryDirName(jobOptions(job)) or ''))
+
+def streamIndexedJobs(jobs,workers,workspaceRoot,cacheDir,failFast=False,historyFile=None):
+  # Jobs are taken lazily from the iterable (e.g., a sweep generator) and at
+  # most two jobs per worker are submitted at a time. The results are yielded
+  # together with the index of their job as soon as they are available. With
+  # failFast, no further jobs are started after the first failure.
+  workers = workers or os.cpu_count() or 1
+  jobs    = enumerate(jobs)
+  with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+    pending = {}
+    failed  = False
+    while True:
+      for index, job in itertools.islice(jobs, 0 if failed else 2 * workers - len(pending)):
+        workspace = jobWorkspace(workspaceRoot, index, job)
+        pending[executor.submit(runJob, job, workspace, os.path.join(workspace, 'output.log'), cacheDir)] = (index, job)
+      if not pending:
+        return
+      done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+      for future in done:
+        index, job = pending.pop(future)
+        if future.cancelled():
+          continue
+        res = future.result()
+        recordHistory(historyFile, job, res)
+        if failFast and res['ERROR'] and not failed:
+          failed = True
+          for other in pending:
+            other.cancel()
+        yield index, res
+
+def streamJobs(jobs,workers=None,workspaceRoot='_parallel',cacheDir=defaultCacheDir,failFast=False,historyFile=None):
+  # yields the results in the order in which the jobs finish
+  for index, res in streamIndexedJobs(jobs, workers, workspaceRoot, cacheDir, failFast, historyFile):
+    yield res
+
+def runJobs(jobs,workers=None,workspaceRoot='_parallel',cacheDir=defaultCacheDir,failFast=False,historyFile=None):
+  # Every job gets its own workspace (binary root directory, configuration
+  # package, IP repository) such that the jobs can run concurrently. The tool
+  # output of each job is written to a log file inside its workspace.
+  return [res for index, res in sorted(streamIndexedJobs(jobs, workers, workspaceRoot, cacheDir, failFast, historyFile), key=lambda r: r[0])]
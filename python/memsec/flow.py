@@ -0,0 +1,239 @@
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+import functools
+import os
+import re
+import shlex
+import shutil
+import subprocess
+
+# 'python' runs the supported targets without make, 'make' always uses make
+defaultFlowDriver = os.environ.get('MEMSEC_FLOW', 'python')
+
+# targets of the ghdl backend which are run by the python flow driver
+PYTHON_FLOW_TARGETS = {'project': 'ghdl_project', 'hdlsb': 'ghdl_hdlsb', 'hdlsbb': 'ghdl_hdlsbb', 'clean': 'clean'}
+
+# variable assignments in the database printed by make -p
+MAKE_VARIABLE  = re.compile(r'^([^\s#:=?+!]+) (:?:?=) ?(.*)$')
+# plain variable references like ${NAME} or $(NAME), but no function calls
+MAKE_REFERENCE = re.compile(r'\$[({]([^\s(){}$:]*)[)}]')
+
+CKSUM_TABLE = []
+for index in range(256):
+  crc = index << 24
+  for bit in range(8):
+    crc = ((crc << 1) ^ 0x04c11db7 if crc & 0x80000000 else crc << 1) & 0xffffffff
+  CKSUM_TABLE.append(crc)
+
+def cksum(data):
+  # same checksum as the cksum command, which names the GHDL work directories
+  crc = 0
+  for byte in data:
+    crc = ((crc << 8) & 0xffffffff) ^ CKSUM_TABLE[(crc >> 24) ^ byte]
+  length = len(data)
+  while length:
+    crc = ((crc << 8) & 0xffffffff) ^ CKSUM_TABLE[(crc >> 24) ^ (length & 0xff)]
+    length >>= 8
+  return ~crc & 0xffffffff
+
+@functools.lru_cache()
+def findBinary(name):
+  return shutil.which(name) or ''
+
+@functools.lru_cache()
+def makeDatabase(sourceScript,module,ghdlBinary):
+  # The variables as make defines them for the module without the values of a
+  # job. make only parses the Makefile (-pn), once per module and session.
+  env = {k: v for k,v in os.environ.items() if not k.startswith('GENERIC_') and ('FLOW_' not in k or k == 'FLOW_DIR')}
+  if ghdlBinary:
+    env['FLOW_GHDL_BINARY'] = ghdlBinary
+  out = subprocess.run(['make', '-pn', '-f', sourceScript, 'FLOW_MODULE=' + module, 'info'], cwd=os.path.dirname(sourceScript), env=env,
+                       stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).stdout.decode()
+  database = {}
+  for line in out.split('\n# Files')[0].splitlines():
+    match = MAKE_VARIABLE.match(line)
+    if match:
+      database.setdefault(match.group(1), (match.group(2), match.group(3)))
+  return database
+
+def expandMake(name,variables,database):
+  # Expands a variable like make, the variables of the job take precedence.
+  # References to functions (e.g. $(shell ...)) are kept.
+  if name in variables:
+    return variables[name]
+  flavor, value = database.get(name, (':=', ''))
+  if flavor != '=':
+    return value
+  previous = None
+  while value != previous:
+    previous = value
+    value    = MAKE_REFERENCE.sub(lambda m: expandMake(m.group(1), variables, database), value)
+  return value
+
+@functools.lru_cache()
+def ghdlProperties(binary):
+  # version and code generator of GHDL (see ghdl.mk)
+  version = subprocess.run(binary + ' --version', shell=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).stdout.decode()
+  info    = subprocess.run(binary + ' -v', shell=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).stdout.decode()
+  return (version.splitlines() or [''])[0], '1' if 'GCC back-end code generator' in info else '0'
+
+def backendBinary(variables,backend):
+  return variables.get('FLOW_{}_BINARY'.format(backend.upper())) or findBinary(backend)
+
+def resolveBackend(variables):
+  # the backends are probed in the same order as ghdl.mk and vivado.mk are
+  # included by the Makefile
+  if variables.get('FLOW_BACKEND'):
+    return variables['FLOW_BACKEND']
+  for backend in ['ghdl', 'vivado']:
+    if backendBinary(variables, backend):
+      return backend
+  return None
+
+def simFileEntries(simFiles,binaryDir):
+  # normalizes FLOW_SIM_FILES to source:destination pairs like global_defines.mk
+  entries = []
+  for entry in simFiles.split():
+    parts       = entry.split(':')
+    source      = parts[0]
+    destination = parts[-1] if ':' in entry else binaryDir + '/' + os.path.basename(source)
+    if destination.endswith('/'):
+      destination += os.path.basename(source)
+    entries.append((source, destination))
+  return entries
+
+def resolveVariables(module,variables):
+  # Resolves the flow variables like the Makefile does for a ghdl run of the
+  # module. Returns None if the run needs the make flow.
+  sourceScript = os.path.realpath('Makefile')
+  database     = makeDatabase(sourceScript, module, backendBinary(variables, 'ghdl'))
+  expand       = lambda name, values={}: expandMake(name, values, database)
+  sourceDir    = expand('FLOW_SOURCE_DIR')
+  if module not in expand('FLOW_MODULES').split():
+    return None
+  # variables which are cleared by binary_directory_defines.mk before the
+  # module variables are applied
+  whitelisted = expand('WHITELISTED_VARS').split()
+  cleared     = set(' '.join(expand(name) for name in ['DEFAULT_INFO_VARS', 'HIDDEN_INFO_VARS', 'STANDARD_MODULE_PROPERTIES', 'CUSTOM_MODULE_PROPERTIES']).split())
+  resolved    = {k: v for k,v in variables.items() if not k.startswith('GENERIC_') and (k in whitelisted or (k not in cleared and not k.startswith('FLOW_VIVADO_')))}
+  binaryRootDir = os.path.abspath(variables.get('FLOW_BINARY_ROOT_DIR') or os.getcwd())
+  if binaryRootDir == sourceDir:
+    binaryRootDir = os.path.join(sourceDir, '_build')
+  resolved.update({'FLOW_SOURCE_SCRIPT': expand('FLOW_SOURCE_SCRIPT'), 'FLOW_SOURCE_DIR': sourceDir, 'FLOW_BINARY_ROOT_DIR': binaryRootDir, 'FLOW_MODULE': module})
+  resolved.setdefault('FLOW_DIR', expand('FLOW_DIR'))
+  resolved.setdefault('FLOW_VERBOSITY', expand('FLOW_VERBOSITY'))
+  # the module variables of the job replace the defaults of the Makefile, the
+  # values which make computes with functions are taken from the database
+  moduleValues = {k: v for k,v in variables.items() if k.startswith(module) and k != module}
+  references   = dict(moduleValues, **{k: resolved[k] for k in ['FLOW_SOURCE_DIR', 'FLOW_BINARY_ROOT_DIR', 'FLOW_MODULE', 'FLOW_DIR']})
+  for name in set(moduleValues) | set(k for k in database if k.startswith(module) and k != module):
+    value = expand(name, references)
+    resolved[name[len(module):]] = expand(name[len(module):]) if '$' in value else value
+  # dependencies are built as sub projects by recursive make calls
+  if resolved.get('FLOW_DEPENDENCIES', '').strip() or resolved.get('FLOW_SIM_DEPENDENCIES', '').strip():
+    return None
+  resolved['FLOW_FULL_DEPENDENCIES']    = ''
+  resolved['FLOW_FULL_DEPENDENCY_DIRS'] = ''
+  resolved['FLOW_SIM_FILES'] = ' '.join('{}:{}'.format(source, destination) for source, destination in simFileEntries(resolved.get('FLOW_SIM_FILES', ''), resolved['FLOW_BINARY_DIR']))
+  if resolveBackend(resolved) != 'ghdl' or not backendBinary(resolved, 'ghdl'):
+    return None
+  resolved['FLOW_BACKEND']     = 'ghdl'
+  resolved['FLOW_GHDL_BINARY'] = backendBinary(resolved, 'ghdl')
+  for name in ['gtkwave', 'lcov', 'genhtml']:
+    resolved.setdefault('FLOW_{}_BINARY'.format(name.upper()), findBinary(name))
+  version, gcc = ghdlProperties(resolved['FLOW_GHDL_BINARY'])
+  resolved.setdefault('FLOW_GHDL_GCC', gcc)
+  if resolved['FLOW_GHDL_GCC'] == '1':
+    resolved['FLOW_GHDL_CFLAGS'] = ' '.join(filter(None, [resolved.get('FLOW_GHDL_CFLAGS'), '-Wc,-ftest-coverage -Wc,-fprofile-arcs -Wl,--coverage']))
+  resolved.setdefault('FLOW_GHDL_WORK_ROOT', expand('FLOW_GHDL_WORK_ROOT', resolved))
+  resolved.setdefault('FLOW_GHDL_VERSION', version)
+  files   = sorted(set(resolved['FLOW_HDL_FILES'].split() + resolved['FLOW_SIM_HDL_FILES'].split()))
+  workKey = cksum('{} {} {}\n'.format(resolved['FLOW_GHDL_VERSION'], resolved.get('FLOW_GHDL_CFLAGS', ''), ' '.join(files)).encode())
+  resolved.setdefault('FLOW_GHDL_WORK_DIR', '{}/{}-{}'.format(resolved['FLOW_GHDL_WORK_ROOT'], module, workKey))
+  return resolved
+
+def projectUpToDate(stamp,files):
+  # same check as make does for the stamp of the GHDL project
+  if not os.path.isfile(stamp):
+    return False
+  stampTime = os.stat(stamp).st_mtime_ns
+  return all(os.stat(f).st_mtime_ns <= stampTime for f in files)
+
+def flowScript(module,targets,envVars,driver=defaultFlowDriver):
+  # Returns a shell script and its environment which run the targets by
+  # calling the backend scripts directly, or None if the targets need make.
+  # The script prints the same steps as the make flow.
+  if driver != 'python' or any(target not in PYTHON_FLOW_TARGETS for target in targets):
+    return None
+  variables = dict(os.environ)
+  for varString in shlex.split(' '.join(envVars)):
+    name, _, value = varString.partition('=')
+    variables[name] = value
+  env = resolveVariables(module, variables)
+  if env is None:
+    return None
+  q         = shlex.quote
+  binaryDir = env['FLOW_BINARY_DIR']
+  workDir   = env['FLOW_GHDL_WORK_DIR']
+  logPrefix = '{}/{}_{}'.format(env['FLOW_BINARY_ROOT_DIR'], module, env['FLOW_SIM_TOP'])
+  lines     = []
+
+  def step(text):
+    if env['FLOW_VERBOSITY'] != '0':
+      lines.append('echo {}'.format(q(text)))
+
+  def call(target, command):
+    # make stops with return code 2 at the first failing command
+    lines.append('{} || {{ echo "*** [{}] Error $?"; exit 2; }}'.format(command, target))
+
+  def project():
+    step('### {}: processing dependencies'.format(module))
+    for source, destination in simFileEntries(env['FLOW_SIM_FILES'], binaryDir):
+      call('ghdl_project', 'mkdir -p {} && cp {} {}'.format(q(os.path.dirname(destination) or '.'), q(source), q(destination)))
+    step('### {}: configuring as top-level project'.format(module))
+    call('ghdl_project', 'mkdir -p {}'.format(q(binaryDir)))
+    stamp = '{}/{}.stamp'.format(workDir, module)
+    files = env['FLOW_HDL_FILES'].split() + env['FLOW_SIM_HDL_FILES'].split()
+    missing = [f for f in files if not os.path.exists(f)]
+    if missing:
+      lines.append('echo {}; exit 2'.format(q("*** No rule to make target '{}', needed by '{}'.  Stop.".format(missing[0], stamp))))
+    elif not projectUpToDate(stamp, files):
+      call(stamp, 'mkdir -p {} {} && (cd {} && FLOW_LOG_FILE={} bash {}/ghdl/project.sh) && touch {}'.format(
+           q(binaryDir), q(workDir), q(binaryDir), q(logPrefix + '_project.log'), q(env['FLOW_DIR']), q(stamp)))
+    step('')
+
+  def simulate(target, text, script):
+    project()
+    step('### {}: {}'.format(module, text))
+    call(target, '(cd {} && FLOW_LOG_FILE={} bash {}/ghdl/{})'.format(q(binaryDir), q(logPrefix + '_simulation.log'), q(env['FLOW_DIR']), script))
+    step('')
+
+  for target in targets:
+    if target == 'project':
+      project()
+    elif target == 'hdlsb':
+      simulate('ghdl_hdlsb', 'simulating in batch mode', 'run_simulation.sh')
+    elif target == 'hdlsbb':
+      simulate('ghdl_hdlsbb', 'simulating generic sets in batch mode', 'run_simulation_batch.sh')
+    elif target == 'clean':
+      step('### {}: removing the binary directory of the module'.format(module))
+      step('$ rm -rf {}'.format(binaryDir))
+      call('clean', 'rm -rf {}'.format(q(binaryDir)))
+      step('')
+  return '\n'.join(lines) + '\n', env
@@ -0,0 +1,317 @@
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import functools
+import os
+
+try:
+  import numpy as np
+except ImportError:
+  # only the golden models depend on numpy
+  np = None
+
+from . import merge_dicts, testJob
+
+# Bit-exact models of the ciphers in hdl/crypto which operate on numpy arrays
+# of 64-bit words, i.e., every element is an independent test vector. 128-bit
+# values (keys, nonces, tags) are arrays of shape (N, 2) holding the upper and
+# the lower half. Cell (nibble) 0 is the most significant one.
+
+ALPHA = 0xc0ac29b7c97c50dd
+
+PRINCE_ROUND_CONSTANTS = [0x0000000000000000, 0x13198a2e03707344, 0xa4093822299f31d0, 0x082efa98ec4e6c89,
+                          0x452821e638d01377, 0xbe5466cf34e90c6c, 0x7ef84f78fd955cb1, 0x85840851f1ac43aa,
+                          0xc882d32f25323c54, 0x64a51195e0e3610d, 0xd3b5a399ca0c2399, 0xc0ac29b7c97c50dd]
+PRINCE_SBOX        = [0xb, 0xf, 0x3, 0x2, 0xa, 0xc, 0x9, 0x1, 0x6, 0x7, 0x8, 0x0, 0xe, 0x5, 0xd, 0x4]
+PRINCE_SHIFT_ROWS  = [0, 5, 10, 15, 4, 9, 14, 3, 8, 13, 2, 7, 12, 1, 6, 11]
+
+QARMA_ROUND_CONSTANTS = [0x0000000000000000, 0x13198a2e03707344, 0xa4093822299f31d0, 0x082efa98ec4e6c89,
+                         0x452821e638d01377, 0xbe5466cf34e90c6c, 0x3f84d5b5b5470917, 0x9216d5d98979fb1b]
+QARMA_SBOX            = [0xa, 0xd, 0xe, 0x6, 0xf, 0x7, 0x3, 0x5, 0x9, 0x8, 0x0, 0xc, 0xb, 0x1, 0x2, 0x4]
+QARMA_TAU             = [0, 11, 6, 13, 10, 1, 12, 7, 5, 14, 3, 8, 15, 4, 9, 2]
+QARMA_H               = [6, 5, 14, 15, 0, 1, 2, 3, 7, 12, 13, 4, 8, 9, 10, 11]
+QARMA_LFSR_CELLS      = [0, 1, 3, 4, 8, 11, 13]
+
+ASCON_IV          = 0x80400c0600000000
+ASCON_ROUNDS_A    = 12
+ASCON_ROUNDS_B    = 6
+ASCON_ROTATIONS   = [(19, 28), (61, 39), (1, 6), (10, 17), (7, 41)]
+
+VECTOR_CHUNK_SIZE = 1 << 14
+
+def requireNumpy():
+  if np is None:
+    raise ImportError('The golden models require numpy.')
+
+def words(values):
+  requireNumpy()
+  return np.asarray(values, dtype=np.uint64)
+
+def inverse(permutation):
+  result = [0] * len(permutation)
+  for i, p in enumerate(permutation):
+    result[p] = i
+  return result
+
+def cell(x,i):
+  return (x >> 60-4*i) & 0xf
+
+def permuteCells(x,permutation):
+  # output cell i is input cell permutation[i]
+  out = np.zeros_like(x)
+  for i, p in enumerate(permutation):
+    out |= cell(x, p) << 60-4*i
+  return out
+
+def substitute(x,sbox):
+  table = words(sbox)
+  out   = np.zeros_like(x)
+  for i in range(16):
+    out |= table[(x >> 4*i) & 0xf] << 4*i
+  return out
+
+def rotateNibble(v,r):
+  return ((v << r) | (v >> 4-r)) & 0xf
+
+def rotateRight(x,r):
+  return (x >> r) | (x << 64-r)
+
+def funcO(x):
+  # o(x) = (x >>> 1) ^ (x >> 63) as used for the whitening keys
+  return rotateRight(x, 1) ^ (x >> 63)
+
+# The substitution and linear layers are evaluated with lookup tables which
+# are indexed by 16-bit chunks of the state (see layerTables).
+
+def layerTables(linear=None,sbox=None):
+  tables = []
+  for chunk in range(4):
+    x = np.arange(1 << 16, dtype=np.uint64) << 16*chunk
+    if sbox is not None:
+      x = substitute(x, sbox) & words(0xffff << 16*chunk)
+    tables.append(linear(x) if linear else x)
+  return tables
+
+def applyLayer(tables,x):
+  return tables[0][x & 0xffff] ^ tables[1][(x >> 16) & 0xffff] ^ tables[2][(x >> 32) & 0xffff] ^ tables[3][x >> 48]
+
+def princeMatrix(x):
+  # M' layer: the 16-bit chunks are multiplied with M0, M1, M1, and M0
+  out = np.zeros_like(x)
+  for chunk, shift in enumerate([0, 1, 1, 0]):
+    for row in range(4):
+      value = np.zeros_like(x)
+      for column in range(4):
+        value ^= cell(x, 4*chunk + column) & (0xf ^ (8 >> (row + column + shift) % 4))
+      out |= value << 60-4*(4*chunk + row)
+  return out
+
+def qarmaMixColumns(x):
+  out = np.zeros_like(x)
+  for column in range(4):
+    a, b, c, d = [cell(x, 4*row + column) for row in range(4)]
+    rows = [rotateNibble(b, 1) ^ rotateNibble(c, 2) ^ rotateNibble(d, 1),
+            rotateNibble(a, 1) ^ rotateNibble(c, 1) ^ rotateNibble(d, 2),
+            rotateNibble(a, 2) ^ rotateNibble(b, 1) ^ rotateNibble(d, 1),
+            rotateNibble(a, 1) ^ rotateNibble(b, 2) ^ rotateNibble(c, 1)]
+    for row in range(4):
+      out |= rows[row] << 60-4*(4*row + column)
+  return out
+
+def qarmaTweakUpdate(x):
+  x = permuteCells(x, QARMA_H)
+  for i in QARMA_LFSR_CELLS:
+    b  = cell(x, i)
+    x ^= (b ^ ((b >> 1) | (((b ^ (b >> 1)) & 1) << 3))) << 60-4*i
+  return x
+
+@functools.lru_cache()
+def princeTables():
+  requireNumpy()
+  sboxInv = inverse(PRINCE_SBOX)
+  return {'ROUND':      layerTables(lambda x: permuteCells(princeMatrix(x), PRINCE_SHIFT_ROWS), PRINCE_SBOX),
+          'MIDDLE':     layerTables(princeMatrix, PRINCE_SBOX),
+          'ROUND_INV':  layerTables(lambda x: princeMatrix(permuteCells(x, inverse(PRINCE_SHIFT_ROWS)))),
+          'SBOX_INV':   layerTables(sbox=sboxInv)}
+
+@functools.lru_cache()
+def qarmaTables():
+  requireNumpy()
+  tauInv = inverse(QARMA_TAU)
+  return {'ROUND':      layerTables(lambda x: qarmaMixColumns(permuteCells(x, QARMA_TAU))),
+          'SBOX':       layerTables(sbox=QARMA_SBOX),
+          'ROUND_INV':  layerTables(lambda x: permuteCells(qarmaMixColumns(x), tauInv), inverse(QARMA_SBOX)),
+          'REFLECTOR':  layerTables(lambda x: permuteCells(qarmaMixColumns(permuteCells(x, QARMA_TAU)), tauInv)),
+          'TAU_INV':    layerTables(lambda x: permuteCells(x, tauInv)),
+          'MIX':        layerTables(qarmaMixColumns),
+          'TWEAK':      layerTables(qarmaTweakUpdate)}
+
+def princeCore(message,k0,k0Prime,k1):
+  t = princeTables()
+  c = words(PRINCE_ROUND_CONSTANTS)
+  x = message ^ k0 ^ k1 ^ c[0]
+  for r in range(1, 6):
+    x = applyLayer(t['ROUND'], x) ^ c[r] ^ k1
+  x = applyLayer(t['SBOX_INV'], applyLayer(t['MIDDLE'], x))
+  for r in range(6, 11):
+    x = applyLayer(t['SBOX_INV'], applyLayer(t['ROUND_INV'], x ^ k1 ^ c[r]))
+  return x ^ c[11] ^ k1 ^ k0Prime
+
+def princeEncrypt(key0,key1,message):
+  key0 = words(key0)
+  return princeCore(words(message), key0, funcO(key0), words(key1))
+
+def princeDecrypt(key0,key1,ciphertext):
+  key0 = words(key0)
+  return princeCore(words(ciphertext), funcO(key0), key0, words(key1) ^ words(ALPHA))
+
+def qarmaCore(message,w0,w1,k0,k1,tweak,rounds):
+  t      = qarmaTables()
+  c      = words(QARMA_ROUND_CONSTANTS)
+  alpha  = words(ALPHA)
+  tweaks = [tweak]
+  for r in range(rounds):
+    tweaks.append(applyLayer(t['TWEAK'], tweaks[-1]))
+  x = applyLayer(t['SBOX'], message ^ w0 ^ k0 ^ tweaks[0] ^ c[0])
+  for r in range(1, rounds):
+    x = applyLayer(t['SBOX'], applyLayer(t['ROUND'], x ^ k0 ^ tweaks[r] ^ c[r]))
+  x = applyLayer(t['SBOX'], applyLayer(t['ROUND'], x ^ w1 ^ tweaks[rounds]))
+  x = applyLayer(t['REFLECTOR'], x) ^ applyLayer(t['TAU_INV'], k1)
+  x = applyLayer(t['ROUND_INV'], x) ^ w0 ^ tweaks[rounds]
+  for r in reversed(range(1, rounds)):
+    x = applyLayer(t['ROUND_INV'], x) ^ k0 ^ tweaks[r] ^ c[r] ^ alpha
+  x = applyLayer(t['SBOX'], x) ^ k0 ^ tweaks[0] ^ c[0] ^ alpha
+  return x ^ w1
+
+def qarmaEncrypt(key,tweak,message,rounds=7):
+  key = words(key)
+  w0  = key[..., 0]
+  return qarmaCore(words(message), w0, funcO(w0), key[..., 1], key[..., 1], words(tweak), rounds)
+
+def qarmaDecrypt(key,tweak,ciphertext,rounds=7):
+  key = words(key)
+  w1  = key[..., 0]
+  k1  = applyLayer(qarmaTables()['MIX'], key[..., 1])
+  return qarmaCore(words(ciphertext), funcO(w1), w1, key[..., 1] ^ words(ALPHA), k1, words(tweak), rounds)
+
+def asconPermutation(s,rounds):
+  for r in range(12 - rounds, 12):
+    s[2] ^= words(((0xf - r) << 4) | r)
+    s[0] ^= s[4]; s[4] ^= s[3]; s[2] ^= s[1]
+    t = [~s[i] & s[(i + 1) % 5] for i in range(5)]
+    for i in range(5):
+      s[i] ^= t[(i + 1) % 5]
+    s[1] ^= s[0]; s[0] ^= s[4]; s[3] ^= s[2]; s[2] = ~s[2]
+    for i, (r0, r1) in enumerate(ASCON_ROTATIONS):
+      s[i] ^= rotateRight(s[i], r0) ^ rotateRight(s[i], r1)
+
+def asconCore(key,nonce,associatedData,data,decrypt):
+  # Ascon-128 on padded 64-bit words as processed by ascon_fast_core.vhdl.
+  # associatedData and data are arrays of shape (N, words).
+  key, nonce = words(key), words(nonce)
+  associatedData, data = words(associatedData), words(data)
+  s = [np.full(len(key), ASCON_IV, dtype=np.uint64), key[:, 0].copy(), key[:, 1].copy(), nonce[:, 0].copy(), nonce[:, 1].copy()]
+  asconPermutation(s, ASCON_ROUNDS_A)
+  s[3] ^= key[:, 0]; s[4] ^= key[:, 1]
+  for i in range(associatedData.shape[1]):
+    s[0] ^= associatedData[:, i]
+    asconPermutation(s, ASCON_ROUNDS_B)
+  s[4] ^= words(1)
+  out = np.empty_like(data)
+  for i in range(data.shape[1]):
+    out[:, i] = s[0] ^ data[:, i]
+    s[0]      = (data if decrypt else out)[:, i].copy()
+    if i < data.shape[1] - 1:
+      asconPermutation(s, ASCON_ROUNDS_B)
+  s[1] ^= key[:, 0]; s[2] ^= key[:, 1]
+  asconPermutation(s, ASCON_ROUNDS_A)
+  return out, np.stack([s[3] ^ key[:, 0], s[4] ^ key[:, 1]], axis=1)
+
+def asconEncrypt(key,nonce,associatedData,message):
+  return asconCore(key, nonce, associatedData, message, False)
+
+def asconDecrypt(key,nonce,associatedData,ciphertext):
+  return asconCore(key, nonce, associatedData, ciphertext, True)
+
+def randomWords(rng,shape):
+  shape = (shape,) if isinstance(shape, int) else shape
+  count = int(np.prod(shape))
+  return np.frombuffer(rng.bytes(8*count), dtype=np.uint64).reshape(shape).copy()
+
+def princeChunk(rng,count):
+  key0, key1, message = randomWords(rng, count), randomWords(rng, count), randomWords(rng, count)
+  return [key0, key1, message, princeEncrypt(key0, key1, message)]
+
+def qarmaChunk(rng,count,rounds):
+  key, tweak, message = randomWords(rng, (count, 2)), randomWords(rng, count), randomWords(rng, count)
+  return [key, tweak, message, qarmaEncrypt(key, tweak, message, rounds)]
+
+def asconChunk(rng,count):
+  # one padded word of associated data and message, like the test bench
+  key, nonce = randomWords(rng, (count, 2)), randomWords(rng, (count, 2))
+  associatedData, message = randomWords(rng, (count, 1)), randomWords(rng, (count, 1))
+  ciphertext, tag = asconEncrypt(key, nonce, associatedData, message)
+  return [key, nonce, associatedData, message, ciphertext, tag]
+
+def randomVectors(chunkFunction,count,seed=None,chunkSize=VECTOR_CHUNK_SIZE):
+  # The vectors are computed in chunks whose intermediate values fit into the
+  # CPU caches, which is considerably faster than processing all at once.
+  requireNumpy()
+  rng    = np.random.default_rng(seed)
+  chunks = [chunkFunction(rng, min(chunkSize, count - start)) for start in range(0, count, chunkSize)]
+  return [np.concatenate(column) for column in zip(*chunks)]
+
+def princeVectors(count,seed=None):
+  # columns: key0 key1 message ciphertext
+  return randomVectors(princeChunk, count, seed)
+
+def qarmaVectors(count,rounds=7,seed=None):
+  # columns: key tweak message ciphertext
+  return randomVectors(functools.partial(qarmaChunk, rounds=rounds), count, seed)
+
+def asconVectors(count,seed=None):
+  # columns: key nonce associated_data message ciphertext tag
+  return randomVectors(asconChunk, count, seed)
+
+def hexColumn(values):
+  values  = values.reshape(len(values), -1)
+  digits  = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+  nibbles = (values[:, :, np.newaxis] >> np.arange(60, -4, -4, dtype=np.uint64)) & 0xf
+  return digits[nibbles].reshape(len(values), -1)
+
+def writeVectors(fileName,columns,chunkSize=1<<16):
+  # One vector per line with the columns as space separated hex numbers. The
+  # test benches read the lines with hread.
+  count = len(columns[0])
+  with open(fileName, 'wb') as f:
+    for start in range(0, count, chunkSize):
+      end   = min(start + chunkSize, count)
+      parts = []
+      for column in columns:
+        parts += [hexColumn(column[start:end]), np.full((end - start, 1), ord(' '), dtype=np.uint8)]
+      parts[-1] = np.full((end - start, 1), ord('\n'), dtype=np.uint8)
+      f.write(np.hstack(parts).tobytes())
+
+def vectorFileName(directory,simTop):
+  # the test benches read <ENTITY_NAME>_vectors.txt from the simulation directory
+  return os.path.abspath(os.path.join(directory, '{}_vectors.txt'.format(simTop)))
+
+def vectorTestJob(module,simTop,fileName,count,genericsDict={},optionsDict={}):
+  options = merge_dicts(optionsDict, {'FLOW_SIM_TOP': simTop, 'FLOW_SIM_FILES': os.path.abspath(fileName)})
+  return testJob(module, merge_dicts(genericsDict, {'VECTORS': count}), options)
@@ -0,0 +1,129 @@
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import hashlib
+import json
+import os
+import tempfile
+
+from . import jobOptions
+
+# number of recent execution times and outcomes which are kept per job
+HISTORY_LENGTH = 10
+
+DEFAULT_HISTORY_FILE = '.memsec_history.json'
+
+# a job which failed in all recent runs is ordered as if it took this many
+# times longer than expected
+FAILURE_WEIGHT = 2
+
+def historyKey(job):
+  return json.dumps([job['MODULE'], jobOptions(job)], sort_keys=True, default=str)
+
+def loadHistory(historyFile):
+  if not historyFile or not os.path.isfile(historyFile):
+    return {}
+  with open(historyFile, 'r') as f:
+    return json.load(f)
+
+def saveHistory(historyFile,history):
+  # write atomically such that concurrent readers never see a partial file
+  directory = os.path.dirname(os.path.abspath(historyFile))
+  os.makedirs(directory, exist_ok=True)
+  fd, tmpFile = tempfile.mkstemp(dir=directory)
+  with os.fdopen(fd, 'w') as f:
+    json.dump(history, f, indent=2, sort_keys=True)
+  os.replace(tmpFile, historyFile)
+
+def updateHistory(history,job,res):
+  # cached results say nothing about the cost of a job and are ignored
+  if res.get('CACHED'):
+    return
+  # (a failure is an unexpected outcome, see EXPECTED_ERROR)
+  failed = res.get('ERROR', res['RETURN_CODE'] != 0)
+  entry  = history.setdefault(historyKey(job), {'EXECUTION_TIMES': [], 'PEAK_RSS': 0, 'RUNS': 0, 'FAILURES': 0})
+  entry['EXECUTION_TIMES'] = (entry['EXECUTION_TIMES'] + [res['EXECUTION_TIME']])[-HISTORY_LENGTH:]
+  entry['OUTCOMES']        = (entry.get('OUTCOMES', []) + [1 if failed else 0])[-HISTORY_LENGTH:]
+  entry['PEAK_RSS']        = max(entry['PEAK_RSS'], res.get('PEAK_RSS', 0))
+  entry['RUNS']           += 1
+  entry['FAILURES']       += 1 if failed else 0
+
+def recordHistory(historyFile,job,res):
+  # The file is reread before every update such that concurrent runners
+  # sharing it lose as few entries as possible.
+  if not historyFile or res.get('CACHED'):
+    return
+  history = loadHistory(historyFile)
+  updateHistory(history, job, res)
+  saveHistory(historyFile, history)
+
+def estimatedDuration(history,job,default=None):
+  entry = history.get(historyKey(job))
+  if not entry or not entry['EXECUTION_TIMES']:
+    return default
+  return sum(entry['EXECUTION_TIMES']) / len(entry['EXECUTION_TIMES'])
+
+def estimatedMemory(history,job,default=None):
+  # Without a previous run of the job itself, the largest peak of the runs
+  # with the same module and CRYPTO_CONFIG is used as estimate.
+  entry = history.get(historyKey(job))
+  if entry and entry['PEAK_RSS']:
+    return entry['PEAK_RSS']
+  similar = [e['PEAK_RSS'] for k, e in history.items() if json.loads(k)[0] == job['MODULE'] and json.loads(k)[1].get('CRYPTO_CONFIG') == jobOptions(job).get('CRYPTO_CONFIG')]
+  return max(similar) if similar and max(similar) else default
+
+def failureRate(history,job):
+  entry = history.get(historyKey(job))
+  if not entry or not entry.get('OUTCOMES'):
+    return 0
+  return sum(entry['OUTCOMES']) / len(entry['OUTCOMES'])
+
+def expectedDurations(history,jobs):
+  # jobs without history are expected to take as long as the slowest known job
+  known   = [estimatedDuration(history, job) for job in jobs]
+  default = max([d for d in known if d is not None], default=1)
+  return [default if d is None else d for d in known]
+
+def orderJobs(jobs,history):
+  # Longest and most often failing jobs first, i.e., failures show up early
+  # and the slow jobs do not delay the end of the run.
+  jobs       = list(jobs)
+  priorities = [d * (1 + FAILURE_WEIGHT * failureRate(history, job)) for job, d in zip(jobs, expectedDurations(history, jobs))]
+  order      = sorted(range(len(jobs)), key=lambda index: (-priorities[index], historyKey(jobs[index])))
+  return [jobs[index] for index in order]
+
+def shardJobs(jobs,shard,shards,history=None):
+  # Returns the jobs of the given shard (0 <= shard < shards). Without a
+  # history, the shard of a job is derived from a hash of its key. With a
+  # history snapshot, the jobs are split into shards with about the same
+  # expected duration. The split only depends on the jobs and the given
+  # snapshot, i.e., all runners have to pass the same snapshot and must not
+  # use a history file which is updated while they run.
+  jobs = list(jobs)
+  if history is None:
+    return [job for job in jobs if int(hashlib.sha256(historyKey(job).encode()).hexdigest(), 16) % shards == shard]
+  durations = expectedDurations(history, jobs)
+  loads     = [0] * shards
+  selected  = []
+  for index in sorted(range(len(jobs)), key=lambda index: (-durations[index], historyKey(jobs[index]))):
+    target = loads.index(min(loads))
+    loads[target] += durations[index]
+    if target == shard:
+      selected.append(index)
+  return [jobs[index] for index in sorted(selected)]
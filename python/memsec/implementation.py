@@ -0,0 +1,110 @@
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+import collections
+import glob
+import json
+import os
+import shutil
+import time
+
+from . import binaryDirName, bitStreamJob, cacheKey, cacheLookup, cacheStore, defaultCacheDir, jobOptions, merge_dicts, prepareJob, run, runJob
+
+DEFAULT_IMPL_STRATEGY = 'Vivado Implementation Defaults'
+
+def synthesisOptions(job):
+  return {k: v for k,v in job['OPTIONS'].items() if k != 'FLOW_VIVADO_IMPL_STRATEGY'}
+
+def groupBitStreamJobs(jobs):
+  # jobs which only differ in their implementation strategy share the synthesis
+  groups = collections.OrderedDict()
+  for job in jobs:
+    key = json.dumps([job['MODULE'], job['GENERICS'], synthesisOptions(job)], sort_keys=True, default=str)
+    groups.setdefault(key, []).append(job)
+  return list(groups.values())
+
+def strategyBinaryDir(job,workspace):
+  name = binaryDirName(jobOptions(job)) or '_build'
+  return os.path.join(workspace, name) if workspace else name
+
+def collectStrategyRun(job,groupRes,binaryRootDir,runIndex,jobDir):
+  # Copy the artifacts of one implementation run to the names which are used
+  # by a regular build of the job.
+  module     = job['MODULE']
+  prefix     = os.path.join(binaryRootDir, '{}-impl_strategy_{}'.format(module, runIndex))
+  returncode = groupRes['RETURN_CODE'] or 1
+  if os.path.isfile(prefix + '.status'):
+    with open(prefix + '.status', 'r') as f:
+      returncode = int(f.read().strip())
+  os.makedirs(jobDir, exist_ok=True)
+  artifacts = {prefix + '.bit':                 module + '.bit',
+               prefix + '_timing_summary.txt':  module + '-impl_timing_summary.txt',
+               prefix + '_utilization.txt':     module + '-impl_utilization.txt'}
+  if os.path.abspath(jobDir) != os.path.abspath(binaryRootDir):
+    for fileName in glob.glob(os.path.join(binaryRootDir, module + '-synth_*.txt')) + glob.glob(os.path.join(binaryRootDir, '*.log')):
+      artifacts[fileName] = os.path.basename(fileName)
+  for source, destination in artifacts.items():
+    if os.path.isfile(source):
+      shutil.copy2(source, os.path.join(jobDir, destination))
+  return {'COMMAND': groupRes['COMMAND'], 'RETURN_CODE': returncode, 'EXECUTION_TIME': groupRes['EXECUTION_TIME'], 'ERROR': returncode != 0, 'PEAK_RSS': groupRes.get('PEAK_RSS', 0),
+          'PHASES': groupRes.get('PHASES', []), 'TIMED_OUT': groupRes.get('TIMED_OUT', False)}
+
+def runBitStreamGroup(jobs,workspace=None,logFile=None,cacheDir=defaultCacheDir):
+  # All jobs of a group only differ in their implementation strategy. The
+  # design is therefore synthesized once and every strategy is implemented as
+  # separate run of the same Vivado project. The runs are launched in parallel
+  # (see FLOW_VIVADO_IMPL_JOBS).
+  if len(jobs) == 1:
+    return [runJob(jobs[0], workspace, logFile, cacheDir)]
+  module   = jobs[0]['MODULE']
+  groupJob = dict(jobs[0], OPTIONS=synthesisOptions(jobs[0]), TARGETS=['implscb', 'clean'])
+  binaryRootDir, files, varStrings = prepareJob(groupJob, workspace)
+  binaryRootDir = binaryRootDir or '_build'
+  results = [None] * len(jobs)
+  keys    = [None] * len(jobs)
+  if cacheDir:
+    for index, job in enumerate(jobs):
+      keys[index]    = cacheKey(job, files)
+      results[index] = cacheLookup(cacheDir, keys[index], strategyBinaryDir(job, workspace))
+  pending = [index for index, res in enumerate(results) if not res]
+  if pending:
+    strategies  = [jobs[index]['OPTIONS'].get('FLOW_VIVADO_IMPL_STRATEGY', DEFAULT_IMPL_STRATEGY) for index in pending]
+    varStrings += ["{}FLOW_VIVADO_IMPL_STRATEGIES=\"{}\"".format(module, ';'.join(strategies))]
+    for fileName in glob.glob(os.path.join(binaryRootDir, module + '-impl_strategy_*.status')):
+      os.remove(fileName)
+    start    = time.time()
+    groupRes = run(module, groupJob['TARGETS'], binaryRootDir, varStrings, logFile, jobs[0].get('TIMEOUT'))
+    for runIndex, index in enumerate(pending):
+      jobDir         = strategyBinaryDir(jobs[index], workspace)
+      results[index] = collectStrategyRun(jobs[index], groupRes, binaryRootDir, runIndex, jobDir)
+      results[index]['STRATEGY_GROUP_SIZE'] = len(pending)
+      if cacheDir and results[index]['RETURN_CODE'] == 0:
+        cacheStore(cacheDir, keys[index], results[index], jobDir, start)
+  for job, res in zip(jobs, results):
+    if job.get('EXPECTED_ERROR'):
+      res['ERROR'] = not res['ERROR']
+  return [merge_dicts(res, { 'OPTIONS': jobOptions(job), 'MODULE': module, 'BINARY_ROOT_DIR': strategyBinaryDir(job, workspace) }) for job, res in zip(jobs, results)]
+
+def runBitStreamJobs(jobs,cacheDir=defaultCacheDir):
+  res = []
+  for group in groupBitStreamJobs(jobs):
+    res += runBitStreamGroup(group, cacheDir=cacheDir)
+  return res
+
+def buildBitStreams(module,bdGenericsDict={},optionsDictList=[{}],cacheDir=defaultCacheDir):
+  return runBitStreamJobs([bitStreamJob(module,bdGenericsDict,optionsDict) for optionsDict in optionsDictList], cacheDir)
@@ -0,0 +1,207 @@
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import glob
+import os
+
+try:
+  import numpy as np
+except ImportError:
+  # only the image verification depends on numpy
+  np = None
+
+from . import binaryDirName, merge_dicts, testJob
+from .golden import VECTOR_CHUNK_SIZE, princeDecrypt, words
+
+# tb_rw_blockram dumps the final memory content into <ENTITY_NAME>_memory.txt
+# (one memory word per line, hex, most significant byte first) and logs every
+# beat which it writes into <ENTITY_NAME>_plaintext.txt as "<address> <data>
+# <strobes>". Bytes are stored little-endian, i.e., the least significant byte
+# of a word is located at the lowest address.
+
+# CRYPTO_CONFIGs whose memory image can be decrypted and the corresponding
+# mode of memsec_block_encryption
+IMAGE_MODES = {0: 'PLAIN', 3: 'PRINCE_ECB', 5: 'PRINCE_CBC', 7: 'PRINCE_XTS'}
+IMAGE_BLOCK_SIZE = 8
+
+# keys of memsec_block_encryption (key0, key1), all PRINCE keys are zero
+PRINCE_CIPHER_KEY = (0, 0)
+PRINCE_IV_KEY     = (0, 0)
+PRINCE_TWEAK_KEY  = (0, 0)
+
+# tweak multiplication with alpha in GF(2^64) (see xts_tweak_mul.vhd)
+XTS_POLYNOMIAL = 0x1b
+
+def requireNumpy():
+  if np is None:
+    raise ImportError('The image verification requires numpy.')
+
+def imageParameters(optionsDict):
+  # defaults of tb_rw_blockram
+  return {'CRYPTO_CONFIG':        optionsDict.get('CRYPTO_CONFIG', 1),
+          'BLOCKS_PER_SECTOR':    optionsDict.get('BLOCKS_PER_SECTOR', 4),
+          'MEMORY_START_ADDRESS': optionsDict.get('MEMORY_START_ADDRESS', 0x40000000)}
+
+def readColumns(fileName):
+  # Lines of equally long, space separated hex numbers as one array of
+  # characters per column. The file is parsed without touching the individual
+  # lines in Python.
+  data = np.fromfile(fileName, dtype=np.uint8)
+  if len(data) == 0:
+    return []
+  width   = int(np.argmax(data == ord('\n'))) + 1
+  lines   = data[:len(data) // width * width].reshape(-1, width)
+  columns = []
+  start   = 0
+  for end in list(np.flatnonzero(lines[0] == ord(' '))) + [width - 1]:
+    columns += [lines[:, start:end]]
+    start    = end + 1
+  return columns
+
+def hexBytes(column):
+  # hex digits (most significant first) to little-endian bytes
+  table = np.zeros(256, dtype=np.uint8)
+  for value, digit in enumerate(b'0123456789abcdef'):
+    table[digit] = table[ord(chr(digit).upper())] = value
+  nibbles = table[column]
+  return ((nibbles[:, 0::2] << 4) | nibbles[:, 1::2])[:, ::-1]
+
+def readImage(fileName):
+  # the memory content as array of bytes
+  requireNumpy()
+  columns = readColumns(fileName)
+  return np.ascontiguousarray(hexBytes(columns[0])).reshape(-1) if columns else np.zeros(0, dtype=np.uint8)
+
+def readPlaintextLog(fileName):
+  # returns the beat addresses, the data bytes, and the byte strobes
+  requireNumpy()
+  columns = readColumns(fileName)
+  if not columns:
+    return np.zeros(0, dtype=np.int64), np.zeros((0, IMAGE_BLOCK_SIZE), dtype=np.uint8), np.zeros((0, IMAGE_BLOCK_SIZE), dtype=bool)
+  addressBytes = np.ascontiguousarray(hexBytes(columns[0]))
+  addresses    = (addressBytes.astype(np.int64) << (8 * np.arange(addressBytes.shape[1], dtype=np.int64))).sum(axis=1)
+  data         = hexBytes(columns[1])
+  strobes      = np.unpackbits(hexBytes(columns[2]), axis=1, bitorder='little')[:, :data.shape[1]].astype(bool)
+  return addresses, data, strobes
+
+def applyWrites(image,addresses,data,strobes,baseAddress=0x40000000):
+  # Writes the strobed bytes of all beats into a copy of the image. Later
+  # writes to the same byte win. Also returns the written byte offsets.
+  out     = image.copy()
+  lanes   = np.arange(data.shape[1], dtype=np.int64)
+  offsets = np.mod(addresses - baseAddress, len(image))
+  offsets = (offsets - offsets % data.shape[1])[:, np.newaxis] + lanes
+  offsets, values = offsets[strobes][::-1], data[strobes][::-1]
+  offsets, first  = np.unique(offsets, return_index=True)
+  out[offsets] = values[first]
+  return out, offsets
+
+def gfDouble(x):
+  return (x << np.uint64(1)) ^ np.where(x >> np.uint64(63) != 0, np.uint64(XTS_POLYNOMIAL), np.uint64(0))
+
+def decryptSectors(mode,blocks,sectorAddresses):
+  # blocks is an array of shape (sectors, BLOCKS_PER_SECTOR) of little-endian
+  # 64-bit ciphertext blocks. The IVs (CBC) and initial tweaks (XTS) are
+  # derived by decrypting the full sector address (including the memory start
+  # address), just like the hardware does.
+  if mode == 'PLAIN':
+    return blocks
+  if mode == 'PRINCE_ECB':
+    return princeDecrypt(*PRINCE_CIPHER_KEY, blocks)
+  if mode == 'PRINCE_CBC':
+    iv = princeDecrypt(*PRINCE_IV_KEY, sectorAddresses)
+    return princeDecrypt(*PRINCE_CIPHER_KEY, blocks) ^ np.concatenate([iv[:, np.newaxis], blocks[:, :-1]], axis=1)
+  tweaks = np.empty_like(blocks)
+  tweaks[:, 0] = princeDecrypt(*PRINCE_TWEAK_KEY, sectorAddresses)
+  for i in range(1, blocks.shape[1]):
+    tweaks[:, i] = gfDouble(tweaks[:, i - 1])
+  return princeDecrypt(*PRINCE_CIPHER_KEY, blocks ^ tweaks) ^ tweaks
+
+def decryptImage(image,cryptoConfig,blocksPerSector,baseAddress=0x40000000,chunkSize=VECTOR_CHUNK_SIZE):
+  # Decrypts the whole image, which starts at baseAddress, in batches of
+  # sectors whose intermediate values fit into the CPU caches. Returns the
+  # plaintext as array of bytes.
+  requireNumpy()
+  if cryptoConfig not in IMAGE_MODES:
+    raise ValueError('The memory image of CRYPTO_CONFIG {} cannot be decrypted.'.format(cryptoConfig))
+  sectorSize = IMAGE_BLOCK_SIZE * blocksPerSector
+  if len(image) % sectorSize != 0:
+    raise ValueError('The memory image ({} bytes) is no multiple of the sector size ({} bytes).'.format(len(image), sectorSize))
+  blocks  = image.view('<u8').astype(np.uint64).reshape(-1, blocksPerSector)
+  plain   = np.empty_like(blocks)
+  sectors = max(1, chunkSize // blocksPerSector)
+  for start in range(0, len(blocks), sectors):
+    end = min(start + sectors, len(blocks))
+    plain[start:end] = decryptSectors(IMAGE_MODES[cryptoConfig], blocks[start:end], words(baseAddress + np.arange(start, end) * sectorSize))
+  return plain.astype('<u8').view(np.uint8).reshape(-1)
+
+def verifyImage(imageFile,plaintextFile,optionsDict={}):
+  # The expected plaintext consists of the plaintext of the initial (all
+  # zero) memory which has been overwritten by the logged writes. Every block
+  # of the decrypted image has to match it.
+  p       = imageParameters(optionsDict)
+  image   = readImage(imageFile)
+  initial = decryptImage(np.zeros_like(image), p['CRYPTO_CONFIG'], p['BLOCKS_PER_SECTOR'], p['MEMORY_START_ADDRESS'])
+  expected, written = applyWrites(initial, *readPlaintextLog(plaintextFile), p['MEMORY_START_ADDRESS'])
+  plain      = decryptImage(image, p['CRYPTO_CONFIG'], p['BLOCKS_PER_SECTOR'], p['MEMORY_START_ADDRESS'])
+  mismatches = np.flatnonzero((plain != expected).reshape(-1, IMAGE_BLOCK_SIZE).any(axis=1)) * IMAGE_BLOCK_SIZE
+  sectorSize = IMAGE_BLOCK_SIZE * p['BLOCKS_PER_SECTOR']
+  return {'MODE':               IMAGE_MODES[p['CRYPTO_CONFIG']],
+          'BYTES':              len(image),
+          'WRITTEN_BYTES':      len(written),
+          'WRITTEN_SECTORS':    len(np.unique(written // sectorSize)),
+          'MISMATCHES':         [int(a) for a in mismatches],
+          'MISMATCHED_SECTORS': len(np.unique(mismatches // sectorSize)),
+          'ERROR':              len(mismatches) > 0}
+
+def imageFiles(res):
+  # the flow keeps the files as <module>_<file> in the binary root directory
+  files = []
+  for suffix in ['memory', 'plaintext']:
+    found  = sorted(glob.glob(os.path.join(res['BINARY_ROOT_DIR'], '{}_*_{}.txt'.format(res['MODULE'], suffix))))
+    files += [found[0] if found else None]
+  return files
+
+def imageJob(module,genericsDict={},optionsDict={}):
+  # tb_rw_blockram dumps the final memory image and logs the written plaintext
+  options = merge_dicts(optionsDict, {'FLOW_SIM_TOP': 'tb_rw_blockram'})
+  return testJob(module, merge_dicts(genericsDict, {'MEMORY_IMAGE': 1}), options)
+
+def verifyImages(resList):
+  for res in resList:
+    imageFile, plaintextFile = imageFiles(res) if not res['ERROR'] else (None, None)
+    res['IMAGE'] = verifyImage(imageFile, plaintextFile, res['OPTIONS']) if imageFile and plaintextFile else {}
+  return resList
+
+def printImageSummary(resList):
+  print("")
+  print("------------------------------------------------------------------------------")
+  print("Memory images:")
+  print("------------------------------------------------------------------------------")
+  print("{:30} {:>10} {:>10} {:>10} {:>10}".format('Configuration', 'Mode', 'Written', 'Sectors', 'Mismatches'))
+  for res in resList:
+    stats = res.get('IMAGE')
+    name  = binaryDirName(res['OPTIONS']) or res['MODULE']
+    if not stats:
+      print("{:30} no memory image".format(name))
+      continue
+    print("{:30} {:>10} {:>10} {:>10} {:>10}".format(name, stats['MODE'], stats['WRITTEN_BYTES'], stats['WRITTEN_SECTORS'], len(stats['MISMATCHES'])))
+    for address in stats['MISMATCHES'][:8]:
+      print("  block at 0x{:08x} does not match the plaintext".format(address))
+  print("------------------------------------------------------------------------------")
@@ -0,0 +1,239 @@
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import math
+
+from . import jobOptions, merge_dicts
+
+CRYPTO_CONFIG_NAMES = {0:  'PLAIN',
+                       1:  'ASCON',
+                       2:  'TEC_TREE_ASCON',
+                       3:  'PRINCE_ECB',
+                       4:  'AES_ECB',
+                       5:  'PRINCE_CBC',
+                       6:  'AES_CBC',
+                       7:  'PRINCE_XTS',
+                       8:  'AES_XTS',
+                       9:  'MEAS',
+                       10: 'MEAS_ECB'}
+
+# defaults of the generics of hdl/top/memsec.vhd and of the model parameters
+MODEL_DEFAULTS = {'CRYPTO_CONFIG':         1,
+                  'DATA_MEMORY_SIZE':      256*1024*1024,
+                  'TREE_ARITY':            4,
+                  'TREE_ROOTS':            1024,
+                  'TREE_NODE_CACHE_SIZE':  1024,
+                  'DATA_BLOCK_SIZE':       64,
+                  'BLOCKS_PER_SECTOR':     2,
+                  'DATA_TAG_SIZE':         16,
+                  'DATASTREAM_DATA_WIDTH': 64,
+                  'UNROLED_ROUNDS':        3,   # Ascon, see stream_ascon.vhd
+                  'ROUNDS':                6,   # QARMA, see stream_lrae_ascon_prince_ecb.vhd
+                  'REQUEST_SIZE':          32,  # size of a cache line fill of the CPU
+                  'MEMORY_DATA_WIDTH':     64,  # width of the memory bus in bits
+                  'MEMORY_LATENCY':        20,  # cycles until the first beat of a burst arrives
+                  'PIPELINE_LATENCY':      12}  # register stages in the request and response path
+
+TEC_TREE_METADATA = 8   # size of the nonces and tree elements in byte
+ASCON_METADATA    = 16  # size of nonce and tag per block in byte
+MEAS_TREE_KEYSIZE = 16  # size of the keys stored in the MEAS tree in byte
+CACHE_ADDR_WIDTH  = 26
+
+# the operand sizes in byte and latency of the block ciphers in cycles
+# (the AES core is currently a placeholder register stage, the latency of
+# QARMA depends on the number of rounds)
+BLOCK_CIPHERS = {'PRINCE': (8, 1), 'AES': (16, 1), 'QARMA': (8, None)}
+PRINCE_ROUNDS = 12
+
+def modelParameters(optionsDict):
+  return merge_dicts(MODEL_DEFAULTS, {k: v for k,v in optionsDict.items() if k in MODEL_DEFAULTS})
+
+def log2Ceil(value):
+  return max(0, int(math.ceil(math.log2(value)))) if value > 1 else 0
+
+def treeLevels(p):
+  # same computation as in stream_tree_request_generator.vhd
+  blocks = p['DATA_MEMORY_SIZE'] // p['DATA_BLOCK_SIZE'] // p['TREE_ROOTS']
+  arityBits = log2Ceil(p['TREE_ARITY'])
+  return (log2Ceil(blocks) + arityBits - 1) // arityBits
+
+def treeElements(p,level):
+  # number of tree elements on the given level (0 is the level below the roots)
+  return p['TREE_ROOTS'] * p['TREE_ARITY']**(level + 1)
+
+def nodeCacheMissRates(p,treeDataSize,cacheDataWidth):
+  # Approximation for uniformly distributed requests: the direct mapped node
+  # cache keeps the upper tree levels, starting from the top, as long as they fit.
+  elementsPerEntry = max(1, cacheDataWidth // 8 // treeDataSize)
+  capacity = p['TREE_NODE_CACHE_SIZE'] * elementsPerEntry
+  rates = []
+  for level in range(treeLevels(p)):
+    elements = treeElements(p, level)
+    cached   = min(elements, capacity)
+    capacity = capacity - cached
+    rates   += [1.0 - cached / elements]
+  return rates
+
+def asconCycles(p,size):
+  # initialization, associated data, one permutation per 8 byte rate block, finalization
+  roundsA = int(math.ceil(12 / p['UNROLED_ROUNDS']))
+  roundsB = int(math.ceil(6 / p['UNROLED_ROUNDS']))
+  return 2*roundsA + roundsB * (int(math.ceil(size / 8)) + 1)
+
+def blockCipherLatency(p,cipher):
+  # QARMA is unrolled like PRINCE, so its latency grows with the 2*ROUNDS+2
+  # round functions relative to the 12 rounds of PRINCE
+  if cipher == 'QARMA':
+    return (2*p['ROUNDS'] + 2) / PRINCE_ROUNDS
+  return BLOCK_CIPHERS[cipher][1]
+
+def blockCipherCycles(p,cipher,size,chained=False):
+  # pipelined ciphers process one block per cycle, chained (CBC encryption) ones
+  # have to wait for the previous block
+  blockSize = BLOCK_CIPHERS[cipher][0]
+  latency   = blockCipherLatency(p, cipher)
+  blocks    = int(math.ceil(size / blockSize))
+  return blocks * latency if chained else blocks + latency - 1
+
+def transferCycles(p,size):
+  # bursts are limited by the memory bus and the internal data stream
+  width = min(p['MEMORY_DATA_WIDTH'], p['DATASTREAM_DATA_WIDTH']) // 8
+  return int(math.ceil(size / width))
+
+def alignedSize(size,alignment):
+  return int(math.ceil(size / alignment)) * alignment
+
+def blockCipherConfig(config):
+  return {3: ('PRINCE', 'ECB'), 4: ('AES', 'ECB'), 5: ('PRINCE', 'CBC'), 6: ('AES', 'CBC'), 7: ('PRINCE', 'XTS'), 8: ('AES', 'XTS')}[config]
+
+def measCipher(config):
+  return 'QARMA' if config == 10 else 'PRINCE'
+
+def accessPattern(p):
+  # Returns the data bytes per block, the metadata bytes stored per block, the
+  # metadata bytes stored in the tree, the bytes of one tree element, and the
+  # size of the on-chip cache and root entries in bits.
+  config = p['CRYPTO_CONFIG']
+  if config in [2, 9, 10]:
+    levels       = treeLevels(p)
+    treeDataSize = TEC_TREE_METADATA if config == 2 else MEAS_TREE_KEYSIZE
+    blockMeta    = TEC_TREE_METADATA if config == 2 else p['DATA_TAG_SIZE']
+    treeBytes    = sum(treeElements(p, level) for level in range(levels)) * treeDataSize
+    entryWidth   = p['DATASTREAM_DATA_WIDTH'] if config == 2 else 8*MEAS_TREE_KEYSIZE
+    return p['DATA_BLOCK_SIZE'], blockMeta, treeBytes, treeDataSize, entryWidth
+  if config == 1:
+    return p['DATA_BLOCK_SIZE'], ASCON_METADATA, 0, 0, 0
+  if config == 0:
+    return 8*p['BLOCKS_PER_SECTOR'], 0, 0, 0, 0
+  cipher, mode = blockCipherConfig(config)
+  return BLOCK_CIPHERS[cipher][0]*p['BLOCKS_PER_SECTOR'], 0, 0, 0, 0
+
+def cryptoCycles(p,size,write):
+  # cycles spent in the cryptographic primitive for one block of the given size
+  config = p['CRYPTO_CONFIG']
+  if config == 0:
+    return 0
+  if config in [1, 2]:
+    return asconCycles(p, size)
+  if config in [9, 10]:
+    return max(asconCycles(p, size), blockCipherCycles(p, measCipher(config), size))
+  cipher, mode = blockCipherConfig(config)
+  cycles = blockCipherCycles(p, cipher, size, chained=(mode == 'CBC' and write))
+  if mode == 'XTS':
+    cycles += blockCipherLatency(p, cipher)  # tweak encryption
+  return cycles
+
+def treeNodeCycles(p,size):
+  # TEC-tree nodes are authenticated with Ascon, MEAS tree nodes are encrypted
+  # one block after the other with the block cipher (STATE_ECB)
+  config = p['CRYPTO_CONFIG']
+  if config in [9, 10]:
+    return blockCipherCycles(p, measCipher(config), size, chained=True)
+  return asconCycles(p, size)
+
+def predictPerformance(optionsDict):
+  # Predicts the memory accesses, metadata overhead, and latency (in cycles)
+  # of a single read and a single write request of the CPU.
+  p = modelParameters(optionsDict)
+  config = p['CRYPTO_CONFIG']
+  blockSize, blockMeta, treeBytes, treeDataSize, entryWidth = accessPattern(p)
+  blocks    = int(math.ceil(p['REQUEST_SIZE'] / blockSize))
+  dataBytes = blocks * (blockSize + blockMeta)
+
+  # tree elements which have to be fetched from memory (node cache misses)
+  levels       = treeLevels(p) if treeDataSize else 0
+  missRates    = nodeCacheMissRates(p, treeDataSize, entryWidth) if treeDataSize else []
+  treeFetches  = blocks * sum(missRates)
+  treeNodeSize = p['TREE_ARITY'] * treeDataSize
+
+  # reads: fetch the blocks and the missing tree nodes, verify them, and decrypt
+  readAccesses = blocks + treeFetches
+  readBytes    = dataBytes + treeFetches * treeNodeSize
+  readCycles   = p['MEMORY_LATENCY'] + p['PIPELINE_LATENCY'] + transferCycles(p, readBytes)
+  readCycles  += blocks * cryptoCycles(p, blockSize, False) + treeFetches * (treeNodeCycles(p, treeNodeSize) if treeDataSize else 0)
+
+  # writes: partial blocks and authenticated blocks (nonces, tree path) are read first
+  readModifyWrite = config in [1, 2, 9, 10] or p['REQUEST_SIZE'] % blockSize != 0
+  writeReads      = readAccesses if readModifyWrite else 0
+  writeAccesses   = writeReads + blocks + blocks * levels
+  writtenBytes    = dataBytes + blocks * levels * treeNodeSize
+  writeCycles     = (readCycles if readModifyWrite else p['MEMORY_LATENCY'] + p['PIPELINE_LATENCY'])
+  writeCycles    += transferCycles(p, writtenBytes) + blocks * cryptoCycles(p, blockSize, True)
+  writeCycles    += blocks * levels * (treeNodeCycles(p, treeNodeSize) if treeDataSize else 0)
+
+  metadataBytes = p['DATA_MEMORY_SIZE'] // blockSize * blockMeta + treeBytes
+  cacheBits     = p['TREE_NODE_CACHE_SIZE'] * (1 + CACHE_ADDR_WIDTH - log2Ceil(p['TREE_NODE_CACHE_SIZE']) + entryWidth) if treeDataSize else 0
+  return {'CRYPTO_CONFIG_NAME': CRYPTO_CONFIG_NAMES.get(config, str(config)),
+          'TREE_LEVELS':        levels,
+          'READ_ACCESSES':      readAccesses,
+          'READ_BYTES':         readBytes,
+          'WRITE_ACCESSES':     writeAccesses,
+          'WRITE_BYTES':        (readBytes if readModifyWrite else 0) + writtenBytes,
+          'TREE_NODE_FETCHES':  treeFetches,
+          'METADATA_BYTES':     metadataBytes,
+          'METADATA_OVERHEAD':  metadataBytes / p['DATA_MEMORY_SIZE'],
+          'ON_CHIP_BITS':       cacheBits + (p['TREE_ROOTS'] * entryWidth if treeDataSize else 0) + p['DATASTREAM_DATA_WIDTH'],
+          'READ_LATENCY':       readCycles,
+          'WRITE_LATENCY':      writeCycles}
+
+def dominates(a,b,objectives):
+  return all(a[o] <= b[o] for o in objectives) and any(a[o] < b[o] for o in objectives)
+
+def paretoFront(predictions,objectives=['READ_LATENCY', 'WRITE_LATENCY', 'METADATA_OVERHEAD', 'ON_CHIP_BITS']):
+  # returns the indices of the predictions which are not dominated by any other one
+  order = sorted(range(len(predictions)), key=lambda i: [predictions[i][o] for o in objectives])
+  front = []
+  for i in order:
+    if not any(dominates(predictions[j], predictions[i], objectives) for j in front):
+      front += [i]
+  return sorted(front)
+
+def paretoJobs(jobs,objectives=['READ_LATENCY', 'WRITE_LATENCY', 'METADATA_OVERHEAD', 'ON_CHIP_BITS'],groupKeys=['CRYPTO_CONFIG']):
+  # Only keeps the jobs whose predicted performance is Pareto optimal among the
+  # jobs with the same groupKeys (different primitives are not interchangeable).
+  # Jobs with identical predictions (e.g., different strategies) are all kept.
+  # The jobs may be a lazily expanded sweep (see sweepJobs).
+  jobs = list(jobs)
+  predictions = [predictPerformance(jobOptions(job)) for job in jobs]
+  groups = {}
+  for job, prediction in zip(jobs, predictions):
+    groups.setdefault(tuple(modelParameters(jobOptions(job))[k] for k in groupKeys), []).append(prediction)
+  fronts = {key: [group[i] for i in paretoFront(group, objectives)] for key, group in groups.items()}
+  return [job for job, prediction in zip(jobs, predictions)
+          if any(all(prediction[o] == f[o] for o in objectives) for f in fronts[tuple(modelParameters(jobOptions(job))[k] for k in groupKeys)])]
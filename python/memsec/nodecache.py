@@ -0,0 +1,207 @@
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import itertools
+import mmap
+import os
+import struct
+
+try:
+  import numpy as np
+except ImportError:
+  # only the vectorized trace processing depends on numpy
+  np = None
+
+from .model import CACHE_ADDR_WIDTH, MEAS_TREE_KEYSIZE, TEC_TREE_METADATA, log2Ceil, modelParameters, treeLevels
+
+# binary traces consist of little-endian 64-bit words, bit 63 marks writes
+TRACE_RECORD = struct.Struct('<Q')
+TRACE_WRITE  = 1 << 63
+
+# number of accesses which are processed at once, the intermediate arrays of
+# the node cache simulation should fit into the CPU caches
+TRACE_CHUNK_SIZE = 1 << 16
+
+def requireNumpy():
+  if np is None:
+    raise ImportError('The trace processing requires numpy.')
+
+def readTrace(fileName,chunkSize=1<<24):
+  # Yields (address, write, size) tuples. The trace is memory mapped and
+  # processed in chunks, i.e., it may be larger than the available memory.
+  # Text traces contain one "R|W <address> [<size>]" access per line.
+  if os.path.getsize(fileName) == 0:
+    return
+  with open(fileName, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+    if fileName.endswith('.bin'):
+      chunkSize = chunkSize - chunkSize % TRACE_RECORD.size
+      for start in range(0, len(mm) - len(mm) % TRACE_RECORD.size, chunkSize):
+        for (word,) in TRACE_RECORD.iter_unpack(mm[start:min(start + chunkSize, len(mm) - len(mm) % TRACE_RECORD.size)]):
+          yield word & ~TRACE_WRITE, bool(word & TRACE_WRITE), 0
+    else:
+      for line in iter(mm.readline, b''):
+        fields = line.split()
+        if not fields or fields[0].startswith(b'#'):
+          continue
+        yield int(fields[1], 0), fields[0].upper() == b'W', int(fields[2], 0) if len(fields) > 2 else 0
+
+def traceChunks(fileName,chunkSize=TRACE_CHUNK_SIZE):
+  # Yields the accesses of a trace (see readTrace) as arrays of addresses,
+  # write flags, and sizes. Binary traces are memory mapped and converted
+  # without touching the individual records in Python.
+  requireNumpy()
+  if fileName.endswith('.bin'):
+    count = os.path.getsize(fileName) // TRACE_RECORD.size
+    if count == 0:
+      return
+    trace = np.memmap(fileName, dtype='<u8', mode='r', shape=(count,))
+    for start in range(0, count, chunkSize):
+      words = np.asarray(trace[start:start + chunkSize])
+      yield (words & np.uint64(TRACE_WRITE - 1)).astype(np.int64), (words & np.uint64(TRACE_WRITE)) != 0, np.zeros(len(words), dtype=np.int64)
+  else:
+    accesses = readTrace(fileName)
+    while True:
+      chunk = list(itertools.islice(accesses, chunkSize))
+      if not chunk:
+        return
+      addresses, writes, sizes = zip(*chunk)
+      yield np.array(addresses, dtype=np.int64), np.array(writes, dtype=bool), np.array(sizes, dtype=np.int64)
+
+def nodeCacheParameters(optionsDict):
+  # the trace addresses are relative to the base address of the memsec core
+  return dict(modelParameters(optionsDict), MEMORY_START_ADDRESS=optionsDict.get('MEMORY_START_ADDRESS', 0x40000000))
+
+def treeGeometry(p):
+  # Tree layout as generated by stream_tree_request_generator.vhd and the
+  # cache addressing of node_cache_read_issuer.vhd for the given configuration.
+  meas         = p['CRYPTO_CONFIG'] in [9, 10]
+  treeDataSize = MEAS_TREE_KEYSIZE if meas else TEC_TREE_METADATA
+  levels       = treeLevels(p)
+  arityBits    = log2Ceil(p['TREE_ARITY'])
+  levelBase    = [0]
+  for level in range(levels - 1):
+    levelBase += [levelBase[-1] + (treeDataSize << arityBits*(level+1))]
+  nodes          = (p['TREE_ARITY']**levels - 1) // (p['TREE_ARITY'] - 1)
+  cacheDataWidth = 8*MEAS_TREE_KEYSIZE if meas else p['DATASTREAM_DATA_WIDTH']
+  return {'TREE_DATA_SIZE':   treeDataSize,
+          'LEVELS':           levels,
+          'ARITY_BITS':       arityBits,
+          'LEVEL_BASE':       levelBase,
+          'TREE_SIZE':        nodes * p['TREE_ARITY'] * treeDataSize,
+          'IND_TREE_SIZE':    p['DATA_MEMORY_SIZE'] // p['TREE_ROOTS'],
+          'CACHE_DATA_WIDTH': cacheDataWidth,
+          'ALIGNMENT_WIDTH':  log2Ceil(cacheDataWidth // 8)}
+
+def treeNodeKeys(g,p,blocks):
+  # cache addresses of the tree elements which are visited for the data blocks
+  # (array of block numbers), one column per tree level starting at the top
+  offsets = blocks * p['DATA_BLOCK_SIZE']
+  roots   = offsets // g['IND_TREE_SIZE']
+  nodes   = (offsets - roots * g['IND_TREE_SIZE']) // p['DATA_BLOCK_SIZE']
+  starts  = p['MEMORY_START_ADDRESS'] + roots * g['TREE_SIZE']
+  levels  = g['LEVELS']
+  return np.stack([((starts + g['LEVEL_BASE'][level] + (nodes >> g['ARITY_BITS']*(levels-1-level)) * g['TREE_DATA_SIZE']) >> g['ALIGNMENT_WIDTH']) & ((1 << CACHE_ADDR_WIDTH) - 1) for level in range(levels)], axis=1)
+
+def traceBlocks(addresses,writes,sizes,p):
+  # the data blocks touched by the accesses (in order) and their write flags
+  offsets = np.mod(addresses - p['MEMORY_START_ADDRESS'], p['DATA_MEMORY_SIZE'])
+  first   = offsets // p['DATA_BLOCK_SIZE']
+  last    = np.minimum(offsets + np.maximum(sizes, 1) - 1, p['DATA_MEMORY_SIZE'] - 1) // p['DATA_BLOCK_SIZE']
+  counts  = last - first + 1
+  index   = np.repeat(np.arange(len(addresses)), counts)
+  blocks  = first[index] + np.arange(len(index)) - np.repeat(np.cumsum(counts) - counts, counts)
+  return blocks, writes[index]
+
+# lookups are sorted as packed 64-bit values: cache index, position in the
+# chunk, tag, tree level (5 bits), and write flag (1 bit)
+LOOKUP_FLAG_BITS = 6
+
+def cacheLookups(state,keys,flags,positions,size):
+  # Resolves the lookups (in trace order) of a direct mapped cache whose lines
+  # hold the tags in state (-1 is invalid). The lookups are sorted by their
+  # cache index and position, so a read hits when the previous lookup of its
+  # index (or the state for the first one) has the same tag. The state is
+  # updated in place and the levels of the hits are returned.
+  indexBits  = log2Ceil(size)
+  tagShift   = LOOKUP_FLAG_BITS
+  posShift   = tagShift + CACHE_ADDR_WIDTH - indexBits
+  indexShift = posShift + max(1, (len(keys) - 1).bit_length())
+  packed = np.sort(((keys & (size - 1)) << indexShift) | (positions << posShift) | ((keys >> indexBits) << tagShift) | flags)
+  index  = packed >> indexShift
+  tags   = (packed >> tagShift) & ((1 << (CACHE_ADDR_WIDTH - indexBits)) - 1)
+  same   = index[1:] == index[:-1]
+  first  = np.concatenate([[0], np.flatnonzero(~same) + 1])
+  last   = np.append(first[1:] - 1, len(index) - 1)
+  hit    = np.empty(len(index), dtype=bool)
+  hit[1:]    = same & (tags[1:] == tags[:-1])
+  hit[first] = state[index[first]] == tags[first]
+  hit       &= (packed & 1) == 0
+  state[index[last]] = tags[last]
+  return (packed[hit] >> 1) & ((1 << (LOOKUP_FLAG_BITS - 1)) - 1)
+
+def simulateNodeCache(chunks,optionsDict={},cacheSizes=[64, 128, 256, 512, 1024, 2048, 4096]):
+  # Simulates the direct mapped node cache for all cache sizes in a single
+  # pass over the trace (chunks of arrays, see traceChunks). Like in hardware,
+  # every visited tree element is written into the cache afterwards (reads
+  # store the verified element, writes invalidate it via ardelete and store
+  # the updated one). Only reads can hit. Addresses are taken modulo
+  # DATA_MEMORY_SIZE.
+  requireNumpy()
+  p = nodeCacheParameters(optionsDict)
+  g = treeGeometry(p)
+  levels = g['LEVELS']
+  states = [np.full(size, -1, dtype=np.int64) for size in cacheSizes]
+  hits   = [np.zeros(levels, dtype=np.int64) for size in cacheSizes]
+  reads  = 0
+  writes = 0
+  for addresses, accessWrites, sizes in chunks:
+    blocks, blockWrites = traceBlocks(addresses, accessWrites, sizes, p)
+    writes += int(np.count_nonzero(blockWrites))
+    reads  += len(blocks) - int(np.count_nonzero(blockWrites))
+    if levels == 0 or len(blocks) == 0:
+      continue
+    keys  = treeNodeKeys(g, p, blocks).reshape(-1)
+    flags = (np.tile(np.arange(levels, dtype=np.int64), len(blocks)) << 1) | np.repeat(blockWrites, levels)
+    positions = np.arange(len(keys), dtype=np.int64)
+    for state, size, levelHits in zip(states, cacheSizes, hits):
+      levelHits += np.bincount(cacheLookups(state, keys, flags, positions, size), minlength=levels)
+  return nodeCacheStatistics(p, g, cacheSizes, [[int(h) for h in levelHits] for levelHits in hits], reads, writes)
+
+def nodeCacheStatistics(p,g,cacheSizes,hits,reads,writes):
+  levels   = g['LEVELS']
+  nodeSize = p['TREE_ARITY'] * g['TREE_DATA_SIZE']
+  results  = []
+  for size, levelHits in zip(cacheSizes, hits):
+    totalHits = sum(levelHits)
+    # misses of reads and all elements of writes fetch the whole node, writes
+    # also store the updated path
+    readBytes = ((reads * levels - totalHits) + writes * levels) * nodeSize
+    requests  = reads + writes
+    results  += [{'CACHE_SIZE':             size,
+                  'CACHE_BITS':             size * (1 + CACHE_ADDR_WIDTH - log2Ceil(size) + g['CACHE_DATA_WIDTH']),
+                  'READS':                  reads,
+                  'WRITES':                 writes,
+                  'LOOKUPS':                requests * levels,
+                  'HITS':                   totalHits,
+                  'HIT_RATE':               totalHits / (reads * levels) if reads and levels else 0.0,
+                  'LEVEL_HIT_RATES':        [h / reads if reads else 0.0 for h in levelHits],
+                  'NODE_READ_BYTES':        readBytes,
+                  'NODE_WRITE_BYTES':       writes * levels * nodeSize,
+                  'NODE_BYTES_PER_REQUEST': (readBytes + writes * levels * nodeSize) / requests if requests else 0.0}]
+  return results
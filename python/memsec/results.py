@@ -0,0 +1,231 @@
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import collections
+import json
+import os
+import re
+import sqlite3
+import subprocess
+import time
+
+from . import binaryDirName
+
+# results of bitstream builds are stored in this database when not specified otherwise
+defaultResultsDb = os.environ.get('MEMSEC_RESULTS_DB', 'memsec_results.sqlite')
+
+TimingSummary    = collections.namedtuple('TimingSummary', ['WNS', 'TNS', 'WHS', 'THS', 'CLOCK', 'PERIOD', 'FMAX'])
+UtilizationEntry = collections.namedtuple('UtilizationEntry', ['INSTANCE', 'MODULE', 'DEPTH', 'LUTS', 'LOGIC_LUTS', 'LUTRAMS', 'SRLS', 'FFS', 'RAMB36', 'RAMB18', 'DSPS'])
+
+# column names of the hierarchical utilization report (differ between versions)
+UTILIZATION_COLUMNS = {'Total LUTs':   'LUTS',
+                       'Logic LUTs':   'LOGIC_LUTS',
+                       'LUTRAMs':      'LUTRAMS',
+                       'SRLs':         'SRLS',
+                       'FFs':          'FFS',
+                       'RAMB36':       'RAMB36',
+                       'RAMB18':       'RAMB18',
+                       'DSP48 Blocks': 'DSPS',
+                       'DSP Blocks':   'DSPS'}
+
+# resources which are compared between runs
+RESOURCES = ['LUTS', 'FFS', 'RAMB36', 'RAMB18', 'DSPS']
+
+def toNumber(value):
+  try:
+    return float(value)
+  except ValueError:
+    return None
+
+def parseTimingSummary(fileName):
+  # parses the "Design Timing Summary" and the first clock of the "Clock Summary"
+  # of a report generated by report_timing_summary
+  with open(fileName, 'r') as f:
+    lines = f.read().splitlines()
+  values = {}
+  clock  = (None, None)
+  for index, line in enumerate(lines):
+    if re.match(r'^\s*WNS\(ns\)\s+TNS\(ns\)', line) and not values:
+      header = re.split(r'\s{2,}', line.strip())
+      data   = next(l for l in lines[index+2:] if l.strip()).split()
+      values = {name: toNumber(value) for name, value in zip(header, data)}
+    elif re.match(r'^Clock\s+Waveform\(ns\)\s+Period\(ns\)', line) and clock[0] is None:
+      match = next((re.match(r'^\s*(\S+)\s+\{[^}]*\}\s+([\d.]+)', l) for l in lines[index+2:] if l.strip()), None)
+      if match:
+        clock = (match.group(1), float(match.group(2)))
+  if not values:
+    return None
+  wns  = values.get('WNS(ns)')
+  fmax = 1000.0 / (clock[1] - wns) if clock[1] is not None and wns is not None and clock[1] > wns else None
+  return TimingSummary(wns, values.get('TNS(ns)'), values.get('WHS(ns)'), values.get('THS(ns)'), clock[0], clock[1], fmax)
+
+def parseUtilization(fileName):
+  # parses the table of a report generated by report_utilization -hierarchical
+  # into one entry per instance, the instance path is joined with "/"
+  entries = []
+  header  = None
+  path    = []
+  with open(fileName, 'r') as f:
+    for line in f:
+      if not line.startswith('|'):
+        continue
+      cells = line.rstrip().split('|')[1:-1]
+      if cells[0].strip() == 'Instance':
+        header = [UTILIZATION_COLUMNS.get(cell.strip(), cell.strip()) for cell in cells]
+        continue
+      if not header:
+        continue
+      depth = (len(cells[0]) - len(cells[0].lstrip()) - 1) // 2
+      path  = path[:depth] + [cells[0].strip()]
+      row   = dict(zip(header, [cell.strip() for cell in cells]))
+      entries.append(UtilizationEntry('/'.join(path), row.get('Module'), depth, *[toNumber(row.get(column, '')) for column in UtilizationEntry._fields[3:]]))
+  return entries
+
+def parseBuildReports(res):
+  # Returns the timing and utilization of a build result. The reports of the
+  # implementation are preferred over the synthesis reports.
+  for step in ['impl', 'synth']:
+    prefix = os.path.join(res['BINARY_ROOT_DIR'], '{}-{}'.format(res['MODULE'], step))
+    if os.path.isfile(prefix + '_timing_summary.txt') and os.path.isfile(prefix + '_utilization.txt'):
+      return {'STEP': step, 'TIMING': parseTimingSummary(prefix + '_timing_summary.txt'), 'UTILIZATION': parseUtilization(prefix + '_utilization.txt')}
+  return None
+
+def currentCommit():
+  try:
+    commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+    dirty  = subprocess.call(['git', 'diff', '--quiet', 'HEAD'], stderr=subprocess.DEVNULL) != 0
+  except (OSError, subprocess.CalledProcessError):
+    return None, False
+  return commit, dirty
+
+def openResultsDb(dbFile=defaultResultsDb):
+  db = sqlite3.connect(dbFile)
+  db.row_factory = sqlite3.Row
+  db.executescript('''
+    CREATE TABLE IF NOT EXISTS runs (
+      id             INTEGER PRIMARY KEY AUTOINCREMENT,
+      commit_id      TEXT,
+      dirty          INTEGER,
+      timestamp      REAL,
+      module         TEXT,
+      options        TEXT,
+      step           TEXT,
+      return_code    INTEGER,
+      execution_time REAL,
+      wns            REAL,
+      tns            REAL,
+      whs            REAL,
+      ths            REAL,
+      clock          TEXT,
+      period         REAL,
+      fmax           REAL
+    );
+    CREATE TABLE IF NOT EXISTS utilization (
+      run_id     INTEGER REFERENCES runs(id),
+      instance   TEXT,
+      module     TEXT,
+      depth      INTEGER,
+      luts       REAL,
+      logic_luts REAL,
+      lutrams    REAL,
+      srls       REAL,
+      ffs        REAL,
+      ramb36     REAL,
+      ramb18     REAL,
+      dsps       REAL
+    );
+    CREATE INDEX IF NOT EXISTS runs_commit ON runs(commit_id, module, options);
+    CREATE INDEX IF NOT EXISTS utilization_run ON utilization(run_id);
+  ''')
+  return db
+
+def storeResults(resList,dbFile=defaultResultsDb,commit=None):
+  # stores the parsed reports of all builds in resList, returns the number of stored runs
+  commit, dirty = (commit, False) if commit else currentCommit()
+  stored = 0
+  db     = openResultsDb(dbFile)
+  with db:
+    for res in resList:
+      reports = parseBuildReports(res) if 'BINARY_ROOT_DIR' in res else None
+      if not reports or not reports['TIMING']:
+        continue
+      timing = reports['TIMING']
+      cursor = db.execute('INSERT INTO runs (commit_id, dirty, timestamp, module, options, step, return_code, execution_time, wns, tns, whs, ths, clock, period, fmax) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)',
+                          (commit, int(dirty), time.time(), res['MODULE'], json.dumps(res['OPTIONS'], sort_keys=True), reports['STEP'], res['RETURN_CODE'], res.get('CACHED_EXECUTION_TIME', res['EXECUTION_TIME'])) + tuple(timing))
+      db.executemany('INSERT INTO utilization VALUES (?,?,?,?,?,?,?,?,?,?,?,?)', [(cursor.lastrowid,) + tuple(entry) for entry in reports['UTILIZATION']])
+      stored += 1
+  db.close()
+  return stored
+
+def queryRuns(db,commit=None,module=None,instances=None,**options):
+  # Returns the latest run of every option set (optionally filtered by commit,
+  # module, and option values) together with the utilization of the top level
+  # and of all instances whose path or module contains one of instances.
+  query  = 'SELECT * FROM runs WHERE id IN (SELECT MAX(id) FROM runs'
+  where  = []
+  params = []
+  if commit:
+    where  += ['commit_id LIKE ?']
+    params += [commit + '%']
+  if module:
+    where  += ['module = ?']
+    params += [module]
+  if where:
+    query += ' WHERE ' + ' AND '.join(where)
+  query += ' GROUP BY commit_id, module, options) ORDER BY id'
+  runs = []
+  for row in db.execute(query, params):
+    run = {key.upper(): row[key] for key in row.keys()}
+    run['OPTIONS'] = json.loads(run['OPTIONS'])
+    if any(run['OPTIONS'].get(k) != v for k, v in options.items()):
+      continue
+    run['UTILIZATION'] = {}
+    for entry in db.execute('SELECT * FROM utilization WHERE run_id = ? ORDER BY rowid', (run['ID'],)):
+      if entry['depth'] == 0 or any(i in entry['instance'] or i == entry['module'] for i in instances or []):
+        run['UTILIZATION']['' if entry['depth'] == 0 else entry['instance']] = {r: entry[r.lower()] for r in RESOURCES}
+    runs.append(run)
+  return runs
+
+def relativeChange(base,new):
+  if base is None or new is None:
+    return None
+  if base == 0:
+    return 0.0 if new == 0 else float('inf')
+  return (new - base) / abs(base)
+
+def compareCommits(db,baseCommit,newCommit,instances=None,threshold=0.0):
+  # Compares the runs with identical options of two commits. A run is marked
+  # as regression when Fmax decreases or a resource increases by more than
+  # threshold (relative).
+  base        = {(r['MODULE'], json.dumps(r['OPTIONS'], sort_keys=True)): r for r in queryRuns(db, baseCommit, instances=instances)}
+  comparisons = []
+  for new in queryRuns(db, newCommit, instances=instances):
+    old = base.get((new['MODULE'], json.dumps(new['OPTIONS'], sort_keys=True)))
+    if not old:
+      continue
+    deltas      = {'FMAX': relativeChange(old['FMAX'], new['FMAX']), 'WNS': None if old['WNS'] is None or new['WNS'] is None else new['WNS'] - old['WNS']}
+    regressions = ['FMAX'] if deltas['FMAX'] is not None and deltas['FMAX'] < -threshold else []
+    for instance, resources in new['UTILIZATION'].items():
+      for resource, value in resources.items():
+        change = relativeChange(old['UTILIZATION'].get(instance, {}).get(resource), value)
+        deltas['{}{}'.format(instance + ':' if instance else '', resource)] = change
+        if change is not None and change > threshold:
+          regressions += ['{}{}'.format(instance + ':' if instance else '', resource)]
+    comparisons.append({'MODULE': new['MODULE'], 'OPTIONS': new['OPTIONS'], 'NAME': binaryDirName(new['OPTIONS']), 'BASE': old, 'NEW': new, 'DELTAS': deltas, 'REGRESSIONS': regressions})
+  return comparisons
@@ -0,0 +1,188 @@
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import asyncio
+import json
+import os
+import re
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from . import defaultEventsFile, flowBackend, waitForCommand
+from .flow import defaultFlowDriver, flowScript
+from .vivadoclient import SERVER_VARIABLE, clientVarString
+
+# steps printed by the flow (see printStep), e.g. "### memsec: simulating in batch mode"
+PHASE_PATTERN = re.compile(r'^### (\w+): (.+?)\s*$')
+
+# time between SIGTERM and SIGKILL when a job is stopped
+KILL_GRACE_PERIOD = 10
+
+LINE_LIMIT = 1 << 20
+
+eventsLock = threading.Lock()
+
+def writeEvent(fileName,event):
+  # events are appended as JSON lines, which is easy to tail into a dashboard
+  with eventsLock:
+    with open(fileName, 'a') as f:
+      f.write(json.dumps(event, sort_keys=True) + '\n')
+
+def parsePhase(line):
+  match = PHASE_PATTERN.match(line)
+  if not match or match.group(1) == 'WARNING':
+    return None
+  return match.group(1), match.group(2)
+
+async def readLines(reader):
+  while True:
+    try:
+      line = await reader.readuntil(b'\n')
+    except asyncio.IncompleteReadError as e:
+      line = e.partial
+    except asyncio.LimitOverrunError as e:
+      # the line exceeds the limit of the reader, pass it on in pieces
+      line = await reader.readexactly(e.consumed)
+    if not line:
+      return
+    yield line
+
+async def killProcessTree(process,waiter,gracePeriod=KILL_GRACE_PERIOD):
+  # The command runs in its own session, i.e., make, the shell scripts, and
+  # the tools started by them are stopped together via the process group.
+  for sig in [signal.SIGTERM, signal.SIGKILL]:
+    try:
+      os.killpg(process.pid, sig)
+    except ProcessLookupError:
+      return
+    try:
+      await asyncio.wait_for(asyncio.shield(waiter), gracePeriod)
+      return
+    except asyncio.TimeoutError:
+      pass
+
+async def runAsync(module,targets,binaryRootDir=None,envVars=[],logFile=None,timeout=None,onEvent=None,eventsFile=defaultEventsFile,driver=defaultFlowDriver):
+  # Runs make like run() but streams its output to detect the flow steps. The
+  # duration of every step is reported in PHASES and as events. When the
+  # timeout (in seconds) expires or the task is cancelled, the whole process
+  # tree is killed. Targets which are supported by the python flow driver
+  # (see flowScript) are run without make, the reported command stays the same.
+  envVars = envVars + [ "FLOW_MODULE=\"{}\"".format(module) ]
+  # while a vivado server is active, the flow uses its workers
+  if os.environ.get(SERVER_VARIABLE) and flowBackend() == 'vivado':
+    envVars += [ clientVarString() ]
+  if binaryRootDir:
+    envVars += [ "FLOW_BINARY_ROOT_DIR=\"{}\"".format(binaryRootDir) ]
+  command = ' '.join(envVars) + ' ' + ' '.join(['make'] + targets)
+  print("Running \"" + command + "\"...", flush=True)
+  script  = flowScript(module, targets, envVars, driver)
+  phases = []
+  start  = time.monotonic()
+
+  def emit(event, **fields):
+    event = dict(fields, EVENT=event, COMMAND=command, MODULE=module, BINARY_ROOT_DIR=binaryRootDir or '_build', TIME=time.time(), ELAPSED=time.monotonic()-start)
+    if eventsFile:
+      writeEvent(eventsFile, event)
+    if onEvent:
+      onEvent(event)
+
+  def finishPhase():
+    if phases and phases[-1]['DURATION'] is None:
+      phases[-1]['DURATION'] = time.monotonic() - start - phases[-1]['START']
+      emit('PHASE_END', PHASE=phases[-1]['PHASE'], PHASE_MODULE=phases[-1]['MODULE'], DURATION=phases[-1]['DURATION'])
+
+  async def stream(reader, output):
+    async for line in readLines(reader):
+      output.write(line)
+      output.flush()
+      phase = parsePhase(line.decode(errors='replace'))
+      if phase:
+        finishPhase()
+        phases.append({'MODULE': phase[0], 'PHASE': phase[1], 'START': time.monotonic()-start, 'DURATION': None})
+        emit('PHASE_START', PHASE=phase[1], PHASE_MODULE=phase[0])
+
+  loop    = asyncio.get_running_loop()
+  output  = sys.stdout.buffer
+  if logFile:
+    os.makedirs(os.path.dirname(os.path.abspath(logFile)), exist_ok=True)
+    output = open(logFile, 'wb')
+  timedOut = False
+  try:
+    emit('JOB_START', TARGETS=targets)
+    if script:
+      process = subprocess.Popen(script[0], shell=True, env=script[1], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, start_new_session=True)
+    else:
+      process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, start_new_session=True)
+    waiter  = loop.run_in_executor(None, waitForCommand, process)
+    reader  = asyncio.StreamReader(limit=LINE_LIMIT)
+    transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), process.stdout)
+    async def streamAndWait():
+      await stream(reader, output)
+      await asyncio.shield(waiter)
+    try:
+      await asyncio.wait_for(streamAndWait(), timeout)
+    except asyncio.TimeoutError:
+      timedOut = True
+      emit('TIMEOUT', TIMEOUT=timeout)
+      await killProcessTree(process, waiter)
+    except asyncio.CancelledError:
+      await killProcessTree(process, waiter)
+      raise
+    finally:
+      transport.close()
+    returncode, peakRss = await waiter
+  finally:
+    if logFile:
+      output.close()
+  end = time.monotonic()
+  finishPhase()
+  if timedOut:
+    print("Running \"" + command + "\"... TIMEOUT! (after {} s)".format(end-start), flush=True)
+  elif returncode != 0:
+    print("Running \"" + command + "\"... FAILED! (Return code = {}) {} s".format(returncode, end-start), flush=True)
+  else:
+    print("Running \"" + command + "\"... OK! {} s".format(end-start), flush=True)
+  res = {'COMMAND': command, 'RETURN_CODE': returncode, 'EXECUTION_TIME': end-start, 'ERROR': True if returncode != 0 or timedOut else False, 'PEAK_RSS': peakRss, 'PHASES': phases, 'TIMED_OUT': timedOut}
+  emit('JOB_END', RETURN_CODE=returncode, EXECUTION_TIME=end-start, TIMED_OUT=timedOut, PEAK_RSS=peakRss)
+  return res
+
+def phaseSummary(resList):
+  # total and maximum duration of every flow step over all runs
+  summary = {}
+  for res in resList:
+    for phase in res.get('PHASES', []):
+      entry = summary.setdefault(phase['PHASE'], {'COUNT': 0, 'TOTAL': 0.0, 'MAX': 0.0})
+      entry['COUNT'] += 1
+      entry['TOTAL'] += phase['DURATION']
+      entry['MAX']    = max(entry['MAX'], phase['DURATION'])
+  return summary
+
+def printPhaseSummary(resList):
+  summary = phaseSummary(resList)
+  if not summary:
+    return
+  print("")
+  print("------------------------------------------------------------------------------")
+  print("Flow steps:")
+  print("------------------------------------------------------------------------------")
+  for name, entry in sorted(summary.items(), key=lambda item: -item[1]['TOTAL']):
+    print("{:10.3f}s total {:10.3f}s max {:4}x {}".format(entry['TOTAL'], entry['MAX'], entry['COUNT'], name))
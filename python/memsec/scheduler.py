@@ -0,0 +1,101 @@
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import concurrent.futures
+import os
+
+from . import defaultCacheDir, groupBitStreamJobs, runBitStreamGroup
+from .executor import jobWorkspace
+from .history import DEFAULT_HISTORY_FILE, estimatedDuration, estimatedMemory, loadHistory, saveHistory, updateHistory
+
+GIB = 1024**3
+
+def physicalMemory():
+  return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+
+def oomKills():
+  # number of processes which have been killed by the kernel OOM killer so far
+  try:
+    with open('/proc/vmstat', 'r') as f:
+      for line in f:
+        if line.startswith('oom_kill '):
+          return int(line.split()[1])
+  except OSError:
+    pass
+  return 0
+
+def unitEstimates(history,group,defaultMemory,defaultDuration,implJobs):
+  # Strategies of a group are implemented concurrently (see implscb), which
+  # multiplies the memory requirement of the group.
+  memory   = max(estimatedMemory(history, job, defaultMemory) for job in group)
+  duration = max(estimatedDuration(history, job, defaultDuration) for job in group)
+  return memory * min(len(group), implJobs), duration
+
+def scheduleBitStreamJobs(jobs,maxInstances=1,totalMemory=None,defaultMemory=4*GIB,historyFile=DEFAULT_HISTORY_FILE,
+                          workspaceRoot='_scheduled',cacheDir=defaultCacheDir,maxRetries=2,implJobs=4,failFast=False):
+  # Runs the jobs with at most maxInstances concurrent Vivado instances while
+  # keeping the estimated memory consumption below totalMemory. Jobs with the
+  # longest expected duration are started first, and every job which fits into
+  # the remaining memory is started (first fit). Jobs which are killed by the
+  # OOM killer get a larger memory estimate and are queued again. With
+  # failFast, no further jobs are started after the first failure.
+  history     = loadHistory(historyFile)
+  totalMemory = totalMemory or physicalMemory()
+  groups      = groupBitStreamJobs(jobs)
+  known       = [estimatedDuration(history, job) for job in jobs if estimatedDuration(history, job) is not None]
+  estimates   = [unitEstimates(history, group, defaultMemory, max(known, default=0), implJobs) for group in groups]
+  memory      = {index: estimate[0] for index, estimate in enumerate(estimates)}
+  duration    = {index: estimate[1] for index, estimate in enumerate(estimates)}
+  queue       = sorted(range(len(groups)), key=lambda index: -duration[index])
+  retries     = {index: 0 for index in queue}
+  running     = {}
+  results     = {}
+  with concurrent.futures.ThreadPoolExecutor(max_workers=maxInstances) as executor:
+    while queue or running:
+      freeMemory = totalMemory - sum(memory[index] for index, oomCount in running.values())
+      for index in list(queue):
+        if len(running) >= maxInstances:
+          break
+        # a job which exceeds the total memory on its own is run exclusively
+        if memory[index] <= freeMemory or not running:
+          queue.remove(index)
+          freeMemory -= memory[index]
+          workspace   = jobWorkspace(workspaceRoot, index, groups[index][0])
+          future      = executor.submit(runBitStreamGroup, groups[index], workspace, os.path.join(workspace, 'output.log'), cacheDir)
+          running[future] = (index, oomKills())
+      done, pending = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+      for future in done:
+        index, oomCount = running.pop(future)
+        res     = future.result()
+        peakRss = max(r.get('PEAK_RSS', 0) for r in res)
+        failed  = any(r['RETURN_CODE'] != 0 for r in res)
+        killed  = not any(r.get('TIMED_OUT') for r in res) and (any(r['RETURN_CODE'] in [-9, 137] for r in res) or (failed and oomKills() > oomCount))
+        if killed and retries[index] < maxRetries:
+          retries[index] += 1
+          memory[index]   = max(memory[index] * 1.5, peakRss * min(len(groups[index]), implJobs))
+          print("Job {} has probably been killed by the OOM killer. Requeuing it with {:.1f} GiB.".format(index, memory[index] / GIB), flush=True)
+          queue = sorted(queue + [index], key=lambda index: -duration[index])
+          continue
+        for job, r in zip(groups[index], res):
+          updateHistory(history, job, r)
+        saveHistory(historyFile, history)
+        results[index] = res
+        if failFast and any(r['ERROR'] for r in res):
+          queue = []
+  return [r for index in sorted(results) for r in results[index]]
@@ -0,0 +1,150 @@
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import collections
+import concurrent.futures
+import glob
+import json
+import math
+import os
+import shutil
+import time
+
+from . import binaryDirName, cacheKey, cacheLookup, cacheStore, defaultCacheDir, jobOptions, merge_dicts, prepareJob, run, runJob, testJob
+from .executor import jobWorkspace
+from .history import recordHistory
+
+# Only the test benches of the primitives are batched. They are simulated in
+# seconds, so the compilation dominates. The slow pipeline test benches are
+# rather spread over the workers.
+BATCH_SIM_TOPS = ['tb_qarma', 'tb_ascon', 'tb_prince']
+
+def groupTestJobs(jobs,workers=1):
+  # Test jobs which only differ in their generics share the compiled design.
+  # Every group is split into at most workers parts, such that they can still
+  # run in parallel.
+  groups = collections.OrderedDict()
+  for job in jobs:
+    if job['BLOCK_DESIGN'] or job['TARGETS'] != ['hdlsb', 'clean'] or job['OPTIONS'].get('FLOW_SIM_TOP') not in BATCH_SIM_TOPS:
+      groups[id(job)] = [job]
+      continue
+    key = json.dumps([job['MODULE'], job['OPTIONS']], sort_keys=True, default=str)
+    groups.setdefault(key, []).append(job)
+  parts = []
+  for group in groups.values():
+    size   = int(math.ceil(len(group) / max(1, workers)))
+    parts += [group[index:index+size] for index in range(0, len(group), size)]
+  return parts
+
+def genericSet(job):
+  return ' '.join('{}={}'.format(k, v) for k, v in sorted(job['GENERICS'].items()))
+
+def variantBinaryDir(job,workspace):
+  name = binaryDirName(jobOptions(job)) or '_build'
+  return os.path.join(workspace, name) if workspace else name
+
+def collectVariantRun(job,groupRes,binaryRootDir,variantIndex,jobDir):
+  # Copy the artifacts of one variant to the names which are used by a
+  # regular simulation of the job.
+  module     = job['MODULE']
+  prefix     = os.path.join(binaryRootDir, '{}-variant_{}'.format(module, variantIndex))
+  returncode = groupRes['RETURN_CODE'] or 1
+  if os.path.isfile(prefix + '.status'):
+    with open(prefix + '.status', 'r') as f:
+      returncode = int(f.read().strip())
+  os.makedirs(jobDir, exist_ok=True)
+  artifacts = {fileName: module + fileName[len(prefix):] for fileName in glob.glob(prefix + '_*')}
+  if os.path.abspath(jobDir) != os.path.abspath(binaryRootDir):
+    for fileName in glob.glob(os.path.join(binaryRootDir, '*.log')):
+      artifacts[fileName] = os.path.basename(fileName)
+  for source, destination in artifacts.items():
+    shutil.copy2(source, os.path.join(jobDir, destination))
+  return {'COMMAND': groupRes['COMMAND'], 'RETURN_CODE': returncode, 'EXECUTION_TIME': groupRes['EXECUTION_TIME'], 'ERROR': returncode != 0, 'PEAK_RSS': groupRes.get('PEAK_RSS', 0),
+          'PHASES': groupRes.get('PHASES', []), 'TIMED_OUT': groupRes.get('TIMED_OUT', False)}
+
+def runTestGroup(jobs,workspace=None,logFile=None,cacheDir=defaultCacheDir):
+  # All jobs of a group only differ in their generics. The test bench is
+  # therefore compiled once and every generic set is elaborated and simulated
+  # as variant of the same design (see FLOW_SIM_GENERIC_SETS).
+  if len(jobs) == 1:
+    return [runJob(jobs[0], workspace, logFile, cacheDir)]
+  module   = jobs[0]['MODULE']
+  groupJob = dict(jobs[0], GENERICS={}, TARGETS=['hdlsbb', 'clean'])
+  binaryRootDir, files, varStrings = prepareJob(groupJob, workspace)
+  binaryRootDir = binaryRootDir or '_build'
+  results = [None] * len(jobs)
+  keys    = [None] * len(jobs)
+  if cacheDir:
+    for index, job in enumerate(jobs):
+      keys[index]    = cacheKey(job, files)
+      results[index] = cacheLookup(cacheDir, keys[index], variantBinaryDir(job, workspace))
+  pending = [index for index, res in enumerate(results) if not res]
+  if pending:
+    varStrings += ["{}FLOW_SIM_GENERIC_SETS=\"{}\"".format(module, ';'.join(genericSet(jobs[index]) for index in pending))]
+    # the batch gets the timeout of a single job (the largest one)
+    timeouts    = [jobs[index].get('TIMEOUT') for index in pending]
+    timeout     = max(timeouts) if all(timeouts) else None
+    start       = time.time()
+    groupRes    = run(module, groupJob['TARGETS'], binaryRootDir, varStrings, logFile, timeout)
+    for variantIndex, index in enumerate(pending):
+      results[index] = collectVariantRun(jobs[index], groupRes, binaryRootDir, variantIndex, variantBinaryDir(jobs[index], workspace))
+      results[index]['VARIANT_GROUP_SIZE'] = len(pending)
+      # the time of the batch is split evenly between its variants
+      results[index]['EXECUTION_TIME'] = groupRes['EXECUTION_TIME'] / len(pending)
+    # the per variant files must not end up in the cache entries
+    for fileName in glob.glob(os.path.join(binaryRootDir, module + '-variant_*')):
+      os.remove(fileName)
+    for index in pending:
+      if cacheDir and results[index]['RETURN_CODE'] == 0:
+        cacheStore(cacheDir, keys[index], results[index], variantBinaryDir(jobs[index], workspace), start)
+  for job, res in zip(jobs, results):
+    if job.get('EXPECTED_ERROR'):
+      res['ERROR'] = not res['ERROR']
+  return [merge_dicts(res, { 'OPTIONS': jobOptions(job), 'MODULE': module, 'BINARY_ROOT_DIR': variantBinaryDir(job, workspace) }) for job, res in zip(jobs, results)]
+
+def runTestJobs(jobs,workers=1,workspaceRoot='_parallel',cacheDir=defaultCacheDir,failFast=False,historyFile=None):
+  # Groups are simulated one after another or, with multiple workers, in
+  # parallel inside their own workspaces. With failFast, no further groups are
+  # started after the first failure. The results are returned in group order.
+  workers = workers or os.cpu_count() or 1
+  groups  = groupTestJobs(jobs, workers)
+  results = [None] * len(groups)
+  def record(index,res):
+    for job, r in zip(groups[index], res):
+      recordHistory(historyFile, job, r)
+    results[index] = res
+    return failFast and any(r['ERROR'] for r in res)
+  if workers == 1:
+    for index, group in enumerate(groups):
+      if record(index, runTestGroup(group, cacheDir=cacheDir)):
+        break
+  else:
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+      futures = collections.OrderedDict()
+      for index, group in enumerate(groups):
+        workspace = jobWorkspace(workspaceRoot, index, group[0])
+        futures[executor.submit(runTestGroup, group, workspace, os.path.join(workspace, 'output.log'), cacheDir)] = index
+      for future in concurrent.futures.as_completed(futures):
+        if not future.cancelled() and record(futures[future], future.result()):
+          for other in futures:
+            other.cancel()
+  return [r for res in results if res for r in res]
+
+def runTests(module,genericsDictList=[{}],optionsDict={},cacheDir=defaultCacheDir):
+  return runTestJobs([testJob(module,genericsDict,optionsDict) for genericsDict in genericsDictList], cacheDir=cacheDir)
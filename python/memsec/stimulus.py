@@ -0,0 +1,100 @@
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import math
+import os
+
+try:
+  import numpy as np
+except ImportError:
+  # only the stimulus generation depends on numpy
+  np = None
+
+from . import merge_dicts
+from .benchmark import benchmarkJob
+from .nodecache import traceChunks
+
+# The stimulus of tb_rw_blockram consists of one little-endian 64-bit record
+# per AXI transaction: the address in bits 31..0, the AXI burst length (beats
+# - 1) in bits 39..32, the AXI burst type in bits 41..40, and bit 63 marks
+# writes.
+STIMULUS_RECORD_SIZE = 8
+STIMULUS_BURST_INCR  = 1
+STIMULUS_BURST_WRAP  = 2
+STIMULUS_CHUNK_SIZE  = 1 << 20
+
+# AXI bursts must neither cross a 4KB boundary nor exceed 256 beats
+AXI_BOUNDARY  = 4096
+AXI_MAX_BEATS = 256
+
+def stimulusParameters(optionsDict):
+  # defaults of tb_rw_blockram
+  return {'MEMORY_START_ADDRESS': optionsDict.get('MEMORY_START_ADDRESS', 0x40000000),
+          'DATA_MEMORY_SIZE':     optionsDict.get('DATA_MEMORY_SIZE', 8192),
+          'BEAT_BYTES':           optionsDict.get('C_S_AXI_DATA_WIDTH', 64) // 8}
+
+def stimulusRecords(addresses,writes,sizes,p):
+  # Converts accesses into AXI transactions. Addresses are taken modulo
+  # DATA_MEMORY_SIZE and accesses without size are single beats. An access of
+  # 2, 4, 8, or 16 beats which is not aligned to its size becomes a wrapping
+  # burst (i.e., a critical word first cache line fill). All other accesses
+  # become incrementing bursts which are split at 4KB boundaries, after 256
+  # beats, and at the end of the memory.
+  beat    = p['BEAT_BYTES']
+  granule = math.gcd(AXI_BOUNDARY, AXI_MAX_BEATS * beat, p['DATA_MEMORY_SIZE'])
+  offsets = np.mod(addresses - p['MEMORY_START_ADDRESS'], p['DATA_MEMORY_SIZE'])
+  sizes   = np.maximum(sizes, 1)
+  start   = offsets - offsets % beat
+  end     = (offsets + sizes + beat - 1) // beat * beat
+  lines   = sizes // beat
+  wrap    = (sizes % beat == 0) & np.isin(lines, [2, 4, 8, 16]) & (offsets % sizes != 0)
+  first   = start // granule
+  pieces  = np.where(wrap, 1, (end - 1) // granule - first + 1)
+  index   = np.repeat(np.arange(len(addresses)), pieces)
+  piece   = np.arange(len(index)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+  wrap    = wrap[index]
+  first   = first[index] + piece
+  pStart  = np.where(wrap, start[index], np.maximum(start[index], first * granule))
+  pEnd    = np.where(wrap, start[index] + sizes[index], np.minimum(end[index], (first + 1) * granule))
+  records  = (p['MEMORY_START_ADDRESS'] + pStart % p['DATA_MEMORY_SIZE']).astype(np.uint64)
+  records |= ((pEnd - pStart) // beat - 1).astype(np.uint64) << np.uint64(32)
+  records |= np.where(wrap, STIMULUS_BURST_WRAP, STIMULUS_BURST_INCR).astype(np.uint64) << np.uint64(40)
+  records |= writes[index].astype(np.uint64) << np.uint64(63)
+  return records
+
+def writeStimulus(traceFile,fileName,optionsDict={},chunkSize=STIMULUS_CHUNK_SIZE):
+  # returns the number of transactions
+  p     = stimulusParameters(optionsDict)
+  count = 0
+  with open(fileName, 'wb') as f:
+    for addresses, writes, sizes in traceChunks(traceFile, chunkSize):
+      records = stimulusRecords(addresses, writes, sizes, p)
+      records.astype('<u8').tofile(f)
+      count += len(records)
+  return count
+
+def stimulusFileName(directory,simTop='tb_rw_blockram'):
+  # the test bench reads <ENTITY_NAME>_stimulus.bin from the simulation directory
+  return os.path.abspath(os.path.join(directory, '{}_stimulus.bin'.format(simTop)))
+
+def stimulusJob(module,fileName,count,genericsDict={},optionsDict={}):
+  # replays the stimulus in benchmark mode, i.e., the cycles of every
+  # transaction are logged
+  options = merge_dicts(optionsDict, {'FLOW_SIM_TOP': 'tb_rw_blockram', 'FLOW_SIM_FILES': os.path.abspath(fileName)})
+  return benchmarkJob(module, merge_dicts(genericsDict, {'STIMULUS': count}), options)
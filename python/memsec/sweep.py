@@ -0,0 +1,77 @@
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import itertools
+import json
+
+from . import merge_dicts, testJob
+
+# A sweep specification is a dictionary with the following keys:
+#   MODULE  module which is built or simulated
+#   JOB     function which creates a job from (module, generics, options),
+#           e.g., testJob (default), benchmarkJob, or bitStreamJob
+#   FIXED   parameters which are shared by all jobs
+#   AXES    list of axes whose Cartesian product is swept. An axis is either
+#           a dictionary of value lists which are zipped (e.g.,
+#           {'CRYPTO_CONFIG': [3,4], 'BLOCKS_PER_SECTOR': [4,2]}) or a list of
+#           parameter dictionaries.
+#   WHERE   list of predicates on the parameters of a job, all of which have
+#           to hold for the job to be included
+# Parameters starting with FLOW_ and the DATASTREAM_DATA_WIDTH are options,
+# everything else is a generic.
+
+def isOption(name):
+  return name.startswith('FLOW_') or name == 'DATASTREAM_DATA_WIDTH'
+
+def axisPoints(axis):
+  if isinstance(axis, dict):
+    lengths = set(len(values) for values in axis.values())
+    if len(lengths) > 1:
+      raise ValueError("The zipped parameters {} have different lengths.".format(sorted(axis.keys())))
+    return [dict(zip(axis.keys(), values)) for values in zip(*axis.values())]
+  return list(axis)
+
+def expandSweep(spec):
+  # lazily yields the parameters of every point of the sweep
+  axes = [axisPoints(axis) for axis in spec.get('AXES', [])]
+  for points in itertools.product(*axes):
+    parameters = merge_dicts(spec.get('FIXED', {}), *points)
+    if all(predicate(parameters) for predicate in spec.get('WHERE', [])):
+      yield parameters
+
+def jobKey(job):
+  # jobs which pass the same variables to the flow are equivalent
+  return json.dumps([job['MODULE'], job['TARGETS'], job['BLOCK_DESIGN'],
+                     {k: str(v) for k,v in job['GENERICS'].items()}, {k: str(v) for k,v in job['OPTIONS'].items()}], sort_keys=True)
+
+def sweepJobs(*specs):
+  # Yields the jobs of all specifications without duplicates. Only the keys
+  # of the jobs are kept in memory, i.e., the sweeps can be streamed into
+  # streamJobs.
+  seen = set()
+  for spec in specs:
+    jobFunction = spec.get('JOB', testJob)
+    for parameters in expandSweep(spec):
+      genericsDict = {k: v for k,v in parameters.items() if not isOption(k)}
+      optionsDict  = {k: v for k,v in parameters.items() if isOption(k)}
+      job = jobFunction(spec['MODULE'], genericsDict, optionsDict)
+      key = jobKey(job)
+      if key not in seen:
+        seen.add(key)
+        yield job
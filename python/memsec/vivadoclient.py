@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+
+# Stand-in for the vivado binary which forwards "vivado -mode batch -source
+# <script>" calls of the flow to the persistent workers of a vivado server
+# (see vivadoserver.py). All other calls and calls without a reachable server
+# execute the real binary. This file only depends on the standard library as
+# it is executed directly by the flow scripts.
+
+import json
+import os
+import shlex
+import socket
+import sys
+
+SERVER_VARIABLE = 'MEMSEC_VIVADO_SERVER'
+BINARY_VARIABLE = 'MEMSEC_VIVADO_BINARY'
+EXIT_MARKER     = b'@@MEMSEC_EXIT '
+
+# options of a batch call which the workers handle implicitly
+IGNORED_OPTIONS = ['-nojournal', '-nolog', '-notrace']
+
+def clientVarString():
+  # makes the flow use this client instead of the vivado binary
+  return "FLOW_VIVADO_BINARY=\"{} {}\"".format(sys.executable, os.path.abspath(__file__))
+
+def batchScript(args):
+  # returns the sourced script if args describe a plain batch call
+  script = None
+  mode   = None
+  while args:
+    if args[0] in IGNORED_OPTIONS:
+      args = args[1:]
+    elif args[0] == '-mode' and len(args) > 1:
+      mode, args = args[1], args[2:]
+    elif args[0] == '-source' and len(args) > 1 and script is None:
+      script, args = args[1], args[2:]
+    else:
+      return None
+  return os.path.abspath(script) if mode == 'batch' and script else None
+
+def forward(socketPath,script):
+  # Streams the output of the script and returns its exit code. None is
+  # returned when the server is not reachable.
+  try:
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.connect(socketPath)
+  except OSError:
+    return None
+  with connection:
+    request = {'CWD': os.getcwd(), 'ENV': dict(os.environ), 'SCRIPT': script}
+    connection.sendall(json.dumps(request).encode() + b'\n')
+    output = sys.stdout.buffer
+    for line in connection.makefile('rb'):
+      if line.startswith(EXIT_MARKER):
+        output.flush()
+        return int(line[len(EXIT_MARKER):])
+      output.write(line)
+      output.flush()
+  print("The connection to the vivado server was lost.", flush=True)
+  return 1
+
+def main(args):
+  socketPath = os.environ.get(SERVER_VARIABLE)
+  script     = batchScript(args)
+  if socketPath and script:
+    code = forward(socketPath, script)
+    if code is not None:
+      return code
+  binary = shlex.split(os.environ.get(BINARY_VARIABLE, 'vivado'))
+  os.execvp(binary[0], binary + args)
+
+if __name__ == '__main__':
+  sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,188 @@
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import asyncio
+import functools
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import tempfile
+import threading
+
+from .runner import LINE_LIMIT, killProcessTree, readLines
+from .vivadoclient import BINARY_VARIABLE, EXIT_MARKER, SERVER_VARIABLE
+
+# Every vivado call of the flow starts a new vivado process, which opens the
+# project again. The server keeps a pool of vivado workers running
+# flow/vivado/server.tcl instead. The flow scripts reach it via vivadoclient.py,
+# which is used as FLOW_VIVADO_BINARY while the server is active (see runAsync).
+
+SERVER_SCRIPT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'flow', 'vivado', 'server.tcl'))
+READY_MARKER  = b'@@MEMSEC_READY'
+DONE_MARKER   = b'@@MEMSEC_DONE '
+
+# workers are replaced after this many requests to bound the memory growth of
+# long running vivado processes
+WORKER_MAX_REQUESTS = 50
+WORKER_STOP_TIMEOUT = 30
+
+TCL_ESCAPES = dict({c: '\\' + c for c in ' \\{}[]$";'}, **{'\n': '\\n', '\r': '\\r', '\t': '\\t'})
+
+def tclList(values):
+  # every element is escaped, i.e., the list always fits into one line
+  return ' '.join(''.join(TCL_ESCAPES.get(c, c) for c in str(v)) or '{}' for v in values)
+
+async def startWorker(pool):
+  process = await asyncio.create_subprocess_exec(*shlex.split(pool['BINARY']), '-nojournal', '-nolog', '-mode', 'batch', '-source', SERVER_SCRIPT,
+                                                 stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, start_new_session=True, limit=LINE_LIMIT)
+  worker = {'PROCESS': process, 'REQUESTS': 0, 'BUSY': False}
+  pool['WORKERS'].append(worker)
+  async for line in readLines(process.stdout):
+    if line.rstrip() == READY_MARKER:
+      return worker
+  await stopWorker(pool, worker)
+  raise RuntimeError("The vivado worker \"{}\" exited during startup (Return code = {}).".format(pool['BINARY'], process.returncode))
+
+async def stopWorker(pool,worker,timeout=WORKER_STOP_TIMEOUT):
+  # an idle worker exits at the end of its input, a busy one is killed
+  process = worker['PROCESS']
+  if process.returncode is None:
+    waiter = asyncio.ensure_future(process.wait())
+    process.stdin.close()
+    try:
+      await asyncio.wait_for(asyncio.shield(waiter), timeout)
+    except asyncio.TimeoutError:
+      await killProcessTree(process, waiter)
+  if worker in pool['WORKERS']:
+    pool['WORKERS'].remove(worker)
+
+def releaseWorker(pool,worker):
+  # Broken and worn out workers are replaced right away, i.e., the startup
+  # does not delay the next request.
+  if worker and worker['PROCESS'].returncode is None and worker['REQUESTS'] < pool['MAX_REQUESTS']:
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(worker)
+    pool['IDLE'].put_nowait(future)
+    return
+  if worker:
+    asyncio.ensure_future(stopWorker(pool, worker, 0 if worker['BUSY'] else WORKER_STOP_TIMEOUT))
+  pool['IDLE'].put_nowait(asyncio.ensure_future(startWorker(pool)))
+
+async def runRequest(pool,request,reader,writer):
+  try:
+    worker = await (await pool['IDLE'].get())
+  except Exception as e:
+    releaseWorker(pool, None)
+    writer.write('{}\n'.format(e).encode())
+    return 1
+  pool['REQUESTS']  += 1
+  worker['REQUESTS'] += 1
+  worker['BUSY']      = True
+  process     = worker['PROCESS']
+  environment = tclList(v for item in sorted(request['ENV'].items()) for v in item)
+  done        = DONE_MARKER + str(pool['REQUESTS']).encode() + b' '
+
+  async def stream():
+    process.stdin.write(tclList(['run', pool['REQUESTS'], request['CWD'], environment, request['SCRIPT']]).encode() + b'\n')
+    await process.stdin.drain()
+    async for line in readLines(process.stdout):
+      if line.startswith(done):
+        return int(line[len(done):])
+      writer.write(line)
+      await writer.drain()
+    return None
+
+  # a script cannot be interrupted, the worker is killed when the client
+  # (e.g., a job which timed out) goes away
+  streaming = asyncio.ensure_future(stream())
+  gone      = asyncio.ensure_future(reader.read())
+  await asyncio.wait([streaming, gone], return_when=asyncio.FIRST_COMPLETED)
+  gone.cancel()
+  code = None
+  if streaming.done() and not streaming.exception():
+    code = streaming.result()
+  else:
+    streaming.cancel()
+  if code is not None:
+    worker['BUSY'] = False
+  releaseWorker(pool, worker)
+  if code is None:
+    writer.write(b"The vivado worker has been stopped.\n")
+    return 1
+  return code
+
+async def serveClient(pool,reader,writer):
+  try:
+    request = json.loads(await reader.readline())
+    code    = await runRequest(pool, request, reader, writer)
+    writer.write(EXIT_MARKER + str(code).encode() + b'\n')
+    await writer.drain()
+  except (ConnectionError, ValueError):
+    pass
+  finally:
+    writer.close()
+
+async def startPool(pool,workers):
+  pool['IDLE'] = asyncio.Queue()
+  for index in range(workers):
+    pool['IDLE'].put_nowait(asyncio.ensure_future(startWorker(pool)))
+  pool['SERVER'] = await asyncio.start_unix_server(functools.partial(serveClient, pool), pool['SOCKET'], limit=LINE_LIMIT)
+
+async def stopPool(pool):
+  pool['SERVER'].close()
+  await pool['SERVER'].wait_closed()
+  while not pool['IDLE'].empty():
+    pool['IDLE'].get_nowait().cancel()
+  await asyncio.gather(*[stopWorker(pool, worker) for worker in list(pool['WORKERS'])])
+
+def startVivadoServer(workers=1,binary=None,socketPath=None,maxRequests=WORKER_MAX_REQUESTS):
+  # Starts the workers in the background and serves the flow on a unix
+  # socket. Jobs which are run by this process afterwards use the workers
+  # until stopVivadoServer is called. Other processes use them when the
+  # environment variables MEMSEC_VIVADO_SERVER and MEMSEC_VIVADO_BINARY are
+  # set like in os.environ.
+  binary = binary or os.environ.get(BINARY_VARIABLE) or os.environ.get('FLOW_VIVADO_BINARY') or 'vivado'
+  tmpDir = None
+  if not socketPath:
+    tmpDir     = tempfile.mkdtemp(prefix='memsec_vivado_')
+    socketPath = os.path.join(tmpDir, 'server.sock')
+  loop   = asyncio.new_event_loop()
+  server = {'BINARY': binary, 'SOCKET': os.path.abspath(socketPath), 'TMP_DIR': tmpDir, 'MAX_REQUESTS': maxRequests, 'REQUESTS': 0, 'WORKERS': [], 'LOOP': loop,
+            'THREAD': threading.Thread(target=loop.run_forever, daemon=True)}
+  server['THREAD'].start()
+  asyncio.run_coroutine_threadsafe(startPool(server, workers), loop).result()
+  os.environ[SERVER_VARIABLE] = server['SOCKET']
+  os.environ[BINARY_VARIABLE] = binary
+  print("Started {} vivado worker(s) serving {}.".format(workers, server['SOCKET']), flush=True)
+  return server
+
+def stopVivadoServer(server):
+  if os.environ.get(SERVER_VARIABLE) == server['SOCKET']:
+    del os.environ[SERVER_VARIABLE]
+  asyncio.run_coroutine_threadsafe(stopPool(server), server['LOOP']).result()
+  server['LOOP'].call_soon_threadsafe(server['LOOP'].stop)
+  server['THREAD'].join()
+  server['LOOP'].close()
+  if server['TMP_DIR']:
+    shutil.rmtree(server['TMP_DIR'], ignore_errors=True)
+  elif os.path.exists(server['SOCKET']):
+    os.remove(server['SOCKET'])
+  print("Stopped the vivado server after {} request(s).".format(server['REQUESTS']), flush=True)
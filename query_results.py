@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "python"))
+from memsec import *
+
+def formatValue(value, fmt='{:.3f}'):
+  return '-' if value is None else fmt.format(value)
+
+def formatChange(value):
+  return '-' if value is None else '{:+.1f}%'.format(100*value)
+
+parser = argparse.ArgumentParser(description='Query the results of bitstream builds.')
+parser.add_argument('--db', default=defaultResultsDb, help='results database (default: {})'.format(defaultResultsDb))
+parser.add_argument('--instance', action='append', default=[], help='also show instances whose path or module contains this name (e.g., node_cache)')
+subparsers = parser.add_subparsers(dest='command')
+listParser = subparsers.add_parser('list', help='list the latest run of every configuration')
+listParser.add_argument('--commit', help='only show runs of this commit')
+listParser.add_argument('--module', help='only show runs of this module')
+compareParser = subparsers.add_parser('compare', help='compare the runs of two commits and report regressions')
+compareParser.add_argument('base', help='base commit')
+compareParser.add_argument('new', nargs='?', default='HEAD', help='new commit (default: HEAD)')
+compareParser.add_argument('--threshold', type=float, default=0.01, help='relative change which is reported as regression (default: 0.01)')
+args = parser.parse_args()
+
+def resolveCommit(ref):
+  try:
+    return subprocess.check_output(['git', 'rev-parse', ref], stderr=subprocess.DEVNULL).decode().strip()
+  except subprocess.CalledProcessError:
+    return ref
+
+db = openResultsDb(args.db)
+if args.command == 'compare':
+  regressions = 0
+  for comparison in compareCommits(db, resolveCommit(args.base), resolveCommit(args.new), args.instance, args.threshold):
+    status = 'REGRESSION!' if comparison['REGRESSIONS'] else 'OK!'
+    print("{:11s} {} Fmax {} -> {} MHz ({})".format(status, comparison['NAME'], formatValue(comparison['BASE']['FMAX']), formatValue(comparison['NEW']['FMAX']), formatChange(comparison['DELTAS']['FMAX'])))
+    for name in comparison['REGRESSIONS']:
+      if name != 'FMAX':
+        print("            {}: {}".format(name, formatChange(comparison['DELTAS'][name])))
+    regressions += 1 if comparison['REGRESSIONS'] else 0
+  sys.exit(1 if regressions else 0)
+else:
+  for run in queryRuns(db, getattr(args, 'commit', None), getattr(args, 'module', None), args.instance):
+    print("{} {} {} WNS={} ns Fmax={} MHz".format(run['COMMIT_ID'][:8] if run['COMMIT_ID'] else '-', run['MODULE'], binaryDirName(run['OPTIONS']), formatValue(run['WNS']), formatValue(run['FMAX'])))
+    for instance, resources in run['UTILIZATION'].items():
+      print("    {:40s} {}".format(instance or '(top)', ' '.join('{}={}'.format(r, formatValue(v, '{:g}')) for r, v in resources.items())))
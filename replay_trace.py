@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "python"))
+from memsec import *
+
+parser = argparse.ArgumentParser(description='Replay a memory access trace through tb_rw_blockram and measure every configuration.')
+parser.add_argument('trace', help='trace file (*.bin: 64-bit little-endian words with bit 63 marking writes, otherwise lines of "R|W <address> [<size>]")')
+parser.add_argument('--output-dir', default='_stimulus', help='the stimulus file is written into this directory')
+parser.add_argument('--memory-size', type=int, help='DATA_MEMORY_SIZE of the test bench, addresses are taken modulo this size (default: 8192)')
+parser.add_argument('--base-address', type=lambda x: int(x, 0), default=0x40000000, help='base address of the protected memory')
+parser.add_argument('--crypto-configs', type=int, nargs='+', help='only replay the trace for these CRYPTO_CONFIGs')
+parser.add_argument('--simulate', action='store_true', help='replay the stimulus for every configuration')
+parser.add_argument('-j', '--jobs', type=int, default=1, help='number of simulations which are run in parallel (0 = number of cores)')
+parser.add_argument('--cache-dir', default=defaultCacheDir, help='cache the results of successful simulations in this directory (default: $MEMSEC_CACHE_DIR)')
+parser.add_argument('--bin-width', type=int, default=4, help='width of the latency histogram bins in cycles')
+args = parser.parse_args()
+
+module   ='memsec'
+generics = {'DATA_MEMORY_SIZE': args.memory_size} if args.memory_size else {}
+options  = merge_dicts(generics, {'MEMORY_START_ADDRESS': args.base_address})
+
+os.makedirs(args.output_dir, exist_ok=True)
+fileName = stimulusFileName(args.output_dir)
+start    = timeit.default_timer()
+count    = writeStimulus(args.trace, fileName, options)
+end      = timeit.default_timer()
+print("{} transactions ({:.0f} transactions/s) {}".format(count, count/(end-start) if end > start else 0, fileName), flush=True)
+
+if not args.simulate or count == 0:
+  sys.exit(0)
+
+def stimulus(module,genericsDict={},optionsDict={}):
+  return stimulusJob(module, fileName, count, genericsDict, optionsDict)
+
+specs = [{'MODULE': module, 'JOB': stimulus, 'FIXED': generics,
+          'AXES': [[{'CRYPTO_CONFIG': 0,'BLOCKS_PER_SECTOR': 1},
+                    {'CRYPTO_CONFIG': 1,'DATA_BLOCK_SIZE': 32},
+                    {'CRYPTO_CONFIG': 2,'TREE_ROOTS': 1,'TREE_ARITY': 8,'DATA_BLOCK_SIZE': 64}] +
+                   [{'CRYPTO_CONFIG': c,'BLOCKS_PER_SECTOR': b} for c, b in zip([3,5,7,4,6,8], [4,4,4,2,2,2])] +
+                   [{'CRYPTO_CONFIG': c,'TREE_ROOTS': 1,'TREE_ARITY': 4,'DATA_BLOCK_SIZE': 64} for c in [9,10]]],
+          'WHERE': [lambda p: not args.crypto_configs or p['CRYPTO_CONFIG'] in args.crypto_configs]}]
+
+if args.jobs == 1:
+  res = [runJob(job, cacheDir=args.cache_dir) for job in sweepJobs(*specs)]
+else:
+  res = runJobs(sweepJobs(*specs), args.jobs, cacheDir=args.cache_dir)
+analyzeBenchmarks(res, args.bin_width)
+printBenchmarkSummary(res)
+sys.exit(printSummary(res))
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import argparse
+import csv
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "python"))
+from memsec import *
+
+parser = argparse.ArgumentParser(description='Measure the transaction latency and throughput of the memsec pipelines.')
+parser.add_argument('-j', '--jobs', type=int, default=1, help='number of simulations which are run in parallel (0 = number of cores)')
+parser.add_argument('--cache-dir', default=defaultCacheDir, help='cache the results of successful simulations in this directory (default: $MEMSEC_CACHE_DIR)')
+parser.add_argument('--iterations', type=int, default=200, help='number of read-write-read iterations per configuration')
+parser.add_argument('--bin-width', type=int, default=4, help='width of the latency histogram bins in cycles')
+parser.add_argument('--histograms', action='store_true', help='print the latency histogram of every configuration')
+parser.add_argument('--csv', help='write the statistics of every configuration into this file')
+args = parser.parse_args()
+
+module ='memsec'
+fixed  = {'SIMULATION_ITERATIONS': args.iterations}
+specs  = []
+
+specs += [{'MODULE': module, 'JOB': benchmarkJob, 'FIXED': fixed,
+           'AXES': [[{'CRYPTO_CONFIG': 0,'BLOCKS_PER_SECTOR': 1},
+                     {'CRYPTO_CONFIG': 1,'DATA_BLOCK_SIZE': 32},
+                     {'CRYPTO_CONFIG': 2,'TREE_ROOTS': 1,'TREE_ARITY': 8,'DATA_BLOCK_SIZE': 64}]]}]
+specs += [{'MODULE': module, 'JOB': benchmarkJob, 'FIXED': fixed,
+           'AXES': [{'CRYPTO_CONFIG': [3,5,7,4,6,8], 'BLOCKS_PER_SECTOR': [4,4,4,2,2,2]}]}]
+specs += [{'MODULE': module, 'JOB': benchmarkJob, 'FIXED': merge_dicts(fixed, {'TREE_ROOTS': 1,'DATA_BLOCK_SIZE': 64}),
+           'AXES': [{'CRYPTO_CONFIG': [9,10]}, {'TREE_ARITY': [2,4,8]}, [{}, {'DATASTREAM_DATA_WIDTH': 128}]]}]
+
+if args.jobs == 1:
+  res = [runJob(job, cacheDir=args.cache_dir) for job in sweepJobs(*specs)]
+else:
+  res = runJobs(sweepJobs(*specs), args.jobs, cacheDir=args.cache_dir)
+analyzeBenchmarks(res, args.bin_width)
+
+if args.histograms:
+  for r in res:
+    if r['BENCHMARK']:
+      print("")
+      print("{} {}".format(binaryDirName(r['OPTIONS']), r['OPTIONS']))
+      print(histogramString(r['BENCHMARK']['ALL']['HISTOGRAM']))
+
+if args.csv:
+  with open(args.csv, 'w', newline='') as f:
+    writer = csv.writer(f)
+    writer.writerow(['CRYPTO_CONFIG', 'DATA_BLOCK_SIZE', 'TREE_ARITY', 'DATASTREAM_DATA_WIDTH', 'TYPE', 'COUNT', 'LATENCY_MIN', 'LATENCY_MEAN', 'LATENCY_MAX'] + ['P{}'.format(p) for p in BENCHMARK_PERCENTILES] + ['BYTES_PER_CYCLE', 'BYTES_PER_BUSY_CYCLE'])
+    for r in res:
+      for kind, stats in sorted(r['BENCHMARK'].items()):
+        writer.writerow([r['OPTIONS'].get(k, '') for k in ['CRYPTO_CONFIG', 'DATA_BLOCK_SIZE', 'TREE_ARITY', 'DATASTREAM_DATA_WIDTH']] +
+                        [kind, stats['COUNT'], stats['LATENCY_MIN'], stats['LATENCY_MEAN'], stats['LATENCY_MAX']] +
+                        [stats['PERCENTILES'][p] for p in BENCHMARK_PERCENTILES] + [stats['BYTES_PER_CYCLE'], stats['BYTES_PER_BUSY_CYCLE']])
+
+printBenchmarkSummary(res)
+sys.exit(printSummary(res))
@@ -18,28 +18,46 @@
 # You should have received a copy of the GNU General Public License
 # along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
 
+import argparse
 import os
-import re
 import sys
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "python"))
 from memsec import *
 
+parser = argparse.ArgumentParser(description='Run the memsec test matrix.')
+parser.add_argument('-j', '--jobs', type=int, default=1, help='number of tests which are run in parallel (0 = number of cores)')
+parser.add_argument('--cache-dir', default=defaultCacheDir, help='cache the results of successful tests in this directory (default: $MEMSEC_CACHE_DIR)')
+parser.add_argument('--timeout', type=float, help='stop tests which take longer than this many seconds')
+parser.add_argument('--no-batch', action='store_true', help='simulate every generic combination separately instead of as variant of one compiled test bench')
+parser.add_argument('--history-file', default=DEFAULT_HISTORY_FILE, help='durations and outcomes of previous runs which determine the order (default: %(default)s)')
+parser.add_argument('--fail-fast', action='store_true', help='do not start further tests after the first failure')
+parser.add_argument('--vivado-workers', type=int, default=0, help='run the vivado calls of the flow on this many persistent vivado workers')
+parser.add_argument('--shard', default='1/1', help='only run the i-th of N shards (format: i/N)')
+parser.add_argument('--shard-history', help='history snapshot which is only read to split the shards by their expected duration (all runners need the same file)')
+args = parser.parse_args()
+
+try:
+  shard, shards = [int(x) for x in args.shard.split('/')]
+except ValueError:
+  parser.error("invalid shard '{}' (format: i/N)".format(args.shard))
+if not 1 <= shard <= shards:
+  parser.error("invalid shard '{}'".format(args.shard))
+
 module ='memsec'
-res = []
+jobs = []
 
 # determine the default backend which will be used for the tests
-infoOutput = subprocess.check_output(["make", "info"]).decode()
-backend = re.search('FLOW_BACKEND:\s+(\w+)', infoOutput).group(1)
+backend = flowBackend()
 
 # Test the cryptographic primitives alone
 for r in [5,6,7]:
-  res += runTest(module, {'ROUNDS': r}, {'FLOW_SIM_TOP': 'tb_qarma'})
-res += runTest(module, {}, {'FLOW_SIM_TOP': 'tb_prince'})
-res += runTest(module, {}, {'FLOW_SIM_TOP': 'tb_aes'})
-res[-1]['ERROR'] = not res[-1]['ERROR'] # the AES test is currently expected to fail
+  jobs += [testJob(module, {'ROUNDS': r}, {'FLOW_SIM_TOP': 'tb_qarma'})]
+jobs += [testJob(module, {}, {'FLOW_SIM_TOP': 'tb_prince'})]
+jobs += [testJob(module, {}, {'FLOW_SIM_TOP': 'tb_aes'})]
+jobs[-1]['EXPECTED_ERROR'] = True # the AES test is currently expected to fail
 for r in [1,2,3,6]:
-  res += runTest(module, {'UNROLED_ROUNDS': r}, {'FLOW_SIM_TOP': 'tb_ascon'})
+  jobs += [testJob(module, {'UNROLED_ROUNDS': r}, {'FLOW_SIM_TOP': 'tb_ascon'})]
 
 # Test the different pipelines
 # ghdl is currently not supported
@@ -47,40 +65,65 @@ if backend != "ghdl":
   generics = {'SIMULATION_ITERATIONS': 50}
 
   # PLAIN
-  res += runTest(module,merge_dicts(generics, {'CRYPTO_CONFIG': 0,'BLOCKS_PER_SECTOR': 1}))
+  jobs += [testJob(module,merge_dicts(generics, {'CRYPTO_CONFIG': 0,'BLOCKS_PER_SECTOR': 1}))]
 
   # ASCON
-  res += runTest(module,merge_dicts(generics, {'CRYPTO_CONFIG': 1,'DATA_BLOCK_SIZE': 32}))
+  jobs += [testJob(module,merge_dicts(generics, {'CRYPTO_CONFIG': 1,'DATA_BLOCK_SIZE': 32}))]
 
   # ASCON TREE
-  res += runTest(module,merge_dicts(generics, {'CRYPTO_CONFIG': 2,'TREE_ROOTS': 1,'TREE_ARITY': 8,'DATA_BLOCK_SIZE': 64}))
+  jobs += [testJob(module,merge_dicts(generics, {'CRYPTO_CONFIG': 2,'TREE_ROOTS': 1,'TREE_ARITY': 8,'DATA_BLOCK_SIZE': 64}))]
 
   # Prince ECB
-  res += runTest(module,merge_dicts(generics, {'CRYPTO_CONFIG': 3,'BLOCKS_PER_SECTOR': 4}))
+  jobs += [testJob(module,merge_dicts(generics, {'CRYPTO_CONFIG': 3,'BLOCKS_PER_SECTOR': 4}))]
 
   # AES ECB
-  res += runTest(module,merge_dicts(generics, {'CRYPTO_CONFIG': 4,'BLOCKS_PER_SECTOR': 2}))
+  jobs += [testJob(module,merge_dicts(generics, {'CRYPTO_CONFIG': 4,'BLOCKS_PER_SECTOR': 2}))]
 
   # Prince CBC
-  res += runTest(module,merge_dicts(generics, {'CRYPTO_CONFIG': 5,'BLOCKS_PER_SECTOR': 4}))
+  jobs += [testJob(module,merge_dicts(generics, {'CRYPTO_CONFIG': 5,'BLOCKS_PER_SECTOR': 4}))]
 
   # AES CBC
-  res += runTest(module,merge_dicts(generics, {'CRYPTO_CONFIG': 6,'BLOCKS_PER_SECTOR': 2}))
+  jobs += [testJob(module,merge_dicts(generics, {'CRYPTO_CONFIG': 6,'BLOCKS_PER_SECTOR': 2}))]
 
   # Prince XTS
-  res += runTest(module,merge_dicts(generics, {'CRYPTO_CONFIG': 7,'BLOCKS_PER_SECTOR': 4}))
+  jobs += [testJob(module,merge_dicts(generics, {'CRYPTO_CONFIG': 7,'BLOCKS_PER_SECTOR': 4}))]
 
   # AES XTS
-  res += runTest(module,merge_dicts(generics, {'CRYPTO_CONFIG': 8,'BLOCKS_PER_SECTOR': 2}))
+  jobs += [testJob(module,merge_dicts(generics, {'CRYPTO_CONFIG': 8,'BLOCKS_PER_SECTOR': 2}))]
 
   # MEAS
   localGenerics = merge_dicts(generics, {'CRYPTO_CONFIG': 9,'TREE_ROOTS': 1,'TREE_ARITY': 4,'DATA_BLOCK_SIZE': 64})
-  res += runTest(module,localGenerics)
-  res += runTest(module,localGenerics,{'DATASTREAM_DATA_WIDTH': 128})
+  jobs += [testJob(module,localGenerics)]
+  jobs += [testJob(module,localGenerics,{'DATASTREAM_DATA_WIDTH': 128})]
 
   # MEAS ECB
   localGenerics = merge_dicts(generics, {'CRYPTO_CONFIG': 10,'TREE_ROOTS': 1,'TREE_ARITY': 4,'DATA_BLOCK_SIZE': 64})
-  res += runTest(module,localGenerics)
-  res += runTest(module,localGenerics,{'DATASTREAM_DATA_WIDTH': 128})
-
+  jobs += [testJob(module,localGenerics)]
+  jobs += [testJob(module,localGenerics,{'DATASTREAM_DATA_WIDTH': 128})]
+
+for job in jobs:
+  job['TIMEOUT'] = args.timeout
+
+# the slowest and most often failing tests of the shard are run first
+history = loadHistory(args.history_file)
+jobs    = orderJobs(shardJobs(jobs, shard-1, shards, loadHistory(args.shard_history) if args.shard_history else None), history)
+
+server = startVivadoServer(args.vivado_workers) if args.vivado_workers and backend == 'vivado' else None
+
+if not args.no_batch:
+  res = runTestJobs(jobs, args.jobs, cacheDir=args.cache_dir, failFast=args.fail_fast, historyFile=args.history_file)
+elif args.jobs == 1:
+  res = []
+  for job in jobs:
+    res += [runJob(job, cacheDir=args.cache_dir)]
+    recordHistory(args.history_file, job, res[-1])
+    if args.fail_fast and res[-1]['ERROR']:
+      break
+else:
+  res = runJobs(jobs, args.jobs, cacheDir=args.cache_dir, failFast=args.fail_fast, historyFile=args.history_file)
+
+if server:
+  stopVivadoServer(server)
+
+printPhaseSummary(res)
 sys.exit(printSummary(res))
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "python"))
+from memsec import *
+
+parser = argparse.ArgumentParser(description='Simulate the tree node cache for a memory access trace.')
+parser.add_argument('trace', help='trace file (*.bin: 64-bit little-endian words with bit 63 marking writes, otherwise lines of "R|W <address> [<size>]")')
+parser.add_argument('--crypto-config', type=int, default=9, choices=[2, 9, 10], help='tree based CRYPTO_CONFIG (default: 9)')
+parser.add_argument('--arity', type=int, default=4, help='TREE_ARITY')
+parser.add_argument('--roots', type=int, default=1024, help='TREE_ROOTS')
+parser.add_argument('--block-size', type=int, default=64, help='DATA_BLOCK_SIZE')
+parser.add_argument('--memory-size', type=int, default=256*1024*1024, help='DATA_MEMORY_SIZE')
+parser.add_argument('--datastream-width', type=int, default=64, help='DATASTREAM_DATA_WIDTH')
+parser.add_argument('--base-address', type=lambda x: int(x, 0), default=0x40000000, help='base address of the protected memory')
+parser.add_argument('--cache-sizes', type=int, nargs='+', default=[64, 128, 256, 512, 1024, 2048, 4096], help='simulated TREE_NODE_CACHE_SIZEs (powers of two)')
+args = parser.parse_args()
+
+options = {'CRYPTO_CONFIG':         args.crypto_config,
+           'TREE_ARITY':            args.arity,
+           'TREE_ROOTS':            args.roots,
+           'DATA_BLOCK_SIZE':       args.block_size,
+           'DATA_MEMORY_SIZE':      args.memory_size,
+           'DATASTREAM_DATA_WIDTH': args.datastream_width,
+           'MEMORY_START_ADDRESS':  args.base_address}
+
+res = simulateNodeCache(traceChunks(args.trace), options, args.cache_sizes)
+
+print("{} reads, {} writes".format(res[0]['READS'], res[0]['WRITES']))
+print("{:>10} {:>10} {:>8} {:>14}  {}".format('Size', 'Bits', 'Hit rate', 'Bytes/Request', 'Hit rate per level (root first)'))
+for r in res:
+  print("{:>10} {:>10} {:>8.3f} {:>14.1f}  {}".format(r['CACHE_SIZE'], r['CACHE_BITS'], r['HIT_RATE'], r['NODE_BYTES_PER_REQUEST'], ' '.join('{:.3f}'.format(h) for h in r['LEVEL_HIT_RATES'])))
@@ -20,13 +20,19 @@
 
 library IEEE;
 use IEEE.STD_LOGIC_1164.all;
+use IEEE.std_logic_textio.all;
 use work.tb_utils_pkg.all;
 
+library std;
+use std.textio.all;
+
 entity tb_ascon is
   generic(
     ENTITY_NAME    : string  := "tb_ascon";
     CLK_PERIOD     : time    := 5.0 ns;
-    UNROLED_ROUNDS : integer := 1       -- 1,2,3 or 6 for Ascon-128
+    UNROLED_ROUNDS : integer := 1;      -- 1,2,3 or 6 for Ascon-128
+    -- number of vectors read from <ENTITY_NAME>_vectors.txt (0 = built-in vectors)
+    VECTORS        : integer := 0
     );
 end tb_ascon;
 
@@ -87,6 +93,13 @@ begin
     variable nonce_v       : testvector128_t := (x"00000000000000000000000000000000", x"00000000000000000000000000000000", x"00000000000000000000000000000000", x"00000000000000000000000000000000", x"FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF", x"e722702b7b568c9786a8b975e7c04a48");
     variable cipher_v      : testvector64_t  := (x"44d7bff2549e8637", x"bb28400dab617937", x"046692d6c5161b41", x"de303af2de242294", x"5d1feaad4eb19ddb", x"19b4dc8720914f7d");
     variable tag_v         : testvector128_t := (x"313e35b92cb72503b2557c9a0d57a881", x"33b88367855720ba7ec8eb26bad56298", x"0fe2eeacd55836cf85d61cc06b6f0c9d", x"60401b4323ed0bf2412c564f15140a87", x"4b8a46cc110826f8e562013cc05a166b", x"4bdc08b3379383c2cb6141b1c3a2b592");
+    variable vector_count  : integer;
+    file vector_file       : text;
+    variable vector_line   : line;
+    variable key, nonce    : std_logic_vector(127 downto 0);
+    variable ad, message   : std_logic_vector(63 downto 0);
+    variable cipher        : std_logic_vector(63 downto 0);
+    variable tag           : std_logic_vector(127 downto 0);
   begin
     InitxS         <= '0';
     AssociatexS    <= '0';
@@ -96,13 +109,35 @@ begin
     FinalDecryptxS <= '0';
 
     wait until rising_edge(RstxRB);
-    for I in 0 to message_v'length-1 loop
-      ExpCiphertextxD <= cipher_v(I);
-      ExpTagxD        <= tag_v(I);
-      NoncexD         <= nonce_v(I);
-      KeyxD           <= key_v(I);
-      ADxD            <= ad_v(I);
-      MessagexD       <= message_v(I);
+    vector_count := message_v'length;
+    if VECTORS > 0 then
+      vector_count := VECTORS;
+      file_open(vector_file, ENTITY_NAME & "_vectors.txt", read_mode);
+    end if;
+    for I in 0 to vector_count-1 loop
+      if VECTORS > 0 then
+        -- line format: key nonce associated_data message ciphertext tag
+        readline(vector_file, vector_line);
+        hread(vector_line, key);
+        hread(vector_line, nonce);
+        hread(vector_line, ad);
+        hread(vector_line, message);
+        hread(vector_line, cipher);
+        hread(vector_line, tag);
+      else
+        key     := key_v(I);
+        nonce   := nonce_v(I);
+        ad      := ad_v(I);
+        message := message_v(I);
+        cipher  := cipher_v(I);
+        tag     := tag_v(I);
+      end if;
+      ExpCiphertextxD <= cipher;
+      ExpTagxD        <= tag;
+      NoncexD         <= nonce;
+      KeyxD           <= key;
+      ADxD            <= ad;
+      MessagexD       <= message;
       wait until rising_edge(ClkxC);
 
       DataInxD <= NoncexD;
@@ -166,6 +201,9 @@ begin
         error_occured := true;
       end if;
     end loop;
+    if VECTORS > 0 then
+      file_close(vector_file);
+    end if;
 
     if error_occured then
       write_tb_fail(ENTITY_NAME);
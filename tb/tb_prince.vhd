@@ -20,12 +20,18 @@
 
 library IEEE;
 use IEEE.STD_LOGIC_1164.all;
+use IEEE.std_logic_textio.all;
 use work.tb_utils_pkg.all;
 
+library std;
+use std.textio.all;
+
 entity tb_prince is
   generic(
-    ENTITY_NAME : string := "tb_prince";
-    CLK_PERIOD  : time   := 5.0 ns
+    ENTITY_NAME : string  := "tb_prince";
+    CLK_PERIOD  : time    := 5.0 ns;
+    -- number of vectors read from <ENTITY_NAME>_vectors.txt (0 = built-in vectors)
+    VECTORS     : integer := 0
     );
 end tb_prince;
 
@@ -88,14 +94,38 @@ begin
     variable key0_v        : testvector_t := (x"0000000000000000", x"0000000000000000", x"ffffffffffffffff", x"0000000000000000", x"0000000000000000");
     variable key1_v        : testvector_t := (x"0000000000000000", x"0000000000000000", x"0000000000000000", x"ffffffffffffffff", x"fedcba9876543210");
     variable cipher_v      : testvector_t := (x"818665aa0d02dfda", x"604ae6ca03c20ada", x"9fb51935fc3df524", x"78a54cbe737bb7ef", x"ae25ad3ca8fa9ccf");
+    variable vector_count  : integer;
+    file vector_file       : text;
+    variable vector_line   : line;
+    variable key0, key1    : std_logic_vector(63 downto 0);
+    variable message       : std_logic_vector(63 downto 0);
+    variable cipher        : std_logic_vector(63 downto 0);
   begin
     wait until rising_edge(RstxRB);
     DecryptionReadyxS <= '0';
-    for I in 0 to message_v'length-1 loop
-      Key0xD          <= key0_v(I);
-      Key1xD          <= key1_v(I);
-      MessagexD       <= message_v(I);
-      ExpCiphertextxD <= cipher_v(I);
+    vector_count      := message_v'length;
+    if VECTORS > 0 then
+      vector_count := VECTORS;
+      file_open(vector_file, ENTITY_NAME & "_vectors.txt", read_mode);
+    end if;
+    for I in 0 to vector_count-1 loop
+      if VECTORS > 0 then
+        -- line format: key0 key1 message ciphertext
+        readline(vector_file, vector_line);
+        hread(vector_line, key0);
+        hread(vector_line, key1);
+        hread(vector_line, message);
+        hread(vector_line, cipher);
+      else
+        key0    := key0_v(I);
+        key1    := key1_v(I);
+        message := message_v(I);
+        cipher  := cipher_v(I);
+      end if;
+      Key0xD          <= key0;
+      Key1xD          <= key1;
+      MessagexD       <= message;
+      ExpCiphertextxD <= cipher;
       PlainValidxS    <= '1';
 
       wait until PlainReadyxS = '1' and rising_edge(ClkxC);
@@ -117,6 +147,9 @@ begin
       wait until DecryptionValidxS = '0' and falling_edge(ClkxC);
       DecryptionReadyxS <= '0';
     end loop;
+    if VECTORS > 0 then
+      file_close(vector_file);
+    end if;
 
     if error_occured then
       write_tb_fail(ENTITY_NAME);
@@ -20,13 +20,19 @@
 
 library IEEE;
 use IEEE.STD_LOGIC_1164.all;
+use IEEE.std_logic_textio.all;
 use work.tb_utils_pkg.all;
 
+library std;
+use std.textio.all;
+
 entity tb_qarma is
   generic(
     ENTITY_NAME : string  := "tb_qarma";
     CLK_PERIOD  : time    := 5.0 ns;
-    ROUNDS      : integer := 6
+    ROUNDS      : integer := 6;
+    -- number of vectors read from <ENTITY_NAME>_vectors.txt (0 = built-in vector)
+    VECTORS     : integer := 0
     );
 end tb_qarma;
 
@@ -89,32 +95,63 @@ begin
 
   rw_testcase : process
     variable error_occured : boolean := false;
+    variable vector_count  : integer;
+    file vector_file       : text;
+    variable vector_line   : line;
+    variable key           : std_logic_vector(127 downto 0);
+    variable tweak         : std_logic_vector(63 downto 0);
+    variable message       : std_logic_vector(63 downto 0);
+    variable cipher        : std_logic_vector(63 downto 0);
   begin
     wait until rising_edge(RstxRB);
 
-    KeyxD     <= x"84be85ce9804e94bec2802d4e0a488e9";
-    MessagexD <= x"fb623599da6e8127";
-    TweakxD   <= x"477d469dec0b8762";
-
-    case ROUNDS is
-      when 5 => ExpCiphertextxD <= x"544b0ab95bda7c3a";
-      when 6 => ExpCiphertextxD <= x"a512dd1e4e3ec582";
-      when 7 => ExpCiphertextxD <= x"edf67ff370a483f2";
-      when others =>
-        write_tb_fail(ENTITY_NAME);
-        report "Test Vector is unknown" severity failure;
-    end case;
-
-    wait until EnryptionValidxS = '1' and falling_edge(ClkxC);
-    if CiphertextxD /= ExpCiphertextxD then
-      report "ERROR: Encryption failed. Ciphertext mismatch.";
-      error_occured := true;
+    vector_count := 1;
+    if VECTORS > 0 then
+      vector_count := VECTORS;
+      file_open(vector_file, ENTITY_NAME & "_vectors.txt", read_mode);
     end if;
 
-    wait until DecryptionValidxS = '1' and falling_edge(ClkxC);
-    if MessageVerifyxD /= MessagexD then
-      report "ERROR: Decryption failed. Plaintext mismatch.";
-      error_occured := true;
+    for I in 0 to vector_count-1 loop
+      if VECTORS > 0 then
+        -- line format: key tweak message ciphertext (for the configured ROUNDS)
+        readline(vector_file, vector_line);
+        hread(vector_line, key);
+        hread(vector_line, tweak);
+        hread(vector_line, message);
+        hread(vector_line, cipher);
+      else
+        key     := x"84be85ce9804e94bec2802d4e0a488e9";
+        message := x"fb623599da6e8127";
+        tweak   := x"477d469dec0b8762";
+
+        case ROUNDS is
+          when 5 => cipher := x"544b0ab95bda7c3a";
+          when 6 => cipher := x"a512dd1e4e3ec582";
+          when 7 => cipher := x"edf67ff370a483f2";
+          when others =>
+            write_tb_fail(ENTITY_NAME);
+            report "Test Vector is unknown" severity failure;
+        end case;
+      end if;
+      KeyxD           <= key;
+      MessagexD       <= message;
+      TweakxD         <= tweak;
+      ExpCiphertextxD <= cipher;
+
+      wait until EnryptionValidxS = '1' and falling_edge(ClkxC);
+      if CiphertextxD /= ExpCiphertextxD then
+        report "ERROR: Encryption failed. Ciphertext mismatch.";
+        error_occured := true;
+      end if;
+
+      wait until DecryptionValidxS = '1' and falling_edge(ClkxC);
+      if MessageVerifyxD /= MessagexD then
+        report "ERROR: Decryption failed. Plaintext mismatch.";
+        error_occured := true;
+      end if;
+    end loop;
+    if VECTORS > 0 then
+      file_close(vector_file);
     end if;
 
     if error_occured then
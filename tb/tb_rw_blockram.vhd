@@ -66,7 +66,17 @@ entity tb_rw_blockram is
     BLOCKS_PER_SECTOR : integer := 4;
 
     -- Testbench parameters
-    SIMULATION_ITERATIONS : integer := 50
+    SIMULATION_ITERATIONS : integer := 50;
+    -- Log the issue and completion cycle of every transaction into
+    -- <ENTITY_NAME>_benchmark.csv when set to 1.
+    BENCHMARK             : integer := 0;
+    -- Replay the first STIMULUS transactions of <ENTITY_NAME>_stimulus.bin
+    -- (see python/memsec/stimulus.py) instead of the built-in pattern.
+    STIMULUS              : integer := 0;
+    -- Log every written beat into <ENTITY_NAME>_plaintext.txt and dump the
+    -- final content of the memory into <ENTITY_NAME>_memory.txt when set to 1
+    -- (see python/memsec/memoryimage.py).
+    MEMORY_IMAGE          : integer := 0
     );
 end tb_rw_blockram;
 
@@ -166,11 +176,39 @@ architecture Behavioral of tb_rw_blockram is
   signal m_axi_rvalid   : std_logic;
   signal m_axi_rready   : std_logic;
 
+  signal cycle_count : natural := 0;
+
+  signal dump_image   : std_logic := '0';
+  signal image_dumped : std_logic := '0';
+
+  -- byte address of the given beat of an AXI burst
+  function burst_address(addr : unsigned; len : std_logic_vector; size : std_logic_vector; burst : std_logic_vector; beat : natural) return unsigned is
+    constant BYTES    : natural := 2**to_integer(unsigned(size));
+    constant BOUNDARY : natural := BYTES * (to_integer(unsigned(len)) + 1);
+    variable v_start  : unsigned(addr'length-1 downto 0);
+  begin
+    v_start := addr - (addr mod BYTES);
+    if burst = "00" then
+      return v_start;
+    elsif burst = "10" then
+      return v_start - (v_start mod BOUNDARY) + ((v_start mod BOUNDARY) + beat * BYTES) mod BOUNDARY;
+    end if;
+    return v_start + beat * BYTES;
+  end function;
+
 begin
   -- Generate clock and reset
   ClkxC  <= not ClkxC after CLK_PERIOD;
   RstxRB <= '0', '1'  after 20 ns;
 
+  -- Count the clock cycles for benchmarking
+  cycle_counter : process(ClkxC)
+  begin
+    if rising_edge(ClkxC) then
+      cycle_count <= cycle_count + 1;
+    end if;
+  end process;
+
   m_axi_awregion <= (others => '0');
   m_axi_arregion <= (others => '0');
 
@@ -333,6 +371,124 @@ begin
       m_axi_rready  => m_axi_rready
       );
 
+  -- Reconstruct the memory content by snooping the write channels of the
+  -- memory (ciphertext) and of MEMSEC (plaintext). The bursts are queued
+  -- when their address is accepted and consumed beat by beat.
+  image_monitor : process
+    constant WORD_BYTES : integer := C_M_AXI_DATA_WIDTH/8;
+    constant WORDS      : integer := DATA_MEMORY_SIZE/WORD_BYTES;
+    -- memsec forwards the block addresses of the CPU to the memory unchanged
+    constant MEMORY_START_ADDRESS : unsigned(31 downto 0) := x"40000000";
+
+    type image_t is array (0 to WORDS-1) of std_logic_vector(C_M_AXI_DATA_WIDTH-1 downto 0);
+    type burst_t is record
+      addr  : unsigned(31 downto 0);
+      len   : std_logic_vector(7 downto 0);
+      size  : std_logic_vector(2 downto 0);
+      burst : std_logic_vector(1 downto 0);
+    end record;
+    type bursts_t is array (0 to 15) of burst_t;
+    type queue_t is record
+      bursts : bursts_t;
+      head   : natural;
+      count  : natural;
+      beat   : natural;
+    end record;
+
+    variable v_image       : image_t := (others => (others => '0'));
+    variable v_memory      : queue_t;
+    variable v_cpu         : queue_t;
+    variable v_outstanding : integer := 0;
+    variable v_address     : unsigned(31 downto 0);
+    variable v_valid       : boolean;
+    variable v_index       : natural;
+    variable outline       : line;
+
+    file plaintext_file : text;
+    file image_file     : text;
+
+    procedure push(queue : inout queue_t; addr : in std_logic_vector; len : in std_logic_vector; size : in std_logic_vector; burst : in std_logic_vector) is
+    begin
+      assert queue.count < queue.bursts'length report "image monitor: too many outstanding bursts" severity failure;
+      queue.bursts((queue.head + queue.count) mod queue.bursts'length) := (resize(unsigned(addr), 32), len, size, burst);
+      queue.count := queue.count + 1;
+    end procedure;
+
+    procedure next_beat(queue : inout queue_t; last : in std_logic; address : out unsigned(31 downto 0); valid : out boolean) is
+      variable v_burst : burst_t;
+    begin
+      valid := queue.count > 0;
+      if queue.count = 0 then
+        report "WARNING: Write beat without address";
+        return;
+      end if;
+      v_burst    := queue.bursts(queue.head);
+      address    := burst_address(v_burst.addr, v_burst.len, v_burst.size, v_burst.burst, queue.beat);
+      queue.beat := queue.beat + 1;
+      if last = '1' then
+        queue.head  := (queue.head + 1) mod queue.bursts'length;
+        queue.count := queue.count - 1;
+        queue.beat  := 0;
+      end if;
+    end procedure;
+  begin
+    if MEMORY_IMAGE = 0 then
+      wait;
+    end if;
+    file_open(plaintext_file, ENTITY_NAME & "_plaintext.txt", write_mode);
+
+    loop
+      wait until rising_edge(ClkxC);
+
+      -- ciphertext written into the memory
+      if m_axi_awvalid = '1' and m_axi_awready = '1' then
+        push(v_memory, m_axi_awaddr, m_axi_awlen, m_axi_awsize, m_axi_awburst);
+        v_outstanding := v_outstanding + 1;
+      end if;
+      if m_axi_wvalid = '1' and m_axi_wready = '1' then
+        next_beat(v_memory, m_axi_wlast, v_address, v_valid);
+        if v_valid then
+          v_index := to_integer((v_address - MEMORY_START_ADDRESS) mod to_unsigned(DATA_MEMORY_SIZE, 32)) / WORD_BYTES;
+          for B in 0 to WORD_BYTES-1 loop
+            if m_axi_wstrb(B) = '1' then
+              v_image(v_index)(8*B+7 downto 8*B) := m_axi_wdata(8*B+7 downto 8*B);
+            end if;
+          end loop;
+        end if;
+      end if;
+      if m_axi_bvalid = '1' and m_axi_bready = '1' then
+        v_outstanding := v_outstanding - 1;
+      end if;
+
+      -- plaintext written by the test bench: <address> <data> <strobes>
+      if s_axi_awvalid = '1' and s_axi_awready = '1' then
+        push(v_cpu, s_axi_awaddr, s_axi_awlen, s_axi_awsize, s_axi_awburst);
+      end if;
+      if s_axi_wvalid = '1' and s_axi_wready = '1' then
+        next_beat(v_cpu, s_axi_wlast, v_address, v_valid);
+        if v_valid then
+          write(outline, to_hstring(std_logic_vector(v_address)) & " " & to_hstring(s_axi_wdata) & " " & to_hstring(s_axi_wstrb));
+          writeline(plaintext_file, outline);
+        end if;
+      end if;
+
+      -- wait until all writes of the memory have been completed
+      exit when dump_image = '1' and v_outstanding = 0;
+    end loop;
+    file_close(plaintext_file);
+
+    -- one memory word per line, starting at MEMORY_START_ADDRESS
+    file_open(image_file, ENTITY_NAME & "_memory.txt", write_mode);
+    for I in 0 to WORDS-1 loop
+      write(outline, to_hstring(v_image(I)));
+      writeline(image_file, outline);
+    end loop;
+    file_close(image_file);
+
+    image_dumped <= '1';
+    wait;
+  end process;
+
   rw_testcase : process
     variable line_number        : integer := 0;
     variable space              : character;
@@ -355,6 +511,134 @@ begin
 
     variable value          : std_logic_vector(C_S_AXI_DATA_WIDTH-1 downto 0);
     variable value_expected : std_logic_vector(C_S_AXI_DATA_WIDTH-1 downto 0);
+
+    file benchmark_file   : text;
+    variable v_issue_cycle : natural;
+
+    procedure log_transaction(kind : in string; addr : in std_logic_vector; len : in std_logic_vector; issue : in natural; complete : in natural) is
+      variable outline : line;
+    begin
+      if BENCHMARK /= 0 then
+        write(outline, kind & "," & to_hstring(addr) & ",");
+        write(outline, to_integer(unsigned(len)) + 1);
+        write(outline, string'(","));
+        write(outline, (to_integer(unsigned(len)) + 1) * C_S_AXI_DATA_WIDTH / 8);
+        write(outline, string'(","));
+        write(outline, issue);
+        write(outline, string'(","));
+        write(outline, complete);
+        writeline(benchmark_file, outline);
+      end if;
+    end procedure;
+
+    -- Every record of the stimulus file consists of 8 bytes (little-endian):
+    -- address (31..0), AXI length (39..32), AXI burst (41..40), write (63).
+    procedure replay_stimulus is
+      type byte_file_t is file of character;
+      file stimulus_file : byte_file_t;
+      variable byte      : character;
+      variable v_record  : std_logic_vector(63 downto 0);
+      variable v_address : std_logic_vector(C_S_AXI_ADDR_WIDTH-1 downto 0);
+      variable v_len     : std_logic_vector(7 downto 0);
+      variable v_beats   : integer;
+    begin
+      file_open(stimulus_file, ENTITY_NAME & "_stimulus.bin", read_mode);
+      for I in 0 to STIMULUS-1 loop
+        for B in 0 to 7 loop
+          read(stimulus_file, byte);
+          v_record(8*B+7 downto 8*B) := std_logic_vector(to_unsigned(character'pos(byte), 8));
+        end loop;
+        v_address := std_logic_vector(resize(unsigned(v_record(31 downto 0)), C_S_AXI_ADDR_WIDTH));
+        v_len     := v_record(39 downto 32);
+
+        wait until falling_edge(ClkxC);
+        v_issue_cycle := cycle_count;
+        if v_record(63) = '0' then
+          s_axi_arburst <= v_record(41 downto 40);
+          s_axi_araddr  <= v_address;
+          s_axi_arsize  <= v_arsize;
+          s_axi_arlen   <= v_len;
+          s_axi_arid    <= (others => '0');
+          s_axi_arvalid <= '1';
+          loop
+            wait until rising_edge(ClkxC);
+            exit when s_axi_arready = '1';
+          end loop;
+          s_axi_arvalid <= '0';
+
+          v_beats := 0;
+          loop
+            loop
+              wait until falling_edge(ClkxC);
+              exit when s_axi_rvalid = '1';
+            end loop;
+            v_beats := v_beats + 1;
+            if unsigned(s_axi_rresp) /= 0 then
+              report "ERROR: Read Response";
+              error_occured := true;
+            end if;
+            exit when s_axi_rlast = '1';
+          end loop;
+          log_transaction("R", v_address, v_len, v_issue_cycle, cycle_count);
+          wait until s_axi_rlast = '0';
+        else
+          s_axi_awburst <= v_record(41 downto 40);
+          s_axi_awaddr  <= v_address;
+          s_axi_awsize  <= v_arsize;
+          s_axi_awlen   <= v_len;
+          s_axi_awid    <= (others => '0');
+          s_axi_awvalid <= '1';
+          loop
+            wait until rising_edge(ClkxC);
+            exit when s_axi_awready = '1';
+          end loop;
+          wait until falling_edge(ClkxC);
+          s_axi_awvalid <= '0';
+
+          v_beats := 0;
+          s_axi_wstrb  <= (others => '1');
+          s_axi_wvalid <= '1';
+          loop
+            s_axi_wdata <= std_logic_vector(resize(unsigned(v_address), C_S_AXI_DATA_WIDTH) + v_beats);
+            if v_beats = to_integer(unsigned(v_len)) then
+              s_axi_wlast <= '1';
+            end if;
+            wait until rising_edge(ClkxC) and s_axi_wready = '1';
+            exit when v_beats = to_integer(unsigned(v_len));
+            v_beats := v_beats + 1;
+          end loop;
+          v_beats      := v_beats + 1;
+          s_axi_wvalid <= '0';
+          s_axi_wlast  <= '0';
+          s_axi_wstrb  <= (others => '0');
+
+          if s_axi_bvalid = '0' then
+            loop
+              wait until rising_edge(ClkxC);
+              exit when s_axi_bvalid = '1';
+            end loop;
+          end if;
+          if unsigned(s_axi_bresp) /= 0 then
+            report "ERROR: Write Response";
+            error_occured := true;
+          end if;
+          log_transaction("W", v_address, v_len, v_issue_cycle, cycle_count);
+        end if;
+
+        if v_beats /= to_integer(unsigned(v_len)) + 1 then
+          report "ERROR: Transaction " & integer'image(I) & " transferred " & integer'image(v_beats) & " beats";
+          error_occured := true;
+        end if;
+        if error_occured then
+          write_tb_fail(ENTITY_NAME);
+          report "ERROR" severity failure;
+        end if;
+        v_passed_testcases := v_passed_testcases + 1;
+      end loop;
+      file_close(stimulus_file);
+    end procedure;
+
+    variable v_header : line;
   begin
 
     s_axi_arsize  <= (others => '0');
@@ -368,6 +652,12 @@ begin
     s_axi_awid    <= (others => '0');
     s_axi_awvalid <= '0';
 
+    if BENCHMARK /= 0 then
+      file_open(benchmark_file, ENTITY_NAME & "_benchmark.csv", write_mode);
+      write(v_header, string'("type,address,beats,bytes,issue,complete"));
+      writeline(benchmark_file, v_header);
+    end if;
+
     -- Wait until reset done
     wait until rising_edge(RstxRB);
 
@@ -378,7 +668,11 @@ begin
     v_arsize     := std_logic_vector(to_unsigned(log2_ceil(C_S_AXI_DATA_WIDTH/8), 3));
     v_arlen      := x"07";
 
-    while iteration <= SIMULATION_ITERATIONS loop
+    if STIMULUS > 0 then
+      replay_stimulus;
+    end if;
+
+    while STIMULUS = 0 and iteration <= SIMULATION_ITERATIONS loop
       iteration := iteration + 1;
       wait until falling_edge(ClkxC);
 
@@ -396,6 +690,7 @@ begin
       s_axi_arregion <= (others => '0');
 
       -- Start transfer
+      v_issue_cycle := cycle_count;
       s_axi_arvalid <= '1';
       loop
         wait until rising_edge(ClkxC);
@@ -422,6 +717,7 @@ begin
 
         exit when s_axi_rlast = '1';
       end loop;
+      log_transaction("R", v_addr, v_arlen, v_issue_cycle, cycle_count);
 
       -- Transmission finished
       wait until s_axi_rlast = '0';
@@ -437,6 +733,7 @@ begin
       s_axi_awid         <= x"000";
 
       -- Start transfer
+      v_issue_cycle := cycle_count;
       s_axi_awvalid <= '1';
 
       loop
@@ -470,12 +767,15 @@ begin
         end loop;
       end if;
 
+      log_transaction("W", v_addr, x"0f", v_issue_cycle, cycle_count);
+
       if unsigned(s_axi_bresp) /= 0 then
         report "ERROR: Write Response";
         error_occured := true;
       end if;
 
       -- Start transfer
+      v_issue_cycle := cycle_count;
       s_axi_arvalid <= '1';
       loop
         wait until rising_edge(ClkxC);
@@ -502,6 +802,7 @@ begin
 
         exit when s_axi_rlast = '1';
       end loop;
+      log_transaction("R", v_addr, v_arlen, v_issue_cycle, cycle_count);
 
       -- Check data
 
@@ -533,6 +834,15 @@ begin
       end if;
     end loop;
 
+    if BENCHMARK /= 0 then
+      file_close(benchmark_file);
+    end if;
+
+    if MEMORY_IMAGE /= 0 then
+      dump_image <= '1';
+      wait until image_dumped = '1';
+    end if;
+
     write_tb_success(ENTITY_NAME);
     report integer'image(v_passed_testcases) & " testcases passed";
     report "Simulation complete" severity failure;
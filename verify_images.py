@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "python"))
+from memsec import *
+
+parser = argparse.ArgumentParser(description='Check the memory images which tb_rw_blockram leaves behind against the written plaintext.')
+parser.add_argument('files', nargs='*', help='verify an existing <memory image> <plaintext log> pair instead of simulating')
+parser.add_argument('-j', '--jobs', type=int, default=1, help='number of simulations which are run in parallel (0 = number of cores)')
+parser.add_argument('--cache-dir', default=defaultCacheDir, help='cache the results of successful simulations in this directory (default: $MEMSEC_CACHE_DIR)')
+parser.add_argument('--iterations', type=int, default=200, help='number of read-write-read iterations per configuration')
+parser.add_argument('--stimulus', help='replay this stimulus (see ./replay_trace.py) instead of the built-in pattern')
+parser.add_argument('--memory-size', type=int, help='DATA_MEMORY_SIZE of the test bench (default: 8192)')
+parser.add_argument('--crypto-configs', type=int, nargs='+', default=sorted(IMAGE_MODES), help='CRYPTO_CONFIGs which are checked (default: all PRINCE modes and plain)')
+parser.add_argument('--blocks-per-sector', type=int, nargs='+', default=[4], help='BLOCKS_PER_SECTOR values which are checked')
+args = parser.parse_args()
+
+if any(c not in IMAGE_MODES for c in args.crypto_configs):
+  parser.error('only the memory images of the CRYPTO_CONFIGs {} can be decrypted'.format(sorted(IMAGE_MODES)))
+
+if args.files:
+  if len(args.files) != 2 or len(args.crypto_configs) != 1 or len(args.blocks_per_sector) != 1:
+    parser.error('an existing image requires a plaintext log, one CRYPTO_CONFIG, and one BLOCKS_PER_SECTOR value')
+  res = {'MODULE': 'memsec', 'OPTIONS': {'CRYPTO_CONFIG': args.crypto_configs[0], 'BLOCKS_PER_SECTOR': args.blocks_per_sector[0]}}
+  res['IMAGE'] = verifyImage(args.files[0], args.files[1], res['OPTIONS'])
+  printImageSummary([res])
+  sys.exit(1 if res['IMAGE']['ERROR'] else 0)
+
+module = 'memsec'
+fixed  = {'SIMULATION_ITERATIONS': args.iterations}
+if args.memory_size:
+  fixed['DATA_MEMORY_SIZE'] = args.memory_size
+
+def image(module,genericsDict={},optionsDict={}):
+  if args.stimulus:
+    count = os.path.getsize(args.stimulus) // STIMULUS_RECORD_SIZE
+    job   = stimulusJob(module, args.stimulus, count, genericsDict, optionsDict)
+    return dict(job, GENERICS=merge_dicts(job['GENERICS'], {'MEMORY_IMAGE': 1}))
+  return imageJob(module, genericsDict, optionsDict)
+
+specs = [{'MODULE': module, 'JOB': image, 'FIXED': fixed,
+          'AXES': [{'CRYPTO_CONFIG': args.crypto_configs}, {'BLOCKS_PER_SECTOR': args.blocks_per_sector}]}]
+
+if args.jobs == 1:
+  res = [runJob(job, cacheDir=args.cache_dir) for job in sweepJobs(*specs)]
+else:
+  res = runJobs(sweepJobs(*specs), args.jobs, cacheDir=args.cache_dir)
+verifyImages(res)
+
+printImageSummary(res)
+failed = printSummary(res)
+sys.exit(failed + sum(1 for r in res if not r['ERROR'] and (not r['IMAGE'] or r['IMAGE']['ERROR'])))
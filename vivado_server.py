@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+# MEMSEC - Framework for building transparent memory encryption and authentication solutions.
+# Copyright (C) 2017-2018 Graz University of Technology, IAIK <mario.werner@iaik.tugraz.at>
+#
+# This file is part of MEMSEC.
+#
+# MEMSEC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MEMSEC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MEMSEC.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+import os
+import signal
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "python"))
+from memsec import *
+
+parser = argparse.ArgumentParser(description='Keep vivado workers running for the flow invocations of other scripts or make calls.')
+parser.add_argument('-n', '--workers', type=int, default=1, help='number of vivado workers')
+parser.add_argument('--socket', default='.memsec_vivado.sock', help='unix socket of the server (default: %(default)s)')
+parser.add_argument('--binary', help='vivado binary of the workers (default: $FLOW_VIVADO_BINARY or vivado)')
+parser.add_argument('--max-requests', type=int, default=50, help='replace a worker after this many requests')
+args = parser.parse_args()
+
+server = startVivadoServer(args.workers, args.binary, args.socket, args.max_requests)
+print("")
+print("Use the workers by setting:")
+print("  export MEMSEC_VIVADO_SERVER=\"{}\"".format(server['SOCKET']))
+print("  export MEMSEC_VIVADO_BINARY=\"{}\"".format(server['BINARY']))
+print("Plain make calls additionally need {}.".format(clientVarString()))
+print("Press Ctrl-C to stop the server.", flush=True)
+
+signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+try:
+  signal.pause()
+except (KeyboardInterrupt, SystemExit):
+  pass
+finally:
+  stopVivadoServer(server)